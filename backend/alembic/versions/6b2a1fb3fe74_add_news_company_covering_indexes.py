@@ -0,0 +1,56 @@
+"""add covering indexes for per-company news aggregation
+
+Revision ID: 6b2a1fb3fe74
+Revises: e7f8g9h0i1j2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2a1fb3fe74'
+down_revision = 'e7f8g9h0i1j2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add covering indexes for competitor analytics queries on news_items.
+
+    Every competitor metric filters by company_id and a published_at window and
+    then groups by category/topic/sentiment/source_type or averages
+    priority_score. Including those columns lets Postgres (11+) answer the
+    aggregates with index-only scans. The covering index has the same keys as
+    idx_news_company_published, so it replaces that index. The second index
+    serves the per-company "top news" ordering (priority_score DESC,
+    published_at DESC); a B-tree is scanned backwards for it, so both indexes
+    keep ascending column order.
+
+    Indexes are built CONCURRENTLY so news ingestion is not blocked; that
+    cannot run inside a transaction, hence the autocommit block.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_company_published_covering "
+            "ON news_items(company_id, published_at) "
+            "INCLUDE (category, topic, sentiment, source_type, priority_score)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_company_priority_published "
+            "ON news_items(company_id, priority_score, published_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_news_company_published")
+
+
+def downgrade() -> None:
+    """Restore the plain company/published index and remove covering indexes."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_company_published "
+            "ON news_items(company_id, published_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_news_company_priority_published")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_news_company_published_covering")
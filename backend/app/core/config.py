@@ -130,6 +130,10 @@ class Settings(BaseSettings):
     # Feature flags
     ENABLE_ANALYTICS_V2: bool = Field(default=True, description="Expose API v2 analytics endpoints")
     ENABLE_KNOWLEDGE_GRAPH: bool = Field(default=True, description="Enable analytics knowledge graph processing")
+    ANALYTICS_RAISE_ON_LAZY_LOAD: bool = Field(
+        default=False,
+        description="Raise on unexpected relationship lazy loads in analytics comparison queries (CI guard)",
+    )
     
     # Scraping
     SCRAPER_USER_AGENT: str = Field(
@@ -147,10 +151,27 @@ class Settings(BaseSettings):
     SCRAPER_PROXY_URL: Optional[str] = Field(default=None, description="HTTP proxy URL for scraper fallback requests")
     SCRAPER_SNAPSHOTS_ENABLED: bool = Field(default=True, description="Persist raw HTML snapshots for scraped pages")
     SCRAPER_SNAPSHOT_DIR: str = Field(default="storage/raw_snapshots", description="Directory to store raw HTML snapshots")
+    SCRAPER_MAX_CONNECTIONS: int = Field(default=200, description="Maximum concurrent connections in the scraper HTTP pool")
+    SCRAPER_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=100, description="Idle keep-alive connections retained by the scraper HTTP pool")
+    SCRAPER_KEEPALIVE_EXPIRY: float = Field(default=30.0, gt=0, description="Seconds an idle scraper connection stays in the keep-alive pool")
+    SCRAPER_MAX_CONCURRENCY: int = Field(default=100, ge=1, description="Maximum in-flight page fetches per scraper instance")
+    SCRAPER_CACHE_MAX_ENTRIES: int = Field(default=256, description="Maximum number of responses kept in the scraper request cache")
+    SCRAPER_CACHE_TTL_SECONDS: float = Field(default=900.0, description="Seconds a cached scraper response stays valid")
+    SCRAPER_MAX_RESPONSE_BYTES: int = Field(default=5 * 1024 * 1024, description="Abort scraper downloads larger than this many bytes")
     SCRAPER_DETAIL_ENRICHMENT_ENABLED: bool = Field(
         default=True,
         description="Fetch article detail page during ingestion to enrich title/summary",
     )
+    COMPANY_INFO_CACHE_TTL_SECONDS: float = Field(
+        default=24 * 60 * 60,
+        description="Seconds extracted company homepage info stays cached per domain",
+    )
+    COMPANY_INFO_CACHE_MAX_ENTRIES: int = Field(default=1024, description="Maximum number of domains kept in the company info cache")
+    COMPETITOR_ANALYTICS_CACHE_TTL_SECONDS: float = Field(
+        default=300,
+        description="Seconds competitor metrics and similarity profiles stay cached per company and window",
+    )
+    COMPETITOR_ANALYTICS_CACHE_MAX_ENTRIES: int = Field(default=1024, description="Maximum number of entries kept in the competitor analytics cache")
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = Field(default=100, description="Rate limit requests per minute")
@@ -103,6 +103,54 @@ class SnapshotService:
         snapshots.reverse()
         return snapshots
 
+    async def get_snapshots_bulk(
+        self,
+        company_ids: Iterable[UUID],
+        period: AnalyticsPeriod | str,
+        limit: int = 30,
+    ) -> Dict[UUID, List[CompanyAnalyticsSnapshot]]:
+        """
+        Load the latest `limit` snapshots for every company in a single query.
+
+        Mirrors `get_snapshots` per company (ascending by period_start) using a
+        ROW_NUMBER window partitioned by company so the limit stays per company.
+        """
+        ids = list(dict.fromkeys(company_ids))
+        snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]] = {company_id: [] for company_id in ids}
+        if not ids:
+            return snapshots
+
+        ranked = (
+            select(
+                CompanyAnalyticsSnapshot.id.label("snapshot_id"),
+                func.row_number()
+                .over(
+                    partition_by=CompanyAnalyticsSnapshot.company_id,
+                    order_by=CompanyAnalyticsSnapshot.period_start.desc(),
+                )
+                .label("row_number"),
+            )
+            .where(
+                CompanyAnalyticsSnapshot.company_id.in_(ids),
+                self._period_filter(CompanyAnalyticsSnapshot.period, period),
+            )
+            .subquery()
+        )
+        stmt = (
+            select(CompanyAnalyticsSnapshot)
+            .join(ranked, ranked.c.snapshot_id == CompanyAnalyticsSnapshot.id)
+            .where(ranked.c.row_number <= limit)
+            .order_by(
+                CompanyAnalyticsSnapshot.company_id,
+                CompanyAnalyticsSnapshot.period_start.asc(),
+            )
+            .options(selectinload(CompanyAnalyticsSnapshot.components))
+        )
+        result = await self.db.execute(stmt)
+        for snapshot in result.scalars().all():
+            snapshots[snapshot.company_id].append(snapshot)
+        return snapshots
+
     async def get_latest_snapshot(
         self,
         company_id: UUID,
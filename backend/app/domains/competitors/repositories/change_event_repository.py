@@ -64,6 +64,56 @@ class ChangeEventRepository:
         )
         return self._serialise_rows(rows)
 
+    async def list_change_events_serialised_bulk(
+        self,
+        company_ids: Sequence[UUID],
+        *,
+        limit: int = 20,
+        status: Optional[ChangeProcessingStatus] = None,
+    ) -> Dict[UUID, List[Dict[str, Any]]]:
+        """Serialised latest events for many companies, `limit` per company, in one query."""
+        ids = list(dict.fromkeys(company_ids))
+        grouped: Dict[UUID, List[Dict[str, Any]]] = {company_id: [] for company_id in ids}
+        if not ids:
+            return grouped
+
+        def _query(sync_session):
+            ranked_stmt = select(
+                CompetitorChangeEvent.id.label("event_id"),
+                func.row_number()
+                .over(
+                    partition_by=CompetitorChangeEvent.company_id,
+                    order_by=(
+                        desc(CompetitorChangeEvent.detected_at),
+                        desc(CompetitorChangeEvent.id),
+                    ),
+                )
+                .label("row_number"),
+            ).where(CompetitorChangeEvent.company_id.in_(ids))
+            if status:
+                ranked_stmt = ranked_stmt.where(
+                    CompetitorChangeEvent.processing_status == status
+                )
+            ranked = ranked_stmt.subquery()
+
+            stmt = (
+                self._change_event_rows_select()
+                .join(ranked, ranked.c.event_id == CompetitorChangeEvent.id)
+                .where(ranked.c.row_number <= limit)
+                .order_by(
+                    CompetitorChangeEvent.company_id,
+                    desc(CompetitorChangeEvent.detected_at),
+                    desc(CompetitorChangeEvent.id),
+                )
+            )
+            result = sync_session.execute(stmt)
+            return result.mappings().all()
+
+        rows = await self.session.run_sync(_query)
+        for event in self._serialise_rows(rows):
+            grouped[event["company_id"]].append(event)
+        return grouped
+
     async def paginate_change_events_serialised(
         self,
         company_id: UUID,
@@ -115,59 +165,8 @@ class ChangeEventRepository:
         source_types: Optional[Sequence[SourceType]] = None,
     ) -> List[Dict[str, Any]]:
         def _query(sync_session):
-            current_snapshot = aliased(
-                CompetitorPricingSnapshot, name="current_snapshot"
-            )
-            previous_snapshot = aliased(
-                CompetitorPricingSnapshot, name="previous_snapshot"
-            )
-
-            stmt = (
-                select(
-                    CompetitorChangeEvent.id.label("id"),
-                    CompetitorChangeEvent.company_id.label("company_id"),
-                    CompetitorChangeEvent.source_type.label("source_type"),
-                    CompetitorChangeEvent.change_summary.label("change_summary"),
-                    CompetitorChangeEvent.changed_fields.label("changed_fields"),
-                    CompetitorChangeEvent.raw_diff.label("raw_diff"),
-                    CompetitorChangeEvent.detected_at.label("detected_at"),
-                    CompetitorChangeEvent.processing_status.label("processing_status"),
-                    CompetitorChangeEvent.notification_status.label(
-                        "notification_status"
-                    ),
-                    current_snapshot.id.label("current_id"),
-                    current_snapshot.parser_version.label("current_parser_version"),
-                    current_snapshot.raw_snapshot_url.label("current_raw_snapshot_url"),
-                    current_snapshot.extraction_metadata.label(
-                        "current_extraction_metadata"
-                    ),
-                    current_snapshot.warnings.label("current_warnings"),
-                    current_snapshot.processing_status.label(
-                        "current_processing_status"
-                    ),
-                    previous_snapshot.id.label("previous_id"),
-                    previous_snapshot.parser_version.label("previous_parser_version"),
-                    previous_snapshot.raw_snapshot_url.label(
-                        "previous_raw_snapshot_url"
-                    ),
-                    previous_snapshot.extraction_metadata.label(
-                        "previous_extraction_metadata"
-                    ),
-                    previous_snapshot.warnings.label("previous_warnings"),
-                    previous_snapshot.processing_status.label(
-                        "previous_processing_status"
-                    ),
-                )
-                .select_from(CompetitorChangeEvent)
-                .outerjoin(
-                    current_snapshot,
-                    current_snapshot.id == CompetitorChangeEvent.current_snapshot_id,
-                )
-                .outerjoin(
-                    previous_snapshot,
-                    previous_snapshot.id == CompetitorChangeEvent.previous_snapshot_id,
-                )
-                .where(CompetitorChangeEvent.company_id == company_id)
+            stmt = self._change_event_rows_select().where(
+                CompetitorChangeEvent.company_id == company_id
             )
             if status:
                 stmt = stmt.where(CompetitorChangeEvent.processing_status == status)
@@ -195,6 +194,62 @@ class ChangeEventRepository:
 
         return await self.session.run_sync(_query)
 
+    @staticmethod
+    def _change_event_rows_select():
+        current_snapshot = aliased(
+            CompetitorPricingSnapshot, name="current_snapshot"
+        )
+        previous_snapshot = aliased(
+            CompetitorPricingSnapshot, name="previous_snapshot"
+        )
+
+        return (
+            select(
+                CompetitorChangeEvent.id.label("id"),
+                CompetitorChangeEvent.company_id.label("company_id"),
+                CompetitorChangeEvent.source_type.label("source_type"),
+                CompetitorChangeEvent.change_summary.label("change_summary"),
+                CompetitorChangeEvent.changed_fields.label("changed_fields"),
+                CompetitorChangeEvent.raw_diff.label("raw_diff"),
+                CompetitorChangeEvent.detected_at.label("detected_at"),
+                CompetitorChangeEvent.processing_status.label("processing_status"),
+                CompetitorChangeEvent.notification_status.label(
+                    "notification_status"
+                ),
+                current_snapshot.id.label("current_id"),
+                current_snapshot.parser_version.label("current_parser_version"),
+                current_snapshot.raw_snapshot_url.label("current_raw_snapshot_url"),
+                current_snapshot.extraction_metadata.label(
+                    "current_extraction_metadata"
+                ),
+                current_snapshot.warnings.label("current_warnings"),
+                current_snapshot.processing_status.label(
+                    "current_processing_status"
+                ),
+                previous_snapshot.id.label("previous_id"),
+                previous_snapshot.parser_version.label("previous_parser_version"),
+                previous_snapshot.raw_snapshot_url.label(
+                    "previous_raw_snapshot_url"
+                ),
+                previous_snapshot.extraction_metadata.label(
+                    "previous_extraction_metadata"
+                ),
+                previous_snapshot.warnings.label("previous_warnings"),
+                previous_snapshot.processing_status.label(
+                    "previous_processing_status"
+                ),
+            )
+            .select_from(CompetitorChangeEvent)
+            .outerjoin(
+                current_snapshot,
+                current_snapshot.id == CompetitorChangeEvent.current_snapshot_id,
+            )
+            .outerjoin(
+                previous_snapshot,
+                previous_snapshot.id == CompetitorChangeEvent.previous_snapshot_id,
+            )
+        )
+
     def _serialise_rows(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         payload: List[Dict[str, Any]] = []
         for row in rows:
@@ -63,6 +63,19 @@ class CompetitorChangeDomainService:
             status=status,
         )
 
+    async def list_change_events_payload_bulk(
+        self,
+        company_ids: Sequence[UUID],
+        *,
+        limit: int = 20,
+        status: Optional[ChangeProcessingStatus] = None,
+    ) -> Dict[UUID, List[Dict[str, Any]]]:
+        return await self._change_repo.list_change_events_serialised_bulk(
+            company_ids,
+            limit=limit,
+            status=status,
+        )
+
     async def paginate_change_events_payload(
         self,
         company_id: UUID,
@@ -20,6 +20,7 @@ from bs4 import BeautifulSoup
 
 from app.core.exceptions import NewsServiceError, ValidationError
 from app.core.config import settings
+from app.services.competitor_analytics_cache import invalidate_company_cache
 from app.utils.datetime_utils import parse_iso_datetime, to_naive_utc
 from app.models.news import (
     NewsItem,
@@ -76,6 +77,7 @@ class NewsIngestionService:
                     news_item.id,
                 )
             logger.debug("News item committed and refreshed")
+            self._invalidate_company_analytics(news_item.company_id)
             setattr(news_item, "_was_created", True)
             return news_item
         except ValidationError:
@@ -87,6 +89,12 @@ class NewsIngestionService:
             traceback.print_exc()
             raise NewsServiceError(f"Failed to create news item: {exc}") from exc
 
+    @staticmethod
+    def _invalidate_company_analytics(*company_ids: Optional[UUID]) -> None:
+        for company_id in company_ids:
+            if company_id:
+                invalidate_company_cache(company_id)
+
     async def _enrich_from_detail_page(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if not settings.SCRAPER_DETAIL_ENRICHMENT_ENABLED:
             return data
@@ -182,12 +190,14 @@ class NewsIngestionService:
             if not news_item:
                 return None
 
+            previous_company_id = news_item.company_id
             for key, value in data.items():
                 if hasattr(news_item, key):
                     normalised = await self._normalise_update_field(key, value)
                     setattr(news_item, key, normalised)
 
             await self.session.commit()
+            self._invalidate_company_analytics(previous_company_id, news_item.company_id)
             await self.session.refresh(news_item)
             try:
                 await self.session.refresh(
@@ -211,8 +221,10 @@ class NewsIngestionService:
             if not news_item:
                 return False
 
+            company_id = news_item.company_id
             await self.session.delete(news_item)
             await self.session.commit()
+            self._invalidate_company_analytics(company_id)
             return True
         except Exception as exc:
             await self.session.rollback()
@@ -8,7 +8,7 @@ to prevent unnecessary requests.
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional, Set
+from typing import Any, Dict, Iterable, Mapping, Optional, Set, Tuple
 from uuid import UUID
 
 from loguru import logger
@@ -153,19 +153,69 @@ class SourceHealthService:
             items_count: Number of items found
             source_type: Optional source type for filtering profiles
         """
-        from app.scrapers.universal_scraper import UniversalBlogScraper
+        await self.record_results_bulk(
+            company_id,
+            [
+                {
+                    "source_url": source_url,
+                    "success": success,
+                    "status": status,
+                    "items_count": items_count,
+                    "source_type": source_type,
+                }
+            ],
+        )
 
-        # Normalize URL
-        scraper = UniversalBlogScraper()
-        normalized_url = scraper._normalize_url(source_url)
-        await scraper.close()
+    async def record_results_bulk(
+        self,
+        company_id: UUID,
+        results: Iterable[Mapping[str, Any]],
+    ) -> None:
+        """
+        Record several fetch results with a single metadata write per source profile.
+        
+        Args:
+            company_id: Company UUID
+            results: Mappings with the ``record_result`` arguments (source_url, success,
+                status, items_count and an optional source_type)
+        """
+        from app.scrapers.universal_scraper import normalize_source_url
 
-        # Get or create source profile
-        profile = await self._get_or_create_profile(company_id, source_type)
+        now = datetime.now(timezone.utc)
+        touched: Dict[SourceType, Tuple[SourceProfile, Dict]] = {}
+
+        for result in results:
+            source_type = result.get("source_type") or SourceType.BLOG
+            if source_type not in touched:
+                # Get or create source profile
+                profile = await self._get_or_create_profile(company_id, source_type)
+                touched[source_type] = (profile, profile.metadata_json or {})
+            _, metadata = touched[source_type]
+
+            self._apply_result(
+                dead_urls=metadata.setdefault("dead_urls", {}),
+                company_id=company_id,
+                normalized_url=normalize_source_url(result["source_url"]),
+                success=result["success"],
+                status=result["status"],
+                items_count=result["items_count"],
+                now=now,
+            )
 
-        metadata = profile.metadata_json or {}
-        dead_urls = metadata.setdefault("dead_urls", {})
+        for profile, metadata in touched.values():
+            await self._save_profile_metadata(profile, metadata)
 
+    def _apply_result(
+        self,
+        dead_urls: Dict,
+        company_id: UUID,
+        normalized_url: str,
+        success: bool,
+        status: int,
+        items_count: int,
+        now: datetime,
+    ) -> None:
+        """Update the dead-URL entry for a single fetch result in place."""
         url_data = dead_urls.setdefault(normalized_url, {
             "status": "healthy",
             "fail_count": 0,
@@ -175,7 +225,6 @@ class SourceHealthService:
             "permanent": False,  # Флаг постоянного отключения (для 404/410)
         })
 
-        now = datetime.now(timezone.utc)
         now_iso = now.isoformat()
 
         if success and items_count > 0:
@@ -239,8 +288,6 @@ class SourceHealthService:
                 f"not counting as dead URL failure"
             )
 
-        await self._save_profile_metadata(profile, metadata)
-
     async def should_skip_url(self, company_id: UUID, source_url: str) -> bool:
         """
         Check if URL should be skipped.
@@ -252,13 +299,9 @@ class SourceHealthService:
         Returns:
             True if URL should be skipped
         """
-        from app.scrapers.universal_scraper import UniversalBlogScraper
-
-        # Normalize URL
-        scraper = UniversalBlogScraper()
-        normalized_url = scraper._normalize_url(source_url)
-        await scraper.close()
+        from app.scrapers.universal_scraper import normalize_source_url
 
+        normalized_url = normalize_source_url(source_url)
         dead_urls = await self.get_dead_urls(company_id)
         return normalized_url in dead_urls
 
@@ -261,7 +261,13 @@ class NewsItem(BaseModel):
     
     # Indexes and constraints
     __table_args__ = (
-        Index('idx_news_company_published', 'company_id', 'published_at'),
+        Index(
+            'idx_news_company_published_covering',
+            'company_id',
+            'published_at',
+            postgresql_include=['category', 'topic', 'sentiment', 'source_type', 'priority_score'],
+        ),
+        Index('idx_news_company_priority_published', 'company_id', 'priority_score', 'published_at'),
         Index('idx_news_category_published', 'category', 'published_at'),
         Index('idx_news_source_type', 'source_type'),
         Index('idx_news_priority_score', 'priority_score'),
@@ -14,7 +14,10 @@ from app.models import (
     AnalyticsEntityType,
     AnalyticsPeriod,
     ImpactComponentType,
+    NewsTopic,
     RelationshipType,
+    SentimentLabel,
+    SourceType,
 )
 from app.schemas.competitor_events import CompetitorChangeEventSchema
 
@@ -126,9 +129,9 @@ class ReportPresetCreateRequest(BaseModel):
 class ComparisonFilters(BaseModel):
     """Public filters applied to comparison subjects."""
 
-    topics: List[str] = Field(default_factory=list)
-    sentiments: List[str] = Field(default_factory=list)
-    source_types: List[str] = Field(default_factory=list)
+    topics: List[NewsTopic] = Field(default_factory=list)
+    sentiments: List[SentimentLabel] = Field(default_factory=list)
+    source_types: List[SourceType] = Field(default_factory=list)
     min_priority: Optional[float] = None
 
 
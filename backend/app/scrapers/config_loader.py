@@ -5,8 +5,9 @@ Helpers for loading scraper source configuration.
 from __future__ import annotations
 
 import json
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from pydantic import BaseModel, Field, HttpUrl, ValidationError
@@ -23,6 +24,11 @@ class SourceRetryConfig(BaseModel):
     attempts: int = Field(default=settings.SCRAPER_MAX_RETRIES, ge=0)
     backoff_factor: float = Field(default=settings.SCRAPER_RETRY_BACKOFF, gt=0)
 
+    @cached_property
+    def backoff_delays(self) -> Tuple[float, ...]:
+        """Sleep before each retry, indexed by attempt and capped at 10 seconds."""
+        return tuple(min(10.0, self.backoff_factor ** attempt) for attempt in range(self.attempts + 1))
+
 
 class SourceConfig(BaseModel):
     """
@@ -6,22 +6,31 @@ retry policies, rate limiting, and SPA fallbacks.
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
+import os
 import re
+import threading
 import time
+import zlib
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import ParseResult, SplitResult, urljoin, urlparse, urlsplit
+from uuid import UUID
 
 import httpx
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import ValidationError
 from loguru import logger
 
 from app.core.config import settings
-from app.models.news import NewsCategory
+from app.instrumentation import celery_metrics
+from app.models.news import NewsCategory, SourceType
 from app.scrapers.config_loader import (
     ScraperConfigRegistry,
     SourceConfig,
@@ -31,6 +40,13 @@ from app.scrapers.headless import fetch_page_with_headless
 from app.scrapers.rate_limiter import RateLimiter, SourceFetchLock
 from app.utils.datetime_utils import utc_now_naive
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+except ImportError:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
+
 
 DEFAULT_ARTICLE_SELECTORS: Tuple[str, ...] = (
     "article a",
@@ -62,6 +78,67 @@ DEFAULT_ARTICLE_SELECTORS: Tuple[str, ...] = (
     '[class*="news"] a',
 )
 
+# libxml2-backed parser; lxml is a declared dependency and is several times faster than html.parser.
+_HTML_PARSER = "lxml"
+# Source discovery only inspects links, so it builds a tree of <a href> tags alone.
+_ANCHOR_STRAINER = SoupStrainer("a", href=True)
+
+# Joined into one selector list and parsed once at import, so each page is walked a single time.
+_COMBINED_DEFAULT_SELECTOR = ", ".join(DEFAULT_ARTICLE_SELECTORS)
+_COMPILED_DEFAULT_SELECTOR: soupsieve.SoupSieve = soupsieve.compile(_COMBINED_DEFAULT_SELECTOR)
+
+# Classifies a URL in one scan; the first matching group names the source type.
+_URL_KIND_RE = re.compile(r"(?P<news_site>/news/)|(?P<press_release>/press/|press-release)", re.IGNORECASE)
+_SECTION_PATH_RE = re.compile(r"/(?:blog|news|press)", re.IGNORECASE)
+_SECTION_WORD_RE = re.compile(r"blog|news|press", re.IGNORECASE)
+
+# Next.js payload patterns, compiled once instead of per script tag.
+_HREF_RE = re.compile(r'(?:\\?["\'])href(?:\\?["\']):\s*(?:\\?["\'])(/blogs?/[^\\"\'\s]+)(?:\\?["\'])')
+_TITLE_RE = re.compile(r'"(?:title|children)":"((?:\\u[0-9a-fA-F]{4}|[^"\\]){6,})"', re.IGNORECASE)
+_JSON_U_RE = re.compile(r"\\u([0-9a-fA-F]{4})")
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9\-]+")
+# Кандидаты обычно с одного хоста: HEAD-пробы шлём небольшими пачками, а не все разом
+_PROBE_BATCH_SIZE = 3
+
+_NON_ARTICLE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".pdf", ".zip", ".mp4", ".mp3", ".svg"})
+_ARTICLE_PATH_RE = re.compile(
+    r"/(?:blogs?|news|posts?|articles?|updates?|insights?|press(?:-release)?)/", re.IGNORECASE
+)
+
+_SOURCE_TYPE_MAP: Dict[str, SourceType] = {
+    "news_site": SourceType.NEWS_SITE,
+    "press_release": SourceType.PRESS_RELEASE,
+}
+
+# Ordered by priority: the first group with a keyword in the title wins.
+_CATEGORY_KEYWORDS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("price", "pricing", "plan", "billing"), NewsCategory.PRICING_CHANGE.value),
+    (("funding", "seed", "series a", "series b", "investment"), NewsCategory.FUNDING_NEWS.value),
+    (("release", "launched", "launch", "introducing"), NewsCategory.PRODUCT_UPDATE.value),
+    (("security", "vulnerability", "patch", "cve"), NewsCategory.SECURITY_UPDATE.value),
+    (("api", "sdk"), NewsCategory.API_UPDATE.value),
+    (("integration", "integrates with"), NewsCategory.INTEGRATION.value),
+    (("deprecated", "deprecation", "sunset"), NewsCategory.FEATURE_DEPRECATION.value),
+    (("acquires", "acquisition", "merger"), NewsCategory.ACQUISITION.value),
+    (("partner", "partnership"), NewsCategory.PARTNERSHIP.value),
+    (("model", "gpt", "llama"), NewsCategory.MODEL_RELEASE.value),
+    (("performance", "faster", "improvement"), NewsCategory.PERFORMANCE_IMPROVEMENT.value),
+    (("paper", "arxiv", "research"), NewsCategory.RESEARCH_PAPER.value),
+    (("webinar", "event", "conference", "meetup"), NewsCategory.COMMUNITY_EVENT.value),
+    (("strategy", "vision", "roadmap"), NewsCategory.STRATEGIC_ANNOUNCEMENT.value),
+    (("technical", "architecture", "infra", "infrastructure"), NewsCategory.TECHNICAL_UPDATE.value),
+)
+_CATEGORY_BY_KEYWORD: Dict[str, Tuple[int, str]] = {}
+for _priority, (_keywords, _category) in enumerate(_CATEGORY_KEYWORDS):
+    for _keyword in _keywords:
+        _CATEGORY_BY_KEYWORD.setdefault(_keyword, (_priority, _category))
+# One scan over the title; the lookahead reports overlapping keywords at every position.
+_CATEGORY_RE = re.compile(
+    "(?=({}))".format(
+        "|".join(re.escape(keyword) for keyword in sorted(_CATEGORY_BY_KEYWORD, key=len, reverse=True))
+    )
+)
+
 DISCOVERY_KEYWORDS: Tuple[str, ...] = (
     "blog",
     "news",
@@ -74,6 +151,101 @@ DISCOVERY_KEYWORDS: Tuple[str, ...] = (
 )
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> Optional[soupsieve.SoupSieve]:
+    """Compile a per-source CSS selector, returning None when it is invalid."""
+    try:
+        return soupsieve.compile(selector)
+    except soupsieve.SelectorSyntaxError:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector_group(selectors: Tuple[str, ...]) -> Optional[soupsieve.SoupSieve]:
+    """Compile per-source selectors into one comma-joined selector list, or None if any is invalid."""
+    try:
+        return soupsieve.compile(", ".join(selectors))
+    except soupsieve.SelectorSyntaxError:
+        return None
+
+
+# Metrics are read through the module on every call because tests rebind celery_metrics._metrics;
+# a metrics failure must never fail a fetch.
+def _record_scraper_request(status: str, source_type: Optional[str]) -> None:
+    try:
+        celery_metrics._metrics.record_scraper_request(status, source_type or "unknown")
+    except Exception:
+        pass
+
+
+def _record_duplicate_request(source_type: Optional[str]) -> None:
+    try:
+        celery_metrics._metrics.record_duplicate_request(source_type or "unknown")
+    except Exception:
+        pass
+
+
+def _fast_join(base_split: SplitResult, base_url: str, href: str) -> str:
+    """urljoin for the common href shapes, reusing the page URL split once by the caller."""
+    if "/." in href:
+        # Dot segments need urljoin's path normalisation
+        return urljoin(base_url, href)
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("//"):
+        return f"{base_split.scheme}:{href}"
+    if href.startswith("/"):
+        return f"{base_split.scheme}://{base_split.netloc}{href}"
+    return urljoin(base_url, href)
+
+
+def _unescape_json_u(value: str) -> str:
+    """Decode JSON \\uXXXX escapes without a bytes round-trip through unicode_escape."""
+    return _JSON_U_RE.sub(lambda match: chr(int(match.group(1), 16)), value)
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_executor() -> ThreadPoolExecutor:
+    """Shared pool for HTML parsing, so pages are not parsed on the event loop."""
+    return ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="scraper-parse",
+    )
+
+
+# Discovery and domain checks parse the same site URL once per candidate link.
+_cached_urlparse = functools.lru_cache(maxsize=2048)(urlparse)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_source_url(url: str) -> str:
+    """Canonical form of a URL used for deduplication, locking and health tracking."""
+    return _normalize_parsed_url(urlparse(url))
+
+
+def _normalize_parsed_url(parsed: ParseResult) -> str:
+    # Приводим домен к lowercase
+    netloc = parsed.netloc.lower() if parsed.netloc else ""
+    # Убираем trailing slash из path
+    path = parsed.path.rstrip("/") if parsed.path else ""
+    # Собираем URL без query params и fragment
+    return f"{parsed.scheme}://{netloc}{path}"
+
+
+@dataclass(frozen=True, slots=True)
+class _ParsedUrl:
+    """A source URL parsed once and threaded through the fetch pipeline."""
+
+    raw: str
+    normalized: str
+    host: str
+
+    @classmethod
+    def from_str(cls, url: str) -> "_ParsedUrl":
+        parsed = urlparse(url)
+        return cls(raw=url, normalized=_normalize_parsed_url(parsed), host=parsed.netloc or url)
+
+
 class NeedsHeadless(RuntimeError):
     """Raised when a request is blocked and should be retried via headless browser."""
 
@@ -81,6 +253,11 @@ class NeedsHeadless(RuntimeError):
 class UniversalBlogScraper:
     """Universal scraper that can scrape blogs from any company."""
 
+    # Upper bound on articles recovered from Next.js hydration payloads per page.
+    MAX_NEXTJS_ARTICLES = 50
+    # Upper bound on snapshot digests remembered as already written.
+    SNAPSHOT_SEEN_MAX_ENTRIES = 10_000
+
     def __init__(
         self,
         config_registry: Optional[ScraperConfigRegistry] = None,
@@ -90,6 +267,13 @@ class UniversalBlogScraper:
             headers={"User-Agent": settings.SCRAPER_USER_AGENT},
             timeout=settings.SCRAPER_TIMEOUT,
             follow_redirects=True,
+            # Article pages mostly share a host, so multiplex them over pooled connections.
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRAPER_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SCRAPER_KEEPALIVE_EXPIRY,
+            ),
         )
         self.session = httpx.AsyncClient(**common_kwargs)
         self.proxy_session: Optional[httpx.AsyncClient] = None
@@ -100,11 +284,20 @@ class UniversalBlogScraper:
             )
         self.config_registry = config_registry or ScraperConfigRegistry()
         self.rate_limiter = rate_limiter or RateLimiter()
-        # In-memory cache for request deduplication within a single scraper instance
-        # Key: (normalized_url, company_name), Value: (html, final_url, fetched_at)
-        self._request_cache: Dict[Tuple[str, str], Tuple[str, str, float]] = {}
+        # Bounded LRU cache for request deduplication within a single scraper instance
+        # Key: (normalized_url, company_name), Value: (zlib-compressed html, final_url, fetched_at)
+        self._request_cache: "OrderedDict[Tuple[str, str], Tuple[bytes, str, float]]" = OrderedDict()
+        self._cache_max_entries = settings.SCRAPER_CACHE_MAX_ENTRIES
+        self._cache_ttl = settings.SCRAPER_CACHE_TTL_SECONDS
+        # Snapshots already written by this instance: (slug, source_id, digest) -> resolved path
+        self._snapshot_seen: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        # Snapshots are written from worker threads, so the LRU above is guarded
+        self._snapshot_lock = threading.Lock()
         # Distributed lock for preventing duplicate requests across workers
         self._fetch_lock = SourceFetchLock()
+        # In-process gating: caps concurrent fetches and lets duplicate URLs wait for the in-flight one
+        self._concurrency = asyncio.Semaphore(settings.SCRAPER_MAX_CONCURRENCY)
+        self._inflight: Dict[str, asyncio.Event] = {}
 
     @staticmethod
     def detect_blog_urls(website: str) -> List[str]:
@@ -158,10 +351,6 @@ class UniversalBlogScraper:
             f"Scraping blog for {company_name} (news_page_url={news_page_url}, overrides={bool(source_overrides)})"
         )
 
-        # Сохраняем company_id и health_service для использования в _fetch_with_retry
-        self._current_company_id = company_id
-        self._current_health_service = health_service
-
         news_items: List[Dict[str, Any]] = []
         seen_urls: Set[str] = set()
 
@@ -174,21 +363,21 @@ class UniversalBlogScraper:
         
         # Фильтруем source_configs по skip_urls
         if skip_urls:
+            skip_set = {self._normalize_url(url) for url in skip_urls}
             filtered_configs = []
             for source_config in source_configs:
                 # Проверяем, есть ли URL в skip_urls
-                should_skip = False
-                for url in source_config.urls:
-                    normalized = self._normalize_url(str(url))
-                    if normalized in skip_urls:
-                        should_skip = True
-                        logger.debug(
-                            f"Skipping source {source_config.id} for {company_name} "
-                            f"(URL {url} is in skip_urls)"
-                        )
-                        break
-                if not should_skip:
-                    filtered_configs.append(source_config)
+                skipped_url = next(
+                    (url for url in source_config.urls if self._normalize_url(str(url)) in skip_set),
+                    None,
+                )
+                if skipped_url is not None:
+                    logger.debug(
+                        f"Skipping source {source_config.id} for {company_name} "
+                        f"(URL {skipped_url} is in skip_urls)"
+                    )
+                    continue
+                filtered_configs.append(source_config)
             source_configs = filtered_configs
 
         discoveries: List[SourceConfig] = []
@@ -238,6 +427,8 @@ class UniversalBlogScraper:
                         source_config=source_config,
                         max_articles=per_source_limit,
                         seen_urls=seen_urls,
+                        company_id=company_id,
+                        health_service=health_service,
                     )
                     news_items.extend(source_items)
                 except Exception as exc:
@@ -274,9 +465,11 @@ class UniversalBlogScraper:
                 blog_urls = [news_page_url]
                 logger.info(f"Using manual news page URL for {company_name}: {news_page_url}")
             else:
-                blog_urls = self._detect_blog_url(website)
+                detected_urls = self._detect_blog_url(website)
+                blog_urls = await self._probe_candidates(detected_urls)
                 logger.info(
-                    f"Detected {len(blog_urls)} candidate blog URLs for {company_name}"
+                    f"Detected {len(blog_urls)}/{len(detected_urls)} reachable candidate blog URLs "
+                    f"for {company_name}"
                 )
 
             for blog_url in blog_urls:
@@ -287,12 +480,8 @@ class UniversalBlogScraper:
                     final_url = str(response.url)
                     if final_url != blog_url:
                         logger.debug(f"Redirected from {blog_url} to {final_url}")
-                        if (
-                            "/blog" not in final_url.lower()
-                            and "/news" not in final_url.lower()
-                            and "/press" not in final_url.lower()
-                        ):
-                            if any(segment in blog_url.lower() for segment in ("blog", "news", "press")):
+                        if not _SECTION_PATH_RE.search(final_url):
+                            if _SECTION_WORD_RE.search(blog_url):
                                 logger.debug(
                                     f"Skipping {final_url} - redirect appears to leave blog/news section"
                                 )
@@ -308,13 +497,11 @@ class UniversalBlogScraper:
                         )
                         continue
 
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    articles = self._extract_articles(soup, final_url, DEFAULT_ARTICLE_SELECTORS)
+                    articles = await self._run_parser(
+                        self._parse_and_extract, response.text, final_url, _COMPILED_DEFAULT_SELECTOR
+                    )
                     if not articles:
-                        page_title = soup.title.string if soup.title else "N/A"
-                        logger.debug(
-                            f"Loaded {final_url} but no articles found (title={page_title})"
-                        )
+                        logger.debug(f"Loaded {final_url} but no articles found")
                         continue
 
                     logger.info(
@@ -322,12 +509,8 @@ class UniversalBlogScraper:
                     )
 
                     for idx, article in enumerate(articles[:max_articles]):
-                        source_type = "blog"
-                        url_lower = article["url"].lower()
-                        if "/news/" in url_lower:
-                            source_type = "news_site"
-                        elif "/press/" in url_lower or "press-release" in url_lower:
-                            source_type = "press_release"
+                        kind_match = _URL_KIND_RE.search(article["url"])
+                        source_type = kind_match.lastgroup if kind_match else "blog"
 
                         title_lower = article["title"].lower()
                         inferred_category: Optional[str] = None
@@ -408,6 +591,37 @@ class UniversalBlogScraper:
             logger.exception(f"Fallback scraping failed for {company_name}: {exc}")
             return []
 
+    async def _probe_candidates(self, urls: List[str], timeout: float = 5.0) -> List[str]:
+        """
+        Issue HEAD requests in small batches and keep only URLs that look reachable.
+
+        Candidates usually share one host, so at most ``_PROBE_BATCH_SIZE`` probes are in
+        flight at a time, and each one also holds a slot of the scraper-wide concurrency cap.
+        Servers that refuse HEAD (405/501) are kept so the caller can fall back to GET.
+        """
+        if not urls:
+            return []
+
+        async def _probe(url: str) -> httpx.Response:
+            async with self._concurrency:
+                return await self.session.head(url, timeout=timeout)
+
+        responses: List[Union[httpx.Response, BaseException]] = []
+        for start in range(0, len(urls), _PROBE_BATCH_SIZE):
+            batch = urls[start:start + _PROBE_BATCH_SIZE]
+            responses.extend(
+                await asyncio.gather(*(_probe(url) for url in batch), return_exceptions=True)
+            )
+
+        reachable: List[str] = []
+        for url, response in zip(urls, responses):
+            if isinstance(response, BaseException):
+                logger.debug(f"HEAD probe failed for {url}: {response}")
+                continue
+            if 200 <= response.status_code < 400 or response.status_code in (405, 501):
+                reachable.append(url)
+        return reachable
+
     async def scrape_multiple_companies(
         self,
         companies: List[Dict[str, str]],
@@ -461,6 +675,8 @@ class UniversalBlogScraper:
         source_config: SourceConfig,
         max_articles: int,
         seen_urls: Set[str],
+        company_id: Optional[str] = None,
+        health_service: Optional[Any] = None,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Scrape a source and return items along with statistics.
@@ -480,137 +696,143 @@ class UniversalBlogScraper:
             "success": False,
         }
 
-        for raw_url in source_config.urls:
-            url = str(raw_url)
-            source_stats["source_url"] = url
-            
-            # Получаем company_id и health_service из параметров scraper
-            company_id = getattr(self, '_current_company_id', None)
-            health_service = getattr(self, '_current_health_service', None)
-            source_type_str = source_config.source_type
-            
-            html, final_url, status_code = await self._fetch_with_retry(
-                url, 
-                source_config, 
-                company_name=company_name,
-                company_id=company_id,
-                health_service=health_service,
-                source_type=source_type_str,
-            )
-            source_stats["status"] = status_code
-            
-            if not html:
-                # Если HTML не получен, это может быть 404 или другая ошибка
-                source_stats["success"] = False
-                source_stats["items_count"] = 0
-                continue
+        source_type_str = source_config.source_type
+        # Результаты для health_service копим и записываем одним вызовом на источник
+        health_results: Optional[List[Dict[str, Any]]] = [] if company_id and health_service else None
+        # Селекторы источника компилируем один раз, а не на каждой странице
+        selectors: Union[soupsieve.SoupSieve, List[str]] = _COMPILED_DEFAULT_SELECTOR
+        if source_config.selectors:
+            selectors = _compile_selector_group(tuple(source_config.selectors)) or source_config.selectors
 
-            # Если HTML получен, считаем успешным
-            source_stats["success"] = True
+        try:
+            for raw_url in source_config.urls:
+                parsed_url = _ParsedUrl.from_str(str(raw_url))
+                url = parsed_url.raw
+                source_stats["source_url"] = url
+
+                html, final_url, status_code = await self._fetch_with_retry(
+                    parsed_url,
+                    source_config, 
+                    company_name=company_name,
+                    source_type=source_type_str,
+                    health_results=health_results,
+                )
+                source_stats["status"] = status_code
+            
+                if not html:
+                    # Если HTML не получен, это может быть 404 или другая ошибка
+                    source_stats["success"] = False
+                    source_stats["items_count"] = 0
+                    continue
 
-            snapshot_path = self._persist_snapshot(company_name, source_config.id, final_url, html)
-            soup = BeautifulSoup(html, "html.parser")
-            selectors = source_config.selectors or DEFAULT_ARTICLE_SELECTORS
-            articles = self._extract_articles(soup, final_url, selectors)
+                # Если HTML получен, считаем успешным
+                source_stats["success"] = True
 
-            if not articles:
-                logger.debug(
-                    f"No articles found for {company_name} at {final_url} (source {source_config.id})"
-                )
-                source_stats["items_count"] = 0
-                # Записываем результат в health_service (пустой ответ)
-                if company_id and health_service:
-                    await self._record_health_result(
-                        company_id, url, False, status_code, 0,
-                        health_service, source_type_str
+                snapshot_path: Optional[str] = None
+                if settings.SCRAPER_SNAPSHOTS_ENABLED:
+                    # Хеширование и запись на диск не должны блокировать event loop
+                    snapshot_path = await asyncio.to_thread(
+                        self._persist_snapshot, company_name, source_config.id, final_url, html
                     )
-                # Не прерываем цикл, продолжаем со следующим URL
-                continue
-
-            logger.info(
-                f"Found {len(articles)} articles for {company_name} at {final_url} (source {source_config.id})"
-            )
-            source_stats["items_count"] = len(articles)
+                articles = await self._run_parser(self._parse_and_extract, html, final_url, selectors)
 
-            for idx, article in enumerate(articles):
-                if article["url"] in seen_urls:
+                if not articles:
+                    logger.debug(
+                        f"No articles found for {company_name} at {final_url} (source {source_config.id})"
+                    )
+                    source_stats["items_count"] = 0
+                    # Записываем результат в health_service (пустой ответ)
+                    if health_results is not None:
+                        health_results.append(
+                            self._health_result(url, False, status_code, 0, source_type_str)
+                        )
+                    # Не прерываем цикл, продолжаем со следующим URL
                     continue
-                seen_urls.add(article["url"])
-
-                inferred_category = self._infer_category(article["title"])
-                published_at = utc_now_naive() - timedelta(days=idx)
-                items.append(
-                    {
-                        "title": article["title"],
-                        "content": f"Article from {company_name}: {article['title']}",
-                        "summary": article["title"][:200],
-                        "source_url": article["url"],
-                        "source_type": source_config.source_type,
-                        "company_name": company_name,
-                        "category": inferred_category or NewsCategory.PRODUCT_UPDATE.value,
-                        "topic": None,
-                        "sentiment": None,
-                        "priority_score": 0.5,
-                        "raw_snapshot_url": snapshot_path,
-                        "published_at": published_at,
-                    }
+
+                logger.info(
+                    f"Found {len(articles)} articles for {company_name} at {final_url} (source {source_config.id})"
                 )
+                source_stats["items_count"] = len(articles)
+
+                for idx, article in enumerate(articles):
+                    if article["url"] in seen_urls:
+                        continue
+                    seen_urls.add(article["url"])
+
+                    inferred_category = self._infer_category(article["title"])
+                    published_at = utc_now_naive() - timedelta(days=idx)
+                    items.append(
+                        {
+                            "title": article["title"],
+                            "content": f"Article from {company_name}: {article['title']}",
+                            "summary": article["title"][:200],
+                            "source_url": article["url"],
+                            "source_type": source_config.source_type,
+                            "company_name": company_name,
+                            "category": inferred_category or NewsCategory.PRODUCT_UPDATE.value,
+                            "topic": None,
+                            "sentiment": None,
+                            "priority_score": 0.5,
+                            "raw_snapshot_url": snapshot_path,
+                            "published_at": published_at,
+                        }
+                    )
+
+                    if len(items) >= max_articles:
+                        break
 
                 if len(items) >= max_articles:
                     break
-
-            if len(items) >= max_articles:
-                break
             
-            # Записываем результат в health_service после обработки URL
-            if company_id and health_service:
-                await self._record_health_result(
-                    company_id, url, source_stats["success"], 
-                    source_stats["status"], source_stats["items_count"],
-                    health_service, source_type_str
-                )
+                # Записываем результат в health_service после обработки URL
+                if health_results is not None:
+                    health_results.append(
+                        self._health_result(
+                            url, source_stats["success"], source_stats["status"],
+                            source_stats["items_count"], source_type_str,
+                        )
+                    )
+        finally:
+            # Уже накопленные результаты записываем, даже если цикл прервался исключением
+            if health_results:
+                await self._record_health_results(company_id, health_results, health_service)
 
         return items, source_stats
     
-    async def _record_health_result(
-        self,
-        company_id: str,
+    @staticmethod
+    def _health_result(
         source_url: str,
         success: bool,
         status: int,
         items_count: int,
-        health_service: Any,
         source_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a buffered health result in the shape expected by record_results_bulk."""
+        return {
+            "source_url": source_url,
+            "success": success,
+            "status": status,
+            "items_count": items_count,
+            # По умолчанию BLOG
+            "source_type": _SOURCE_TYPE_MAP.get(source_type, SourceType.BLOG),
+        }
+
+    async def _record_health_results(
+        self,
+        company_id: str,
+        results: List[Dict[str, Any]],
+        health_service: Any,
     ) -> None:
-        """Helper method to record health result."""
+        """Flush buffered health results for a source in a single write."""
         try:
-            from uuid import UUID
-            from app.models.news import SourceType as ST
-            
             company_uuid = UUID(company_id) if isinstance(company_id, str) else company_id
-            st = ST.BLOG  # По умолчанию BLOG
-            
-            # Определяем source_type
-            if source_type == "news_site":
-                st = ST.NEWS_SITE
-            elif source_type == "press_release":
-                st = ST.PRESS_RELEASE
-            
-            await health_service.record_result(
-                company_id=company_uuid,
-                source_url=source_url,
-                success=success,
-                status=status,
-                items_count=items_count,
-                source_type=st,
-            )
+            await health_service.record_results_bulk(company_uuid, results)
             logger.debug(
-                f"Recorded source health result for {source_url} "
-                f"(status={status}, items={items_count}, success={success})"
+                f"Recorded {len(results)} source health results for company {company_id}"
             )
         except Exception as exc:
             logger.warning(
-                f"Failed to record source health result for {source_url}: {exc}",
+                f"Failed to record source health results for company {company_id}: {exc}",
                 exc_info=True
             )
 
@@ -622,62 +844,104 @@ class UniversalBlogScraper:
         - Убирает query params для сравнения
         - Возвращает канонический URL
         """
-        parsed = urlparse(url)
-        # Приводим домен к lowercase
-        netloc = parsed.netloc.lower() if parsed.netloc else ""
-        # Убираем trailing slash из path
-        path = parsed.path.rstrip("/") if parsed.path else ""
-        # Собираем URL без query params и fragment
-        normalized = f"{parsed.scheme}://{netloc}{path}"
-        return normalized
+        return normalize_source_url(url)
 
-    async def _fetch_with_retry(
+    def _get_cached_response(self, key: Tuple[str, str]) -> Optional[Tuple[str, str, float]]:
+        entry = self._request_cache.get(key)
+        if entry is None:
+            return None
+        compressed_html, final_url, fetched_at = entry
+        if time.time() - fetched_at > self._cache_ttl:
+            del self._request_cache[key]
+            return None
+        self._request_cache.move_to_end(key)
+        return zlib.decompress(compressed_html).decode("utf-8"), final_url, fetched_at
+
+    def _cached_fetch_result(
         self,
         url: str,
+        normalized_url: str,
+        company_name: Optional[str],
+        source_type: Optional[str],
+    ) -> Optional[Tuple[str, str, int]]:
+        if not company_name:
+            return None
+        cached = self._get_cached_response((normalized_url, company_name))
+        if cached is None:
+            return None
+        cached_html, cached_final_url, cached_time = cached
+        logger.debug(
+            f"Using cached response for {url} (normalized: {normalized_url}, "
+            f"cached at {cached_time})"
+        )
+        # Записываем метрику дубликата
+        _record_duplicate_request(source_type)
+        # Возвращаем статус 200 для кэшированного ответа
+        return cached_html, cached_final_url, 200
+
+    def _finish_inflight(self, normalized_url: str, done: asyncio.Event) -> None:
+        if self._inflight.get(normalized_url) is done:
+            del self._inflight[normalized_url]
+        done.set()
+
+    def _cache_response(self, key: Tuple[str, str], html: str, final_url: str) -> None:
+        now = time.time()
+        # Сначала выметаем протухшие записи с LRU-конца, чтобы они не занимали место до вытеснения
+        while self._request_cache:
+            oldest_key = next(iter(self._request_cache))
+            if now - self._request_cache[oldest_key][2] <= self._cache_ttl:
+                break
+            del self._request_cache[oldest_key]
+
+        # Сжатие идёт в event loop: уровень 1 в разы быстрее уровня по умолчанию при почти том же размере
+        self._request_cache[key] = (zlib.compress(html.encode("utf-8"), 1), final_url, now)
+        self._request_cache.move_to_end(key)
+        while len(self._request_cache) > self._cache_max_entries:
+            self._request_cache.popitem(last=False)
+
+    async def _fetch_with_retry(
+        self,
+        url: Union[str, _ParsedUrl],
         source_config: SourceConfig,
         company_name: Optional[str] = None,
-        company_id: Optional[str] = None,
-        health_service: Optional[Any] = None,
         source_type: Optional[str] = None,
+        health_results: Optional[List[Dict[str, Any]]] = None,
     ) -> Tuple[Optional[str], str, int]:
         """
         Fetch URL with retry logic and request deduplication.
         
         Args:
-            url: URL to fetch
+            url: URL to fetch, raw or already parsed
             source_config: Source configuration
             company_name: Company name for cache key (optional, for deduplication)
-            company_id: Company ID for health service (optional)
-            health_service: SourceHealthService instance (optional)
             source_type: Source type for health service (optional)
+            health_results: Buffer for health service results (optional)
             
         Returns:
             Tuple of (html, final_url, status_code)
         """
         # Нормализуем URL для дедупликации
-        normalized_url = self._normalize_url(url)
+        target = url if isinstance(url, _ParsedUrl) else _ParsedUrl.from_str(url)
+        url = target.raw
+        normalized_url = target.normalized
         
         # Проверяем кэш перед запросом (если указано имя компании)
-        if company_name:
-            cache_key = (normalized_url, company_name)
-            if cache_key in self._request_cache:
-                cached_html, cached_final_url, cached_time = self._request_cache[cache_key]
-                logger.debug(
-                    f"Using cached response for {url} (normalized: {normalized_url}, "
-                    f"cached at {cached_time})"
-                )
-                # Записываем метрику дубликата
-                try:
-                    from app.instrumentation.celery_metrics import _metrics
-                    _metrics.record_duplicate_request(source_type or "unknown")
-                except Exception:
-                    pass
-                # Возвращаем статус 200 для кэшированного ответа
-                return cached_html, cached_final_url, 200
-        
+        cached = self._cached_fetch_result(url, normalized_url, company_name, source_type)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(normalized_url)
+        if inflight is not None:
+            # Этот URL уже загружается в этом процессе — дожидаемся и берём ответ из кэша
+            await inflight.wait()
+            cached = self._cached_fetch_result(url, normalized_url, company_name, source_type)
+            return cached if cached is not None else (None, url, 0)
+
         attempts = max(1, source_config.retry.attempts + 1)
+        backoff_delays = source_config.retry.backoff_delays
         timeout = source_config.timeout or settings.SCRAPER_TIMEOUT
         
+        done = self._inflight[normalized_url] = asyncio.Event()
         # Попытка получить межпроцессную блокировку
         lock_acquired = await self._fetch_lock.acquire(normalized_url, timeout)
         if not lock_acquired:
@@ -685,12 +949,12 @@ class UniversalBlogScraper:
                 f"Lock not acquired for {url} (normalized: {normalized_url}), "
                 f"another worker is already fetching it"
             )
+            self._finish_inflight(normalized_url, done)
             return None, url, 0  # Статус 0 означает, что запрос не был выполнен
         
         try:
             proxy = settings.SCRAPER_PROXY_URL if source_config.use_proxy and settings.SCRAPER_PROXY_URL else None
-            parsed = urlparse(url)
-            host_key = parsed.netloc or url
+            host_key = target.host
 
             for attempt in range(attempts):
                 try:
@@ -700,29 +964,39 @@ class UniversalBlogScraper:
                         period=source_config.rate_limit.interval,
                     )
                     client = self.proxy_session if proxy else self.session
-                    response = await client.get(url, timeout=timeout)
-                    if self._requires_headless(response):
-                        raise NeedsHeadless(f"Blocked by edge protection ({response.status_code})")
-                    response.raise_for_status()
+                    async with self._concurrency, client.stream("GET", url, timeout=timeout) as response:
+                        if response.status_code in (403, 503):
+                            raise NeedsHeadless(f"Blocked by edge protection ({response.status_code})")
+                        response.raise_for_status()
+
+                        final_url = str(response.url)
+                        status_code = response.status_code
+                        if not self._is_html_response(response):
+                            logger.debug(
+                                f"Skipping {url}: non-HTML content type "
+                                f"{response.headers.get('content-type')!r}"
+                            )
+                            return None, final_url, status_code
+
+                        html = await self._read_html(response)
+                        if html is None:
+                            logger.debug(
+                                f"Skipping {url}: response exceeds {settings.SCRAPER_MAX_RESPONSE_BYTES} bytes"
+                            )
+                            return None, final_url, status_code
+
+                    if self._requires_headless(status_code, html):
+                        raise NeedsHeadless(f"Blocked by edge protection ({status_code})")
 
                     if source_config.min_delay:
                         await asyncio.sleep(source_config.min_delay)
-
-                    html = response.text
-                    final_url = str(response.url)
-                    status_code = response.status_code
                     
                     # Записываем метрику запроса
-                    try:
-                        from app.instrumentation.celery_metrics import _metrics
-                        _metrics.record_scraper_request(str(status_code), source_type or "unknown")
-                    except Exception:
-                        pass
+                    _record_scraper_request(str(status_code), source_type)
                     
                     # Сохраняем результат в кэш (если указано имя компании)
                     if company_name:
-                        cache_key = (normalized_url, company_name)
-                        self._request_cache[cache_key] = (html, final_url, time.time())
+                        self._cache_response((normalized_url, company_name), html, final_url)
                         logger.debug(
                             f"Cached response for {url} (normalized: {normalized_url})"
                         )
@@ -739,63 +1013,67 @@ class UniversalBlogScraper:
                     status = exc.response.status_code
                     logger.debug(f"Attempt {attempt + 1} failed for {url}: {exc}")
                     # Записываем метрику запроса (даже для ошибок)
-                    try:
-                        from app.instrumentation.celery_metrics import _metrics
-                        _metrics.record_scraper_request(str(status), source_type or "unknown")
-                    except Exception:
-                        pass
+                    _record_scraper_request(str(status), source_type)
                     if status in (404, 410):
                         logger.debug(f"Received {status} for {url}; not retrying further")
                         # Записываем результат в health_service перед выходом
-                        if company_id and health_service:
-                            await self._record_health_result(
-                                company_id, url, False, status, 0, health_service, source_type
+                        if health_results is not None:
+                            health_results.append(
+                                self._health_result(url, False, status, 0, source_type)
                             )
                         break
                     if attempt + 1 < attempts:
-                        backoff = (source_config.retry.backoff_factor) ** attempt
-                        await asyncio.sleep(min(10, backoff))
+                        await asyncio.sleep(backoff_delays[attempt])
                     else:
                         logger.warning(f"Gave up fetching {url} after {attempts} attempts")
                         break
                 except (httpx.TimeoutException, httpx.HTTPError) as exc:
                     logger.debug(f"Attempt {attempt + 1} failed for {url}: {exc}")
                     # Записываем метрику timeout/error
-                    try:
-                        from app.instrumentation.celery_metrics import _metrics
-                        error_type = "timeout" if isinstance(exc, httpx.TimeoutException) else "error"
-                        _metrics.record_scraper_request(error_type, source_type or "unknown")
-                    except Exception:
-                        pass
+                    error_type = "timeout" if isinstance(exc, httpx.TimeoutException) else "error"
+                    _record_scraper_request(error_type, source_type)
                     if attempt + 1 < attempts:
-                        backoff = (source_config.retry.backoff_factor) ** attempt
-                        await asyncio.sleep(min(10, backoff))
+                        await asyncio.sleep(backoff_delays[attempt])
                     else:
                         logger.warning(f"Gave up fetching {url} after {attempts} attempts")
                         break
 
             # Записываем метрику для финальной ошибки
-            try:
-                from app.instrumentation.celery_metrics import _metrics
-                _metrics.record_scraper_request("failed", source_type or "unknown")
-            except Exception:
-                pass
+            _record_scraper_request("failed", source_type)
             return None, url, 404  # Предполагаем 404, если не удалось получить HTML
         finally:
             # Всегда освобождаем блокировку
+            self._finish_inflight(normalized_url, done)
             await self._fetch_lock.release(normalized_url)
 
+    @staticmethod
+    async def _run_parser(func: Any, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_parse_executor(), functools.partial(func, *args))
+
+    def _parse_and_extract(
+        self,
+        html: str,
+        base_url: str,
+        selectors: Union[soupsieve.SoupSieve, Iterable[str]],
+    ) -> List[Dict[str, str]]:
+        """Parse HTML and extract articles; CPU-bound, so callers run it in a worker thread."""
+        soup = BeautifulSoup(html, _HTML_PARSER)
+        return self._extract_articles(soup, base_url, selectors)
+
     def _extract_articles(
         self,
         soup: BeautifulSoup,
         base_url: str,
-        selectors: Iterable[str],
+        selectors: Union[soupsieve.SoupSieve, Iterable[str]],
     ) -> List[Dict[str, str]]:
-        articles: "OrderedDict[str, str]" = OrderedDict()
+        articles: Dict[str, str] = {}
+        base_split = urlsplit(base_url)
+        base_netloc = base_split.netloc.lower()
 
-        for selector in selectors:
+        for matcher in self._resolve_matchers(selectors):
             try:
-                elements = soup.select(selector)
+                elements = matcher.select(soup)
             except Exception:
                 continue
 
@@ -812,8 +1090,8 @@ class UniversalBlogScraper:
                     if not title or len(title) < 6:
                         continue
 
-                full_url = urljoin(base_url, href)
-                if not self._looks_like_article(full_url, base_url):
+                full_url = _fast_join(base_split, base_url, href)
+                if not self._looks_like_article(full_url, base_netloc):
                     continue
 
                 if full_url not in articles:
@@ -827,48 +1105,54 @@ class UniversalBlogScraper:
 
         return [{"url": url_value, "title": title_value} for url_value, title_value in articles.items()]
 
+    @staticmethod
+    def _resolve_matchers(
+        selectors: Union[soupsieve.SoupSieve, Iterable[str]],
+    ) -> List[soupsieve.SoupSieve]:
+        if isinstance(selectors, soupsieve.SoupSieve):
+            return [selectors]
+
+        selector_tuple = tuple(selectors)
+        combined = _compile_selector_group(selector_tuple)
+        if combined is not None:
+            return [combined]
+
+        # Хотя бы один селектор невалиден — матчим оставшиеся по отдельности
+        return [matcher for matcher in map(_compile_selector, selector_tuple) if matcher is not None]
+
     def _extract_from_nextjs_scripts(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
         found: Dict[str, str] = {}
+        base_split = urlsplit(base_url)
+        base_netloc = base_split.netloc.lower()
 
-        scripts = soup.find_all("script")
-        for script in scripts:
+        for script in soup.find_all("script", string=True):
             script_text = script.string
-            if not script_text:
+            # _HREF_RE ищет только /blog/ и /blogs/ — скрипты без этой подстроки пропускаем без regex
+            if not script_text or "/blog" not in script_text:
                 continue
 
-            href_pattern = r'(?:\\?["\'])href(?:\\?["\']):\s*(?:\\?["\'])(/blogs?/[^\\"\'\s]+)(?:\\?["\'])'
-            for href_match in re.finditer(href_pattern, script_text):
+            for href_match in _HREF_RE.finditer(script_text):
                 href = href_match.group(1)
-                full_url = urljoin(base_url, href)
-                if not self._looks_like_article(full_url, base_url):
+                full_url = _fast_join(base_split, base_url, href)
+                if not self._looks_like_article(full_url, base_netloc):
                     continue
 
                 title = self._find_title_near_match(script_text, href_match)
                 if title:
                     found.setdefault(full_url, title)
+                    if len(found) >= self.MAX_NEXTJS_ARTICLES:
+                        return list(found.items())
 
         return list(found.items())
 
     def _find_title_near_match(self, script_text: str, match: re.Match) -> Optional[str]:
         start_pos = max(0, match.start() - 500)
         end_pos = min(len(script_text), match.end() + 2000)
-        context = script_text[start_pos:end_pos]
 
-        title_patterns = [
-            r'"title":"((?:\\u[0-9a-fA-F]{4}|[^"\\]){6,})"',
-            r'"children":"((?:\\u[0-9a-fA-F]{4}|[^"\\]){6,})"',
-        ]
-
-        for pattern in title_patterns:
-            title_match = re.search(pattern, context, re.IGNORECASE)
-            if not title_match:
-                continue
+        # Ищем в окне вокруг href без копирования подстроки
+        for title_match in _TITLE_RE.finditer(script_text, start_pos, end_pos):
             candidate = title_match.group(1)
-            candidate = candidate.replace("\\n", " ").replace("\\t", " ").strip()
-            try:
-                candidate = bytes(candidate, "utf-8").decode("unicode_escape")
-            except Exception:
-                pass
+            candidate = _unescape_json_u(candidate.replace("\\n", " ").replace("\\t", " ").strip())
             if len(candidate) >= 6:
                 return candidate[:500]
 
@@ -884,75 +1168,85 @@ class UniversalBlogScraper:
         url: str,
         html: str,
     ) -> Optional[str]:
+        """Write a content-addressed HTML snapshot; blocking, so async callers run it in a thread."""
         if not settings.SCRAPER_SNAPSHOTS_ENABLED:
             return None
 
         snapshot_dir = Path(settings.SCRAPER_SNAPSHOT_DIR)
         slug = self._slugify(company_name)
-        digest_input = f"{url}|{html}".encode("utf-8")
-        digest = hashlib.sha256(digest_input).hexdigest()
+        # Хешируем части по отдельности, не склеивая url и html в одну большую строку
+        html_bytes = html.encode("utf-8")
+        hasher = hashlib.sha256(url.encode("utf-8"))
+        hasher.update(b"|")
+        hasher.update(html_bytes)
+        digest = hasher.hexdigest()
+        seen_key = (slug, source_id, digest)
+        with self._snapshot_lock:
+            seen_path = self._snapshot_seen.get(seen_key)
+            if seen_path is not None:
+                # Этот снапшот уже записан в текущей сессии — обходимся без stat
+                self._snapshot_seen.move_to_end(seen_key)
+                return seen_path
+
         path = snapshot_dir / slug / f"{source_id}_{digest}.html"
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
             if not path.exists():
-                path.write_text(html, encoding="utf-8")
-            return str(path.resolve())
+                path.write_bytes(html_bytes)
+            resolved = str(path.resolve())
+            with self._snapshot_lock:
+                self._snapshot_seen[seen_key] = resolved
+                if len(self._snapshot_seen) > self.SNAPSHOT_SEEN_MAX_ENTRIES:
+                    self._snapshot_seen.popitem(last=False)
+            return resolved
         except Exception as exc:
             logger.warning(f"Failed to persist snapshot for {url}: {exc}")
             return None
 
     def _infer_category(self, title: str) -> Optional[str]:
-        lower = title.lower()
-        mapping = [
-            (("price", "pricing", "plan", "billing"), NewsCategory.PRICING_CHANGE.value),
-            (("funding", "seed", "series a", "series b", "investment"), NewsCategory.FUNDING_NEWS.value),
-            (("release", "launched", "launch", "introducing"), NewsCategory.PRODUCT_UPDATE.value),
-            (("security", "vulnerability", "patch", "cve"), NewsCategory.SECURITY_UPDATE.value),
-            (("api", "sdk"), NewsCategory.API_UPDATE.value),
-            (("integration", "integrates with"), NewsCategory.INTEGRATION.value),
-            (("deprecated", "deprecation", "sunset"), NewsCategory.FEATURE_DEPRECATION.value),
-            (("acquires", "acquisition", "merger"), NewsCategory.ACQUISITION.value),
-            (("partner", "partnership"), NewsCategory.PARTNERSHIP.value),
-            (("model", "gpt", "llama"), NewsCategory.MODEL_RELEASE.value),
-            (("performance", "faster", "improvement"), NewsCategory.PERFORMANCE_IMPROVEMENT.value),
-            (("paper", "arxiv", "research"), NewsCategory.RESEARCH_PAPER.value),
-            (("webinar", "event", "conference", "meetup"), NewsCategory.COMMUNITY_EVENT.value),
-            (("strategy", "vision", "roadmap"), NewsCategory.STRATEGIC_ANNOUNCEMENT.value),
-            (("technical", "architecture", "infra", "infrastructure"), NewsCategory.TECHNICAL_UPDATE.value),
-        ]
-        for keywords, category in mapping:
-            if any(keyword in lower for keyword in keywords):
-                return category
-        return None
-
-    def _looks_like_article(self, full_url: str, base_url: str) -> bool:
-        if any(ext in full_url.lower() for ext in [".jpg", ".jpeg", ".png", ".gif", ".pdf", ".zip", ".mp4", ".mp3", ".svg"]):
+        # Побеждает категория, стоящая раньше в _CATEGORY_KEYWORDS, а не первое совпадение в заголовке
+        best = min(
+            (_CATEGORY_BY_KEYWORD[match.group(1)] for match in _CATEGORY_RE.finditer(title.lower())),
+            default=None,
+        )
+        return best[1] if best else None
+
+    def _looks_like_article(self, full_url: str, base_netloc: str) -> bool:
+        """Check a candidate link; base_netloc is the lowercased host of the page, parsed once by the caller."""
+        parsed = urlparse(full_url)
+        # Сначала дешёвая проверка домена: большинство ссылок в меню и футере ведут наружу
+        link_netloc = parsed.netloc.lower()
+        if link_netloc and base_netloc not in link_netloc:
             return False
-        base_domain = urlparse(base_url).netloc
-        link_domain = urlparse(full_url).netloc
-        if link_domain and base_domain not in link_domain:
+        if os.path.splitext(parsed.path)[1].lower() in _NON_ARTICLE_EXTENSIONS:
             return False
-        article_patterns = (
-            "/blog/",
-            "/blogs/",
-            "/news/",
-            "/post/",
-            "/posts/",
-            "/article/",
-            "/articles/",
-            "/update/",
-            "/updates/",
-            "/insight/",
-            "/insights/",
-            "/press/",
-            "/press-release/",
-        )
-        return any(pattern in full_url.lower() for pattern in article_patterns)
+        return bool(_ARTICLE_PATH_RE.search(full_url))
+
+    @staticmethod
+    def _is_html_response(response: httpx.Response) -> bool:
+        content_type = response.headers.get("content-type", "").lower()
+        # Servers that omit the header are given the benefit of the doubt.
+        return not content_type or content_type.startswith(("text/html", "application/xhtml"))
 
-    def _requires_headless(self, response: httpx.Response) -> bool:
-        if response.status_code in (403, 503):
+    @staticmethod
+    async def _read_html(response: httpx.Response) -> Optional[str]:
+        """Read a streamed body, returning None once it grows past the size cap."""
+        max_bytes = settings.SCRAPER_MAX_RESPONSE_BYTES
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            return None
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                return None
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+    def _requires_headless(self, status_code: int, html: str) -> bool:
+        if status_code in (403, 503):
             return True
-        text = response.text[:2000]
+        text = html[:2000]
         if "Just a moment..." in text or "cf-browser-verification" in text.lower():
             return True
         return False
@@ -962,10 +1256,10 @@ class UniversalBlogScraper:
 
     @staticmethod
     def _slugify(value: str) -> str:
-        return re.sub(r"[^a-zA-Z0-9\-]+", "-", value.lower()).strip("-")
+        return _SLUG_RE.sub("-", value.lower()).strip("-")
 
     async def _discover_candidate_sources(self, website: str, limit: int = 8) -> List[str]:
-        parsed = urlparse(website)
+        parsed = _cached_urlparse(website)
         if not parsed.scheme or not parsed.netloc:
             return []
         try:
@@ -975,7 +1269,12 @@ class UniversalBlogScraper:
             logger.debug(f"Could not auto-discover sources for %s: {exc}", website)
             return []
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        return await self._run_parser(self._extract_candidate_sources, response.text, website, limit)
+
+    def _extract_candidate_sources(self, html: str, website: str, limit: int) -> List[str]:
+        # Для discovery нужны только ссылки — не строим остальное дерево
+        soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_ANCHOR_STRAINER)
+        website_split = urlsplit(website)
         candidates: List[str] = []
         seen: Set[str] = set()
 
@@ -989,8 +1288,8 @@ class UniversalBlogScraper:
             if not any(keyword in anchor_text or keyword in href_lower for keyword in DISCOVERY_KEYWORDS):
                 continue
 
-            full_url = urljoin(website, href)
-            full_parsed = urlparse(full_url)
+            full_url = _fast_join(website_split, website, href)
+            full_parsed = _cached_urlparse(full_url)
             if full_parsed.scheme not in ("http", "https"):
                 continue
             if not self._is_same_domain(website, full_url):
@@ -1010,8 +1309,8 @@ class UniversalBlogScraper:
 
     @staticmethod
     def _is_same_domain(base_url: str, target_url: str) -> bool:
-        base_netloc = urlparse(base_url).netloc
-        target_netloc = urlparse(target_url).netloc
+        base_netloc = _cached_urlparse(base_url).netloc
+        target_netloc = _cached_urlparse(target_url).netloc
 
         if not base_netloc or not target_netloc:
             return False
@@ -4,19 +4,23 @@ Service helpers for building multi-subject analytics comparisons and export payl
 
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from enum import Enum
+import heapq
 import json
-import statistics
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
 
+from app.core.config import settings
 from app.models import (
     AnalyticsGraphEdge,
     AnalyticsPeriod,
@@ -50,7 +54,82 @@ from app.schemas.analytics import (
 from app.schemas.competitor_events import CompetitorChangeEventSchema
 from app.services.analytics_service import AnalyticsService
 from app.services.competitor_change_service import CompetitorChangeService
-from app.services.competitor_service import CompetitorAnalysisService
+from app.services.competitor_service import CompanyMetrics, CompetitorAnalysisService
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _json_loads = json.loads
+else:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the existing handlers still apply
+    _json_loads = orjson.loads
+
+_PRESET_LIST_ADAPTER = TypeAdapter(List[ReportPresetResponse])
+_CHANGE_EVENT_LIST_ADAPTER = TypeAdapter(List[CompetitorChangeEventSchema])
+
+_PRESET_COLUMNS = (
+    UserReportPreset.id,
+    UserReportPreset.user_id,
+    UserReportPreset.name,
+    UserReportPreset.description,
+    UserReportPreset.companies,
+    UserReportPreset.filters,
+    UserReportPreset.visualization_config,
+    UserReportPreset.is_favorite,
+    UserReportPreset.created_at,
+    UserReportPreset.updated_at,
+)
+
+_E = TypeVar("_E", bound=Enum)
+
+
+def _news_priority(item: Dict[str, Any]) -> Any:
+    return item.get("priority_score", 0)
+
+
+def _coerce_enum(enum_cls: Type[_E], value: Any) -> _E:
+    """Map a filter value onto ``enum_cls`` via its value lookup table, avoiding ``EnumMeta.__call__``."""
+    if isinstance(value, enum_cls):
+        return value
+    member = enum_cls._value2member_map_.get(value)
+    return member if member is not None else enum_cls(value)
+
+
+def _as_uuid(value: Any) -> UUID:
+    """Return ``value`` as a UUID, parsing only when it is not one already."""
+    if isinstance(value, UUID):
+        return value
+    return UUID(value if isinstance(value, str) else str(value))
+
+
+class _SnapshotTotals(NamedTuple):
+    """Figures read once from a company's latest snapshot and shared by every subject containing it."""
+
+    news_total: int
+    news_positive: int
+    news_negative: int
+    news_neutral: int
+    pricing_changes: int
+    feature_updates: int
+    funding_events: int
+    innovation_velocity: Optional[float]
+    impact_score: Optional[float]
+    trend_delta: Optional[float]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CompanyAnalyticsSnapshot) -> "_SnapshotTotals":
+        return cls(
+            snapshot.news_total,
+            snapshot.news_positive or 0,
+            snapshot.news_negative or 0,
+            snapshot.news_neutral or 0,
+            snapshot.pricing_changes,
+            snapshot.feature_updates,
+            snapshot.funding_events,
+            snapshot.innovation_velocity,
+            snapshot.impact_score,
+            snapshot.trend_delta,
+        )
 
 
 @dataclass
@@ -88,7 +167,8 @@ class AnalyticsComparisonService:
         if not payload.subjects:
             raise ValueError("At least one comparison subject must be provided")
 
-        window_start, window_end = self._resolve_window(payload)
+        now = datetime.now(timezone.utc)
+        window_start, window_end = self._resolve_window(payload, now=now)
         resolved_subjects = await self._resolve_subjects(payload, user=user)
 
         if not resolved_subjects:
@@ -98,28 +178,57 @@ class AnalyticsComparisonService:
         company_details_map = await self._load_company_map(unique_company_ids)
 
         # Load snapshots per company for impact series and breakdowns
-        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]] = {}
-        for company_id in unique_company_ids:
-            snapshots = await self.analytics_service.get_snapshots(
-                company_id,
+        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]] = (
+            await self.analytics_service.get_snapshots_bulk(
+                unique_company_ids,
                 payload.period,
                 payload.lookback,
             )
-            company_snapshots[company_id] = snapshots
+        )
+
+        change_log_map: Dict[str, List[CompetitorChangeEventSchema]] = {}
+        knowledge_graph_map: Dict[str, List[KnowledgeGraphEdgeResponse]] = {}
+        if payload.include_change_log:
+            change_events_by_company = await self._load_change_events(
+                unique_company_ids,
+                limit=payload.change_log_limit,
+            )
+            change_log_map = {
+                subject.subject_key: self._merge_change_events(
+                    subject.company_ids,
+                    change_events_by_company,
+                    limit=payload.change_log_limit,
+                )
+                for subject in resolved_subjects
+            }
+        if payload.include_knowledge_graph:
+            edges_by_company = await self._load_graph_edges(
+                unique_company_ids,
+                limit=payload.knowledge_graph_limit,
+            )
+            knowledge_graph_map = {
+                subject.subject_key: self._merge_graph_edges(
+                    subject.company_ids,
+                    edges_by_company,
+                    limit=payload.knowledge_graph_limit,
+                )
+                for subject in resolved_subjects
+            }
 
         subject_summaries: List[ComparisonSubjectSummary] = []
         metric_summaries: List[ComparisonMetricSummary] = []
         series_collection: List[ComparisonSeries] = []
-        change_log_map: Dict[str, List[CompetitorChangeEventSchema]] = {}
-        knowledge_graph_map: Dict[str, List[KnowledgeGraphEdgeResponse]] = {}
 
-        for subject in resolved_subjects:
-            subject_company_metrics = await self._load_metrics_for_subject(
-                subject,
-                window_start=window_start,
-                window_end=window_end,
-                top_news_limit=payload.top_news_limit,
-            )
+        metrics_by_subject = await self._load_metrics_for_subjects(
+            resolved_subjects,
+            window_start=window_start,
+            window_end=window_end,
+            top_news_limit=payload.top_news_limit,
+        )
+
+        # Companies shared by several subjects have their latest snapshot read only once
+        latest_totals_cache: Dict[UUID, _SnapshotTotals] = {}
+        for subject, subject_company_metrics in zip(resolved_subjects, metrics_by_subject):
             subject_companies = [
                 company_details_map[company_id]
                 for company_id in subject.company_ids
@@ -128,10 +237,16 @@ class AnalyticsComparisonService:
             subject_summary = self._build_subject_summary(subject, subject_companies)
             subject_summaries.append(subject_summary)
 
+            subject_snapshots, latest_snapshots, latest_totals = self._collect_subject_snapshots(
+                subject,
+                company_snapshots,
+                totals_cache=latest_totals_cache,
+            )
             metrics_summary, latest_snapshot = self._aggregate_metrics_for_subject(
                 subject,
                 company_metrics=subject_company_metrics,
-                company_snapshots=company_snapshots,
+                latest_snapshots=latest_snapshots,
+                latest_totals=latest_totals,
                 top_news_limit=payload.top_news_limit,
                 include_components=payload.include_components,
             )
@@ -139,34 +254,21 @@ class AnalyticsComparisonService:
 
             if payload.include_series:
                 series_points = self._build_series_for_subject(
-                    subject,
-                    company_snapshots=company_snapshots,
+                    subject_snapshots,
                     latest_snapshot=latest_snapshot,
                 )
                 series_collection.append(
-                    ComparisonSeries(
+                    ComparisonSeries.model_construct(
                         subject_key=subject.subject_key,
                         subject_id=subject.reference_id,
                         snapshots=series_points,
                     )
                 )
 
-            if payload.include_change_log:
-                change_events = await self._load_change_events(
-                    subject.company_ids,
-                    limit=payload.change_log_limit,
-                )
-                change_log_map[subject.subject_key] = change_events
-
-            if payload.include_knowledge_graph:
-                edges = await self._load_graph_edges(
-                    subject.company_ids,
-                    limit=payload.knowledge_graph_limit,
-                )
-                knowledge_graph_map[subject.subject_key] = edges
-
-        return ComparisonResponse(
-            generated_at=datetime.now(timezone.utc),
+        # Built from values computed above, so pydantic validation is skipped here and in
+        # the summary/series helpers; DB-ingested rows are still validated
+        return ComparisonResponse.model_construct(
+            generated_at=now,
             period=payload.period,
             lookback=payload.lookback,
             date_from=window_start,
@@ -187,22 +289,17 @@ class AnalyticsComparisonService:
         """Build full export payload containing comparison data and user context."""
         comparison_response = await self.build_comparison(payload, user=user)
 
-        notification_summary: Optional[NotificationSettingsSummary] = None
-        if payload.include.include_notifications:
-            notification_summary = await self._load_notification_settings(user.id)
-
-        preset_rows: List[Dict[str, Any]] = []
-        if payload.include.include_presets:
-            preset_rows = await self._load_user_presets(user.id)
-            logger.debug("Export presets fetched", preset_count=len(preset_rows))
-            if preset_rows:
-                logger.debug("First preset payload", preset_example=preset_rows[0])
-        else:
+        if not payload.include.include_presets:
             logger.debug("Preset inclusion disabled on payload")
+        notification_summary, preset_rows = await self._load_export_context(
+            user.id,
+            include_notifications=payload.include.include_notifications,
+            include_presets=payload.include.include_presets,
+        )
 
         return AnalyticsExportResponse(
             version="2.0.0",
-            generated_at=datetime.now(timezone.utc),
+            generated_at=comparison_response.generated_at,
             export_format=payload.export_format,
             timeframe={
                 "period": comparison_response.period,
@@ -212,19 +309,20 @@ class AnalyticsComparisonService:
             },
             comparison=comparison_response,
             notification_settings=notification_summary,
-            presets=[
-                ReportPresetResponse.model_validate(preset_row)
-                for preset_row in preset_rows
-            ],
+            presets=_PRESET_LIST_ADAPTER.validate_python(preset_rows),
         )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _resolve_window(self, payload: ComparisonRequest) -> Tuple[datetime, datetime]:
-        """Determine the analysis window."""
-        now = datetime.now(timezone.utc)
+    def _resolve_window(
+        self,
+        payload: ComparisonRequest,
+        *,
+        now: datetime,
+    ) -> Tuple[datetime, datetime]:
+        """Determine the analysis window relative to the request timestamp."""
         date_to = payload.date_to or now
         if date_to.tzinfo is None:
             date_to = date_to.replace(tzinfo=timezone.utc)
@@ -259,12 +357,16 @@ class AnalyticsComparisonService:
 
         # Prepare base filters (applied to every subject)
         base_filters = self._normalize_filters(payload.filters)
+        base_display_filters = self._serialize_filters(base_filters)
+        # Merged filters per preset, reused when several subjects reference the same preset
+        preset_filters_cache: Dict[UUID, Tuple[Optional[Dict[str, Any]], ComparisonFilters]] = {}
+        preset_company_cache: Dict[UUID, List[UUID]] = {}
 
         for subject in payload.subjects:
             if subject.subject_type == "company":
                 company_id = subject.reference_id
                 filters_for_fetch = base_filters
-                display_filters = self._serialize_filters(filters_for_fetch)
+                display_filters = base_display_filters
                 subject_key = f"company:{company_id}"
                 resolved.append(
                     _ResolvedSubject(
@@ -288,17 +390,21 @@ class AnalyticsComparisonService:
                     logger.warning("Preset %s not found for user %s", subject.reference_id, user.id)
                     continue
 
-                preset_company_ids = [
-                    UUID(str(company_id))
-                    for company_id in (preset.companies or [])
-                ]
+                preset_company_ids = preset_company_cache.get(preset.id)
+                if preset_company_ids is None:
+                    preset_company_ids = [_as_uuid(company_id) for company_id in (preset.companies or [])]
+                    preset_company_cache[preset.id] = preset_company_ids
                 if not preset_company_ids:
                     logger.debug("Preset %s has no companies; skipping", preset.id)
                     continue
 
-                preset_filters = self._normalize_filters_from_preset(preset)
-                merged_filters = self._merge_filters(base_filters, preset_filters)
-                display_filters = self._serialize_filters(merged_filters)
+                cached_filters = preset_filters_cache.get(preset.id)
+                if cached_filters is None:
+                    preset_filters = self._normalize_filters_from_preset(preset)
+                    merged_filters = self._merge_filters(base_filters, preset_filters)
+                    cached_filters = (merged_filters, self._serialize_filters(merged_filters))
+                    preset_filters_cache[preset.id] = cached_filters
+                merged_filters, display_filters = cached_filters
                 subject_key = f"preset:{preset.id}"
 
                 resolved.append(
@@ -322,28 +428,31 @@ class AnalyticsComparisonService:
         return resolved
 
     def _collect_company_ids(self, subjects: Iterable[_ResolvedSubject]) -> List[UUID]:
-        company_ids: List[UUID] = []
-        seen: set[UUID] = set()
-        for subject in subjects:
-            for company_id in subject.company_ids:
-                if company_id not in seen:
-                    company_ids.append(company_id)
-                    seen.add(company_id)
-        return company_ids
+        return list(
+            dict.fromkeys(company_id for subject in subjects for company_id in subject.company_ids)
+        )
 
     async def _load_company_map(self, company_ids: Sequence[UUID]) -> Dict[UUID, Company]:
         if not company_ids:
             return {}
 
+        # Only scalar columns are read for subject summaries; edges are loaded separately
         stmt = (
             select(Company)
             .where(Company.id.in_(company_ids))
-            .options(selectinload(Company.analytics_graph_edges))
+            .options(*self._strict_loading())
         )
         result = await self.db.execute(stmt)
         companies = list(result.scalars().all())
         return {company.id: company for company in companies}
 
+    @staticmethod
+    def _strict_loading() -> Tuple[Any, ...]:
+        """Loader options that turn stray relationship lazy loads into errors when enabled."""
+        if settings.ANALYTICS_RAISE_ON_LAZY_LOAD:
+            return (raiseload("*"),)
+        return ()
+
     def _build_subject_summary(
         self,
         subject: _ResolvedSubject,
@@ -363,7 +472,7 @@ class AnalyticsComparisonService:
         if not label and companies:
             label = ", ".join(company.name for company in companies)
 
-        return ComparisonSubjectSummary(
+        return ComparisonSubjectSummary.model_construct(
             subject_key=subject.subject_key,
             subject_id=subject.reference_id,
             subject_type=subject.subject_type,
@@ -375,31 +484,53 @@ class AnalyticsComparisonService:
             filters=subject.filters_display,
         )
 
-    async def _load_metrics_for_subject(
+    async def _load_metrics_for_subjects(
         self,
-        subject: _ResolvedSubject,
+        subjects: Sequence[_ResolvedSubject],
         *,
         window_start: datetime,
         window_end: datetime,
         top_news_limit: int,
-    ) -> Dict[UUID, Dict[str, Any]]:
-        metrics: Dict[UUID, Dict[str, Any]] = {}
-        for company_id in subject.company_ids:
-            metrics[company_id] = await self.competitor_service.build_company_metrics(
-                company_id,
+    ) -> List[Dict[UUID, CompanyMetrics]]:
+        """
+        Load company metrics for every subject with one bulk query set per filter set.
+
+        Subjects sharing a company with identical filters reuse a single computation.
+        """
+        filters_by_key: Dict[str, Optional[Dict[str, Any]]] = {}
+        company_ids_by_key: Dict[str, Dict[UUID, None]] = {}
+        subject_keys: List[List[Tuple[UUID, str]]] = []
+        for subject in subjects:
+            filters_key = json.dumps(subject.filters_for_fetch, sort_keys=True, default=str)
+            filters_by_key.setdefault(filters_key, subject.filters_for_fetch)
+            company_ids_by_key.setdefault(filters_key, {}).update(
+                dict.fromkeys(subject.company_ids)
+            )
+            subject_keys.append([(company_id, filters_key) for company_id in subject.company_ids])
+
+        loaded: Dict[Tuple[UUID, str], CompanyMetrics] = {}
+        for filters_key, company_ids in company_ids_by_key.items():
+            metrics = await self.competitor_service.build_companies_metrics(
+                list(company_ids),
                 window_start,
                 window_end,
-                filters=subject.filters_for_fetch,
+                filters=filters_by_key[filters_key],
                 top_news_limit=top_news_limit,
             )
-        return metrics
+            loaded.update(
+                ((company_id, filters_key), company_metrics)
+                for company_id, company_metrics in metrics.items()
+            )
+
+        return [{key[0]: loaded[key] for key in keys} for keys in subject_keys]
 
     def _aggregate_metrics_for_subject(
         self,
         subject: _ResolvedSubject,
         *,
-        company_metrics: Dict[UUID, Dict[str, Any]],
-        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]],
+        company_metrics: Dict[UUID, CompanyMetrics],
+        latest_snapshots: Sequence[CompanyAnalyticsSnapshot],
+        latest_totals: Optional[Sequence[_SnapshotTotals]] = None,
         top_news_limit: int,
         include_components: bool,
     ) -> Tuple[ComparisonMetricSummary, Optional[CompanyAnalyticsSnapshotSummary]]:
@@ -410,7 +541,7 @@ class AnalyticsComparisonService:
         ]
 
         if not metrics_list:
-            empty_summary = ComparisonMetricSummary(
+            empty_summary = ComparisonMetricSummary.model_construct(
                 subject_key=subject.subject_key,
                 subject_id=subject.reference_id,
                 news_volume=0,
@@ -429,27 +560,27 @@ class AnalyticsComparisonService:
             )
             return empty_summary, None
 
-        news_volume = sum(metric["news_volume"] for metric in metrics_list)
-        activity_scores = [metric["activity_score"] for metric in metrics_list]
-        avg_priority_values = [metric["avg_priority"] for metric in metrics_list]
+        news_volume = sum(metric.news_volume for metric in metrics_list)
+        activity_scores = [metric.activity_score for metric in metrics_list]
+        avg_priority_values = [metric.avg_priority for metric in metrics_list]
 
         category_distribution = self._merge_counter(
-            (metric["category_distribution"] for metric in metrics_list)
+            (metric.category_distribution for metric in metrics_list)
         )
         topic_distribution = self._merge_counter(
-            (metric["topic_distribution"] for metric in metrics_list)
+            (metric.topic_distribution for metric in metrics_list)
         )
         sentiment_distribution = self._merge_counter(
-            (metric["sentiment_distribution"] for metric in metrics_list)
+            (metric.sentiment_distribution for metric in metrics_list)
         )
         daily_activity = self._merge_counter(
-            (metric["daily_activity"] for metric in metrics_list)
+            (metric.daily_activity for metric in metrics_list)
         )
         top_news = self._aggregate_top_news(metrics_list, limit=top_news_limit)
 
         latest_snapshot_summary = self._aggregate_latest_snapshot(
-            subject,
-            company_snapshots=company_snapshots,
+            latest_snapshots,
+            latest_totals=latest_totals,
             include_components=include_components,
         )
 
@@ -461,7 +592,7 @@ class AnalyticsComparisonService:
 
         components = latest_snapshot_summary.components if (latest_snapshot_summary and include_components) else []
 
-        summary = ComparisonMetricSummary(
+        summary = ComparisonMetricSummary.model_construct(
             subject_key=subject.subject_key,
             subject_id=subject.reference_id,
             news_volume=news_volume,
@@ -481,69 +612,102 @@ class AnalyticsComparisonService:
 
         return summary, latest_snapshot_summary
 
+    @staticmethod
+    def _collect_subject_snapshots(
+        subject: _ResolvedSubject,
+        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]],
+        *,
+        totals_cache: Optional[Dict[UUID, _SnapshotTotals]] = None,
+    ) -> Tuple[List[CompanyAnalyticsSnapshot], List[CompanyAnalyticsSnapshot], List[_SnapshotTotals]]:
+        """
+        Walk the subject's companies once, returning all snapshots, the latest per company
+        and that snapshot's totals (reused from ``totals_cache`` when another subject read them).
+        """
+        if totals_cache is None:
+            totals_cache = {}
+        subject_snapshots: List[CompanyAnalyticsSnapshot] = []
+        latest_snapshots: List[CompanyAnalyticsSnapshot] = []
+        latest_totals: List[_SnapshotTotals] = []
+        for company_id in subject.company_ids:
+            snapshots = company_snapshots.get(company_id)
+            if snapshots:
+                subject_snapshots.extend(snapshots)
+                latest = snapshots[-1]
+                latest_snapshots.append(latest)
+                totals = totals_cache.get(company_id)
+                if totals is None:
+                    totals = totals_cache[company_id] = _SnapshotTotals.from_snapshot(latest)
+                latest_totals.append(totals)
+        return subject_snapshots, latest_snapshots, latest_totals
+
     def _build_series_for_subject(
         self,
-        subject: _ResolvedSubject,
+        subject_snapshots: Sequence[CompanyAnalyticsSnapshot],
         *,
-        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]],
         latest_snapshot: Optional[CompanyAnalyticsSnapshotSummary],
     ) -> List[ComparisonSeriesPoint]:
-        bucket: Dict[datetime, Dict[str, Any]] = defaultdict(lambda: {
-            "impact_scores": [],
-            "innovation_velocities": [],
-            "news_total": 0,
-            "news_positive": 0,
-            "news_negative": 0,
-            "news_neutral": 0,
-            "pricing_changes": 0,
-            "feature_updates": 0,
-            "funding_events": 0,
-        })
-
-        for company_id in subject.company_ids:
-            snapshots = company_snapshots.get(company_id) or []
-            for snapshot in snapshots:
-                entry = bucket[snapshot.period_start]
-                entry["impact_scores"].append(snapshot.impact_score)
-                entry["innovation_velocities"].append(snapshot.innovation_velocity)
-                entry["news_total"] += snapshot.news_total
-                entry["news_positive"] += snapshot.news_positive or 0
-                entry["news_negative"] += snapshot.news_negative or 0
-                entry["news_neutral"] += snapshot.news_neutral
-                entry["pricing_changes"] += snapshot.pricing_changes
-                entry["feature_updates"] += snapshot.feature_updates
-                entry["funding_events"] += snapshot.funding_events
+        periods = sorted({snapshot.period_start for snapshot in subject_snapshots})
+        period_index = {period_start: index for index, period_start in enumerate(periods)}
+
+        # Parallel per-period columns (struct-of-arrays), filled by period index
+        size = len(periods)
+        impact_sum = [0.0] * size
+        impact_count = [0] * size
+        velocity_sum = [0.0] * size
+        velocity_count = [0] * size
+        news_total = [0] * size
+        news_positive = [0] * size
+        news_negative = [0] * size
+        news_neutral = [0] * size
+        pricing_changes = [0] * size
+        feature_updates = [0] * size
+        funding_events = [0] * size
+
+        for snapshot in subject_snapshots:
+            index = period_index[snapshot.period_start]
+            if snapshot.impact_score is not None:
+                impact_sum[index] += snapshot.impact_score
+                impact_count[index] += 1
+            if snapshot.innovation_velocity is not None:
+                velocity_sum[index] += snapshot.innovation_velocity
+                velocity_count[index] += 1
+            news_total[index] += snapshot.news_total
+            news_positive[index] += snapshot.news_positive or 0
+            news_negative[index] += snapshot.news_negative or 0
+            news_neutral[index] += snapshot.news_neutral
+            pricing_changes[index] += snapshot.pricing_changes
+            feature_updates[index] += snapshot.feature_updates
+            funding_events[index] += snapshot.funding_events
 
         series: List[ComparisonSeriesPoint] = []
         previous_score: Optional[float] = None
-        for period_start in sorted(bucket.keys()):
-            entry = bucket[period_start]
-            impact_score = self._safe_mean(entry["impact_scores"])
-            trend_delta = None
-            if previous_score not in (None, 0):
-                trend_delta = round(((impact_score - previous_score) / abs(previous_score)) * 100.0, 2)
+        for index, period_start in enumerate(periods):
+            impact_score = impact_sum[index] / impact_count[index] if impact_count[index] else 0.0
+            trend_delta = self._percent_change(impact_score, previous_score)
             previous_score = impact_score
             series.append(
-                ComparisonSeriesPoint(
+                ComparisonSeriesPoint.model_construct(
                     period_start=period_start,
                     impact_score=impact_score,
-                    innovation_velocity=self._safe_mean(entry["innovation_velocities"]),
+                    innovation_velocity=(
+                        velocity_sum[index] / velocity_count[index] if velocity_count[index] else 0.0
+                    ),
                     trend_delta=trend_delta,
-                    news_total=entry["news_total"],
-                    news_positive=entry["news_positive"],
-                    news_negative=entry["news_negative"],
-                    news_neutral=entry["news_neutral"],
-                    pricing_changes=entry["pricing_changes"],
-                    feature_updates=entry["feature_updates"],
-                    funding_events=entry["funding_events"],
+                    news_total=news_total[index],
+                    news_positive=news_positive[index],
+                    news_negative=news_negative[index],
+                    news_neutral=news_neutral[index],
+                    pricing_changes=pricing_changes[index],
+                    feature_updates=feature_updates[index],
+                    funding_events=funding_events[index],
                 )
             )
 
-        # Recompute trend delta based on series progression if snapshot summary was absent
+        # Fall back to the series progression if snapshot summary was absent; the last
+        # point already carries that delta, so only the missing case needs a default
         if series and (not latest_snapshot or latest_snapshot.trend_delta is None):
-            trend = self._compute_trend(series)
-            if series:
-                series[-1].trend_delta = trend
+            if series[-1].trend_delta is None:
+                series[-1].trend_delta = 0.0
 
         return series
 
@@ -552,16 +716,25 @@ class AnalyticsComparisonService:
         company_ids: Sequence[UUID],
         *,
         limit: int,
+    ) -> Dict[UUID, List[CompetitorChangeEventSchema]]:
+        serialised = await self.change_service.list_change_events_payload_bulk(
+            company_ids, limit=limit
+        )
+        return {
+            company_id: _CHANGE_EVENT_LIST_ADAPTER.validate_python(events)
+            for company_id, events in serialised.items()
+        }
+
+    @staticmethod
+    def _merge_change_events(
+        company_ids: Sequence[UUID],
+        events_by_company: Dict[UUID, List[CompetitorChangeEventSchema]],
+        *,
+        limit: int,
     ) -> List[CompetitorChangeEventSchema]:
         events: List[CompetitorChangeEventSchema] = []
         for company_id in company_ids:
-            serialised = await self.change_service.list_change_events_payload(
-                company_id, limit=limit
-            )
-            events.extend(
-                CompetitorChangeEventSchema.model_validate(event)
-                for event in serialised
-            )
+            events.extend(events_by_company.get(company_id, ()))
 
         events.sort(key=lambda event: event.detected_at, reverse=True)
         return events[:limit]
@@ -571,21 +744,49 @@ class AnalyticsComparisonService:
         company_ids: Sequence[UUID],
         *,
         limit: int,
-    ) -> List[KnowledgeGraphEdgeResponse]:
+    ) -> Dict[UUID, List[AnalyticsGraphEdge]]:
+        edges_by_company: Dict[UUID, List[AnalyticsGraphEdge]] = {
+            company_id: [] for company_id in company_ids
+        }
         if not company_ids:
-            return []
+            return edges_by_company
 
+        ranked = (
+            select(
+                AnalyticsGraphEdge.id.label("edge_id"),
+                func.row_number()
+                .over(
+                    partition_by=AnalyticsGraphEdge.company_id,
+                    order_by=AnalyticsGraphEdge.created_at.desc(),
+                )
+                .label("row_number"),
+            )
+            .where(AnalyticsGraphEdge.company_id.in_(company_ids))
+            .subquery()
+        )
         stmt = (
             select(AnalyticsGraphEdge)
-            .where(
-                AnalyticsGraphEdge.company_id.in_(company_ids),
-                AnalyticsGraphEdge.company_id.isnot(None),
-            )
+            .join(ranked, ranked.c.edge_id == AnalyticsGraphEdge.id)
+            .where(ranked.c.row_number <= limit)
             .order_by(AnalyticsGraphEdge.created_at.desc())
-            .limit(limit)
+            .options(*self._strict_loading())
         )
         result = await self.db.execute(stmt)
-        edges = list(result.scalars().all())
+        for edge in result.scalars().all():
+            edges_by_company[edge.company_id].append(edge)
+        return edges_by_company
+
+    @staticmethod
+    def _merge_graph_edges(
+        company_ids: Sequence[UUID],
+        edges_by_company: Dict[UUID, List[AnalyticsGraphEdge]],
+        *,
+        limit: int,
+    ) -> List[KnowledgeGraphEdgeResponse]:
+        edges: List[AnalyticsGraphEdge] = []
+        for company_id in company_ids:
+            edges.extend(edges_by_company.get(company_id, ()))
+        edges.sort(key=lambda edge: edge.created_at, reverse=True)
 
         return [
             KnowledgeGraphEdgeResponse(
@@ -600,16 +801,56 @@ class AnalyticsComparisonService:
                 weight=edge.weight,
                 metadata=edge.metadata_json or {},
             )
-            for edge in edges
+            for edge in edges[:limit]
         ]
 
+    async def _load_export_context(
+        self,
+        user_id: UUID,
+        *,
+        include_notifications: bool,
+        include_presets: bool,
+    ) -> Tuple[Optional[NotificationSettingsSummary], List[Dict[str, Any]]]:
+        """Load notification settings and presets, with one query when both are requested."""
+        if not include_presets:
+            notification_summary = (
+                await self._load_notification_settings(user_id) if include_notifications else None
+            )
+            return notification_summary, []
+        if not include_notifications:
+            return None, await self._load_user_presets(user_id)
+
+        # Настройки повторяются в каждой строке пресета; без пресетов остаётся одна строка пользователя
+        stmt = (
+            select(UserPreferences, *_PRESET_COLUMNS)
+            .select_from(User)
+            .outerjoin(UserPreferences, UserPreferences.user_id == User.id)
+            .outerjoin(UserReportPreset, UserReportPreset.user_id == User.id)
+            .where(User.id == user_id)
+            .order_by(UserReportPreset.created_at.desc())
+        )
+        result = await self.db.execute(stmt)
+        rows = result.all()
+
+        preferences = rows[0][0] if rows else None
+        notification_summary = (
+            self._build_notification_summary(preferences) if preferences is not None else None
+        )
+        preset_rows = [
+            self._build_preset_row(row._mapping) for row in rows if row.id is not None
+        ]
+        logger.debug("Loaded user presets", user_id=str(user_id), preset_count=len(preset_rows))
+        return notification_summary, preset_rows
+
     async def _load_notification_settings(self, user_id: UUID) -> Optional[NotificationSettingsSummary]:
         stmt = select(UserPreferences).where(UserPreferences.user_id == user_id)
         result = await self.db.execute(stmt)
         preferences = result.scalar_one_or_none()
         if not preferences:
             return None
+        return self._build_notification_summary(preferences)
 
+    def _build_notification_summary(self, preferences: UserPreferences) -> NotificationSettingsSummary:
         return NotificationSettingsSummary(
             notification_frequency=self._enum_value(preferences.notification_frequency),
             digest_enabled=preferences.digest_enabled,
@@ -631,46 +872,30 @@ class AnalyticsComparisonService:
 
     async def _load_user_presets(self, user_id: UUID) -> List[Dict[str, Any]]:
         stmt = (
-            select(
-                UserReportPreset.id,
-                UserReportPreset.user_id,
-                UserReportPreset.name,
-                UserReportPreset.description,
-                UserReportPreset.companies,
-                UserReportPreset.filters,
-                UserReportPreset.visualization_config,
-                UserReportPreset.is_favorite,
-                UserReportPreset.created_at,
-                UserReportPreset.updated_at,
-            )
+            select(*_PRESET_COLUMNS)
             .where(UserReportPreset.user_id == user_id)
             .order_by(UserReportPreset.created_at.desc())
         )
         result = await self.db.execute(stmt)
-        rows = []
-        for mapping in result.mappings():
-            row_dict = dict(mapping)
-            logger.debug("Raw preset mapping: {}", row_dict)
-            companies = [str(company_id) for company_id in self._normalise_array(row_dict.get("companies"))]
-            filters = self._normalise_json(row_dict.get("filters"), default={})
-            visualization = self._normalise_json(row_dict.get("visualization_config"), default={})
-
-            serialised_row: Dict[str, Any] = {
-                "id": str(row_dict["id"]),
-                "user_id": str(row_dict["user_id"]),
-                "name": row_dict["name"],
-                "description": row_dict.get("description"),
-                "companies": companies,
-                "filters": filters,
-                "visualization_config": visualization,
-                "is_favorite": row_dict["is_favorite"],
-                "created_at": row_dict["created_at"].isoformat() if row_dict.get("created_at") else None,
-                "updated_at": row_dict["updated_at"].isoformat() if row_dict.get("updated_at") else None,
-            }
-            logger.debug("Serialised preset row: {}", serialised_row)
-            rows.append(serialised_row)
+        rows = [self._build_preset_row(row) for row in result.mappings()]
+        logger.debug("Loaded user presets", user_id=str(user_id), preset_count=len(rows))
         return rows
 
+    def _build_preset_row(self, row: Any) -> Dict[str, Any]:
+        # Values stay native (UUID/datetime); ReportPresetResponse validates them as-is
+        return {
+            "id": row["id"],
+            "user_id": row["user_id"],
+            "name": row["name"],
+            "description": row["description"],
+            "companies": self._normalise_array(row["companies"]),
+            "filters": self._normalise_json(row["filters"], default={}),
+            "visualization_config": self._normalise_json(row["visualization_config"], default={}),
+            "is_favorite": row["is_favorite"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
     async def _load_preset_map(
         self,
         user_id: UUID,
@@ -685,6 +910,7 @@ class AnalyticsComparisonService:
                 UserReportPreset.user_id == user_id,
                 UserReportPreset.id.in_(preset_ids),
             )
+            .options(*self._strict_loading())
         )
         result = await self.db.execute(stmt)
         presets = list(result.scalars().all())
@@ -753,34 +979,35 @@ class AnalyticsComparisonService:
     def _enum_value(value: Optional[Any]) -> str:
         if value is None:
             return ""
-        serialised = value.value if hasattr(value, "value") else str(value)
-        logger.debug("Normalised enum value", original=value, serialised=serialised)
-        return serialised
+        return value.value if hasattr(value, "value") else str(value)
 
     @staticmethod
     def _normalise_array(value: Optional[Any]) -> List[UUID]:
         if value is None:
             return []
         if isinstance(value, (list, tuple)):
-            return [UUID(str(item)) if not isinstance(item, UUID) else item for item in value]
+            return [_as_uuid(item) for item in value]
+        if not isinstance(value, (str, bytes, bytearray)):
+            return [_as_uuid(value)]
         try:
-            parsed = json.loads(value)
-            return [
-                UUID(str(item)) if not isinstance(item, UUID) else item
-                for item in parsed or []
-            ]
+            parsed = _json_loads(value)
+            return [_as_uuid(item) for item in parsed or []]
         except (json.JSONDecodeError, TypeError, ValueError):
-            return [UUID(str(value))]
+            return [_as_uuid(value)]
 
     @staticmethod
     def _normalise_json(value: Optional[Any], *, default: Any) -> Any:
+        # JSON columns usually load as plain dicts/lists; an exact type check skips the MRO walk
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            return value
         if value is None:
             return default
         if isinstance(value, (dict, list)):
             return value
         if isinstance(value, str):
             try:
-                parsed = json.loads(value)
+                parsed = _json_loads(value)
                 return parsed if parsed is not None else default
             except json.JSONDecodeError:
                 return default
@@ -793,12 +1020,13 @@ class AnalyticsComparisonService:
 
         normalized: Dict[str, Any] = {}
 
+        # Request filters are validated into enum members by the schema already
         if filters.topics:
-            normalized["topics"] = [NewsTopic(topic) for topic in filters.topics]
+            normalized["topics"] = list(filters.topics)
         if filters.sentiments:
-            normalized["sentiments"] = [SentimentLabel(sentiment) for sentiment in filters.sentiments]
+            normalized["sentiments"] = list(filters.sentiments)
         if filters.source_types:
-            normalized["source_types"] = [SourceType(source) for source in filters.source_types]
+            normalized["source_types"] = list(filters.source_types)
         if filters.min_priority is not None:
             normalized["min_priority"] = float(filters.min_priority)
 
@@ -819,11 +1047,11 @@ class AnalyticsComparisonService:
         min_priority = filters.get("min_priority")
 
         if topics:
-            normalized["topics"] = [NewsTopic(topic) for topic in topics]
+            normalized["topics"] = [_coerce_enum(NewsTopic, topic) for topic in topics]
         if sentiments:
-            normalized["sentiments"] = [SentimentLabel(sentiment) for sentiment in sentiments]
+            normalized["sentiments"] = [_coerce_enum(SentimentLabel, sentiment) for sentiment in sentiments]
         if source_types:
-            normalized["source_types"] = [SourceType(source) for source in source_types]
+            normalized["source_types"] = [_coerce_enum(SourceType, source) for source in source_types]
         if min_priority is not None:
             normalized["min_priority"] = float(min_priority)
 
@@ -833,74 +1061,87 @@ class AnalyticsComparisonService:
         if not filters:
             return ComparisonFilters()
 
-        topics = [
-            topic.value if hasattr(topic, "value") else str(topic)
-            for topic in (filters.get("topics") or [])
-        ]
-        sentiments = [
-            sentiment.value if hasattr(sentiment, "value") else str(sentiment)
-            for sentiment in (filters.get("sentiments") or [])
-        ]
-        source_types = [
-            source.value if hasattr(source, "value") else str(source)
-            for source in (filters.get("source_types") or [])
-        ]
-        min_priority = filters.get("min_priority")
-
-        return ComparisonFilters(
-            topics=topics,
-            sentiments=sentiments,
-            source_types=source_types,
-            min_priority=min_priority,
+        # Normalised filters only hold enum members, which is what the schema stores
+        return ComparisonFilters.model_construct(
+            topics=list(filters.get("topics") or []),
+            sentiments=list(filters.get("sentiments") or []),
+            source_types=list(filters.get("source_types") or []),
+            min_priority=filters.get("min_priority"),
         )
 
     def _merge_counter(
         self,
         dictionaries: Iterable[Dict[str, Any]],
     ) -> Dict[str, int]:
-        counter: Dict[str, int] = defaultdict(int)
+        merged: Counter = Counter()
         for dictionary in dictionaries:
-            for key, value in dictionary.items():
-                label = key.value if hasattr(key, "value") else str(key)
-                counter[label] += int(value)
-        return dict(counter)
+            merged.update(dictionary)
+        if not merged:
+            return {}
+
+        # Each distribution is keyed by one column type, so the first key decides how labels are read
+        if hasattr(next(iter(merged)), "value"):
+            return {key.value: int(value) for key, value in merged.items()}
+        return {str(key): int(value) for key, value in merged.items()}
 
     def _aggregate_top_news(
         self,
-        metrics_list: Sequence[Dict[str, Any]],
+        metrics_list: Sequence[CompanyMetrics],
         *,
         limit: int,
     ) -> List[Dict[str, Any]]:
         news_items: List[Dict[str, Any]] = []
         for metrics in metrics_list:
-            news_items.extend(metrics.get("top_news") or [])
+            news_items.extend(metrics.top_news or [])
 
-        news_items.sort(key=lambda item: item.get("priority_score", 0), reverse=True)
-        return news_items[:limit]
+        # Only the top ``limit`` items are kept, so a bounded heap beats sorting the merged list
+        return heapq.nlargest(limit, news_items, key=_news_priority)
 
     def _aggregate_latest_snapshot(
         self,
-        subject: _ResolvedSubject,
+        latest_snapshots: Sequence[CompanyAnalyticsSnapshot],
         *,
-        company_snapshots: Dict[UUID, List[CompanyAnalyticsSnapshot]],
+        latest_totals: Optional[Sequence[_SnapshotTotals]] = None,
         include_components: bool,
     ) -> Optional[CompanyAnalyticsSnapshotSummary]:
-        latest_snapshots: List[CompanyAnalyticsSnapshot] = []
-        for company_id in subject.company_ids:
-            snapshots = company_snapshots.get(company_id) or []
-            if snapshots:
-                latest_snapshots.append(snapshots[-1])
-
         if not latest_snapshots:
             return None
-
-        total_news = sum(snapshot.news_total for snapshot in latest_snapshots)
-        positive_news = sum(snapshot.news_positive or 0 for snapshot in latest_snapshots)
-        negative_news = sum(snapshot.news_negative or 0 for snapshot in latest_snapshots)
-        neutral_news = sum(snapshot.news_neutral or 0 for snapshot in latest_snapshots)
-        pricing_changes = sum(snapshot.pricing_changes for snapshot in latest_snapshots)
-        feature_updates = sum(snapshot.feature_updates for snapshot in latest_snapshots)
-        funding_events = sum(snapshot.funding_events for snapshot in latest_snapshots)
+        if latest_totals is None:
+            latest_totals = [_SnapshotTotals.from_snapshot(snapshot) for snapshot in latest_snapshots]
+
+        total_news = positive_news = negative_news = neutral_news = 0
+        pricing_changes = feature_updates = funding_events = 0
+        # Means are reduced as (sum, count) scalars instead of collecting per-field lists
+        velocity_sum = impact_sum = trend_sum = 0.0
+        velocity_count = impact_count = trend_count = 0
+        for (
+            news,
+            positive,
+            negative,
+            neutral,
+            pricing,
+            features,
+            funding,
+            velocity,
+            impact,
+            trend,
+        ) in latest_totals:
+            total_news += news
+            positive_news += positive
+            negative_news += negative
+            neutral_news += neutral
+            pricing_changes += pricing
+            feature_updates += features
+            funding_events += funding
+            if velocity is not None:
+                velocity_sum += velocity
+                velocity_count += 1
+            if impact is not None:
+                impact_sum += impact
+                impact_count += 1
+            if trend is not None:
+                trend_sum += trend
+                trend_count += 1
 
         impact_components: List[AggregatedImpactComponent] = []
         if include_components:
@@ -911,15 +1152,11 @@ class AnalyticsComparisonService:
                 ]
             )
 
-        innovation_velocities = [snapshot.innovation_velocity for snapshot in latest_snapshots]
-        impact_scores = [snapshot.impact_score for snapshot in latest_snapshots]
-        trend_deltas = [snapshot.trend_delta for snapshot in latest_snapshots if snapshot.trend_delta is not None]
-
-        return CompanyAnalyticsSnapshotSummary(
+        return CompanyAnalyticsSnapshotSummary.model_construct(
             period_start=latest_snapshots[-1].period_start,
-            impact_score=self._safe_mean(impact_scores),
-            innovation_velocity=self._safe_mean(innovation_velocities),
-            trend_delta=self._safe_mean(trend_deltas) if trend_deltas else 0.0,
+            impact_score=impact_sum / impact_count if impact_count else 0.0,
+            innovation_velocity=velocity_sum / velocity_count if velocity_count else 0.0,
+            trend_delta=trend_sum / trend_count if trend_count else 0.0,
             news_total=total_news,
             news_positive=positive_news,
             news_negative=negative_news,
@@ -934,43 +1171,47 @@ class AnalyticsComparisonService:
         self,
         component_lists: Iterable[Sequence[ImpactComponent]],
     ) -> List[AggregatedImpactComponent]:
-        accumulator: Dict[str, Dict[str, float]] = defaultdict(lambda: {"score": 0.0, "weight": 0.0, "count": 0})
+        # Per component type: [score sum, weight sum, count]
+        accumulator: Dict[str, List[float]] = {}
 
         for components in component_lists:
             for component in components:
                 key = component.component_type.value if hasattr(component.component_type, "value") else str(component.component_type)
-                accumulator[key]["score"] += component.score_contribution
-                accumulator[key]["weight"] += component.weight
-                accumulator[key]["count"] += 1
+                row = accumulator.get(key)
+                if row is None:
+                    accumulator[key] = [component.score_contribution, component.weight, 1]
+                else:
+                    row[0] += component.score_contribution
+                    row[1] += component.weight
+                    row[2] += 1
 
         aggregated: List[AggregatedImpactComponent] = []
-        for key, value in accumulator.items():
-            count = max(value["count"], 1)
+        for key, (score, weight, count) in accumulator.items():
             aggregated.append(
                 AggregatedImpactComponent(
                     component_type=key,
-                    score_contribution=value["score"],
-                    weight=value["weight"] / count,
+                    score_contribution=score,
+                    weight=weight / count,
                 )
             )
 
-        aggregated.sort(key=lambda component: component.score_contribution, reverse=True)
+        aggregated.sort(key=attrgetter("score_contribution"), reverse=True)
         return aggregated
 
-    def _compute_trend(self, series: Sequence[ComparisonSeriesPoint]) -> float:
-        if len(series) < 2:
-            return 0.0
-        previous = series[-2].impact_score
-        current = series[-1].impact_score
+    @staticmethod
+    def _percent_change(current: float, previous: Optional[float]) -> Optional[float]:
         if not previous:
-            return 0.0
-        delta = ((current - previous) / abs(previous)) * 100.0
-        return round(delta, 2)
+            return None
+        return round(((current - previous) / abs(previous)) * 100.0, 2)
 
     def _safe_mean(self, values: Sequence[float]) -> float:
-        meaningful = [value for value in values if value is not None]
-        if not meaningful:
-            return 0.0
-        return statistics.fmean(meaningful)
+        # Inputs are a handful of floats per subject; one pass skips the filtered copy and fmean overhead
+        total = 0.0
+        count = 0
+        for value in values:
+            if value is not None:
+                total += value
+                count += 1
+        return total / count if count else 0.0
 
 
@@ -2,218 +2,306 @@
 Service for extracting company information from website
 """
 
-from typing import Dict, Optional
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 import httpx
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, Tag
 from loguru import logger
 
 from app.core.config import settings
 
 
-async def extract_company_info(website_url: str) -> Dict[str, Optional[str]]:
+# Homepage bytes read per extraction; metadata and logos sit near the top of the page
+_MAX_HTML_BYTES = 128 * 1024
+_HEAD_END = re.compile(rb'</head\s*>', re.IGNORECASE)
+# A favicon link or og:image in <head> means the body logo fallback is never consulted
+_HEAD_LOGO_HINT = re.compile(rb'rel=["\']?(?:shortcut\s+)?icon["\'\s>]|og:image', re.IGNORECASE)
+
+# Common logo selectors, compiled once into a single union selector
+_LOGO_SELECTORS = (
+    'img[alt*="logo" i]',
+    'img[class*="logo" i]',
+    'img[id*="logo" i]',
+    '.logo img',
+    '#logo img',
+)
+_LOGO_SELECTOR = soupsieve.compile(', '.join(_LOGO_SELECTORS))
+
+# Known company name mappings for domains that do not capitalize cleanly
+_KNOWN_COMPANY_NAMES = {
+    'openai': 'OpenAI',
+    'anthropic': 'Anthropic',
+    'cohere': 'Cohere',
+    'meta': 'Meta',
+    'microsoft': 'Microsoft',
+    'google': 'Google',
+    'amazon': 'Amazon',
+    'apple': 'Apple',
+}
+
+# Keyword heuristics for category inference, checked in order
+_CATEGORY_KEYWORDS = (
+    ('llm_provider', ('ai', 'ml', 'machine-learning', 'artificial-intelligence')),
+    ('search_engine', ('search', 'engine', 'seo')),
+    ('toolkit', ('tool', 'platform', 'saas', 'software')),
+)
+_CATEGORY_PATTERNS = tuple(
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in _CATEGORY_KEYWORDS
+)
+
+# Meta tags read by the extractor, keyed by (attribute, value)
+_META_KEYS = {
+    ('property', 'og:title'): 'og_title',
+    ('property', 'og:description'): 'og_description',
+    ('property', 'og:image'): 'og_image',
+    ('name', 'description'): 'description',
+}
+
+
+# Extracted info per normalised domain: (info, stored_at monotonic time)
+_info_cache: "OrderedDict[str, Tuple[Dict[str, Optional[str]], float]]" = OrderedDict()
+# Downloads in progress per domain, so concurrent callers share one request
+_info_inflight: Dict[str, asyncio.Event] = {}
+
+
+def _cache_key(website_url: str) -> str:
+    """Normalise ``website_url`` to its domain so every page of a site shares one entry."""
+    netloc = (urlparse(website_url).netloc or '').lower()
+    return netloc.removeprefix('www.')
+
+
+async def _cached_or_inflight(key: str) -> Optional[Dict[str, Optional[str]]]:
+    """Return a fresh cached result, waiting for an in-flight download of the same domain first."""
+    if not key:
+        return None
+    inflight = _info_inflight.get(key)
+    if inflight is not None:
+        await inflight.wait()
+    entry = _info_cache.get(key)
+    if entry is None:
+        return None
+    info, stored_at = entry
+    if time.monotonic() - stored_at > settings.COMPANY_INFO_CACHE_TTL_SECONDS:
+        del _info_cache[key]
+        return None
+    _info_cache.move_to_end(key)
+    return info
+
+
+def _remember(key: str, info: Dict[str, Optional[str]]) -> None:
+    if not key:
+        return
+    _info_cache[key] = (dict(info), time.monotonic())
+    _info_cache.move_to_end(key)
+    while len(_info_cache) > settings.COMPANY_INFO_CACHE_MAX_ENTRIES:
+        _info_cache.popitem(last=False)
+
+
+def _collect_page_tags(soup: BeautifulSoup) -> Dict[str, Tag]:
+    """
+    Return the first <title>, favicon <link> and each ``_META_KEYS`` meta tag
+    from a single walk over the document.
+    """
+    found: Dict[str, Tag] = {}
+    wanted = len(_META_KEYS) + 2
+    for tag in soup.find_all(['title', 'meta', 'link']):
+        if tag.name == 'meta':
+            for attribute in ('property', 'name'):
+                key = _META_KEYS.get((attribute, tag.get(attribute)))
+                if key and key not in found:
+                    found[key] = tag
+        elif tag.name == 'title':
+            found.setdefault('title', tag)
+        elif 'favicon' not in found and 'icon' in (tag.get('rel') or ()):
+            # Same match as find('link', rel='icon'): rel is multi-valued, so "shortcut icon" counts
+            found['favicon'] = tag
+        if len(found) == wanted:
+            break
+    return found
+
+
+async def _read_homepage(response: httpx.Response) -> bytes:
+    """Read at most ``_MAX_HTML_BYTES``, stopping after ``</head>`` once the head names a logo."""
+    buffer = bytearray()
+    head_seen = False
+    async for chunk in response.aiter_bytes():
+        scan_from = max(len(buffer) - 16, 0)
+        buffer += chunk
+        if len(buffer) >= _MAX_HTML_BYTES:
+            del buffer[_MAX_HTML_BYTES:]
+            break
+        if not head_seen:
+            head_end = _HEAD_END.search(buffer, scan_from)
+            if head_end:
+                head_seen = True
+                if _HEAD_LOGO_HINT.search(buffer, 0, head_end.start()):
+                    break
+    return bytes(buffer)
+
+
+def _infer_category(*texts: str) -> Optional[str]:
+    """Infer a company category from keywords found in any of ``texts``."""
+    # Keywords contain no spaces, so joining cannot create matches across texts
+    haystack = ' '.join(texts)
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(haystack):
+            return category
+    return None
+
+
+def _domain_label(website_url: str) -> str:
+    """Return the main domain label of ``website_url`` (``www.openai.com`` -> ``openai``)."""
+    return (urlparse(website_url).netloc or '').replace('www.', '').split('.')[0]
+
+
+def _name_from_domain(domain: str) -> Optional[str]:
+    """Derive a display name from a domain label, honouring known company spellings."""
+    if not domain:
+        return None
+    return _KNOWN_COMPANY_NAMES.get(domain.lower(), domain.capitalize())
+
+
+def _fallback_from_domain(website_url: str) -> Dict[str, Optional[str]]:
+    """Build company info from the website domain alone when the page cannot be used."""
+    domain = _domain_label(website_url)
+    return {
+        'name': _name_from_domain(domain),
+        'description': None,
+        'logo_url': None,
+        'category': _infer_category(domain.lower()),
+    }
+
+
+async def _fetch_company_info(website_url: str) -> Dict[str, Optional[str]]:
+    """Download the homepage and extract company info; HTTP and parse errors propagate."""
+    async with httpx.AsyncClient(
+        headers={'User-Agent': settings.SCRAPER_USER_AGENT},
+        timeout=settings.SCRAPER_TIMEOUT,
+        follow_redirects=True
+    ) as client:
+        async with client.stream('GET', website_url) as response:
+            response.raise_for_status()
+            html = await _read_homepage(response)
+            encoding = response.charset_encoding
+
+        soup = BeautifulSoup(html, 'lxml', from_encoding=encoding)
+        page_tags = _collect_page_tags(soup)
+
+        # Extract company name from title or meta tags
+        name = None
+        title_tag = page_tags.get('title')
+        if title_tag:
+            title_text = title_tag.string
+            if title_text:
+                # Try to extract company name from title (remove common suffixes)
+                name = title_text.split('|')[0].split('-')[0].strip()
+                name = name.replace('Home', '').replace('Welcome', '').strip()
+
+        # Try meta tags
+        if not name:
+            og_title = page_tags.get('og_title')
+            if og_title and og_title.get('content'):
+                name = og_title['content'].split('|')[0].split('-')[0].strip()
+
+        # Extract description
+        description = None
+        meta_description = page_tags.get('description')
+        if meta_description and meta_description.get('content'):
+            description = meta_description['content'].strip()
+
+        if not description:
+            og_description = page_tags.get('og_description')
+            if og_description and og_description.get('content'):
+                description = og_description['content'].strip()
+
+        # Extract logo URL
+        logo_url = None
+        # Try favicon first
+        favicon = page_tags.get('favicon')
+        if favicon and favicon.get('href'):
+            favicon_href = favicon['href']
+            if favicon_href.startswith('http'):
+                logo_url = favicon_href
+            else:
+                logo_url = urljoin(website_url, favicon_href)
+
+        # Try og:image
+        if not logo_url:
+            og_image = page_tags.get('og_image')
+            if og_image and og_image.get('content'):
+                og_image_url = og_image['content']
+                if og_image_url.startswith('http'):
+                    logo_url = og_image_url
+                else:
+                    logo_url = urljoin(website_url, og_image_url)
+
+        # Try common logo selectors
+        if not logo_url:
+            for logo_img in _LOGO_SELECTOR.iselect(soup):
+                if logo_img.get('src'):
+                    logo_src = logo_img['src']
+                    if logo_src.startswith('http'):
+                        logo_url = logo_src
+                    else:
+                        logo_url = urljoin(website_url, logo_src)
+                    break
+
+        # Infer category from domain/name (basic heuristic)
+        domain = (urlparse(website_url).netloc or '').lower()
+        category = _infer_category(domain, (name or '').lower())
+
+        # If name is still None, try to extract from domain
+        if not name:
+            name = _name_from_domain(_domain_label(website_url))
+
+        return {
+            'name': name,
+            'description': description,
+            'logo_url': logo_url,
+            'category': category
+        }
+
+
+async def extract_company_info(website_url: str, *, force_refresh: bool = False) -> Dict[str, Optional[str]]:
     """
     Extract company information from website homepage
     
+    Results are cached per domain for ``COMPANY_INFO_CACHE_TTL_SECONDS`` and
+    concurrent calls for the same domain share one download.
+    
     Args:
         website_url: URL of the company website
+        force_refresh: Ignore any cached result and download the page again
         
     Returns:
         Dict with name, description, logo_url, category
     """
+    key = _cache_key(website_url)
+    if not force_refresh:
+        cached = await _cached_or_inflight(key)
+        if cached is not None:
+            return dict(cached)
+
+    done = _info_inflight[key] = asyncio.Event()
     try:
-        async with httpx.AsyncClient(
-            headers={'User-Agent': settings.SCRAPER_USER_AGENT},
-            timeout=settings.SCRAPER_TIMEOUT,
-            follow_redirects=True
-        ) as client:
-            response = await client.get(website_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract company name from title or meta tags
-            name = None
-            if soup.title:
-                title_text = soup.title.string
-                if title_text:
-                    # Try to extract company name from title (remove common suffixes)
-                    name = title_text.split('|')[0].split('-')[0].strip()
-                    name = name.replace('Home', '').replace('Welcome', '').strip()
-            
-            # Try meta tags
-            if not name:
-                og_title = soup.find('meta', property='og:title')
-                if og_title and og_title.get('content'):
-                    name = og_title['content'].split('|')[0].split('-')[0].strip()
-            
-            # Extract description
-            description = None
-            meta_description = soup.find('meta', attrs={'name': 'description'})
-            if meta_description and meta_description.get('content'):
-                description = meta_description['content'].strip()
-            
-            if not description:
-                og_description = soup.find('meta', property='og:description')
-                if og_description and og_description.get('content'):
-                    description = og_description['content'].strip()
-            
-            # Extract logo URL
-            logo_url = None
-            # Try favicon first
-            favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
-            if favicon and favicon.get('href'):
-                favicon_href = favicon['href']
-                if favicon_href.startswith('http'):
-                    logo_url = favicon_href
-                else:
-                    logo_url = urljoin(website_url, favicon_href)
-            
-            # Try og:image
-            if not logo_url:
-                og_image = soup.find('meta', property='og:image')
-                if og_image and og_image.get('content'):
-                    og_image_url = og_image['content']
-                    if og_image_url.startswith('http'):
-                        logo_url = og_image_url
-                    else:
-                        logo_url = urljoin(website_url, og_image_url)
-            
-            # Try common logo selectors
-            if not logo_url:
-                logo_selectors = [
-                    'img[alt*="logo" i]',
-                    'img[class*="logo" i]',
-                    'img[id*="logo" i]',
-                    '.logo img',
-                    '#logo img'
-                ]
-                for selector in logo_selectors:
-                    logo_img = soup.select_one(selector)
-                    if logo_img and logo_img.get('src'):
-                        logo_src = logo_img['src']
-                        if logo_src.startswith('http'):
-                            logo_url = logo_src
-                        else:
-                            logo_url = urljoin(website_url, logo_src)
-                        break
-            
-            # Infer category from domain/name (basic heuristic)
-            category = None
-            parsed_url = urlparse(website_url)
-            domain = (parsed_url.netloc or '').lower()
-            name_lower = (name or '').lower()
-            
-            if any(kw in domain or kw in name_lower for kw in ['ai', 'ml', 'machine-learning', 'artificial-intelligence']):
-                category = 'llm_provider'
-            elif any(kw in domain or kw in name_lower for kw in ['search', 'engine', 'seo']):
-                category = 'search_engine'
-            elif any(kw in domain or kw in name_lower for kw in ['tool', 'platform', 'saas', 'software']):
-                category = 'toolkit'
-            
-            # If name is still None, try to extract from domain
-            if not name:
-                parsed_url = urlparse(website_url)
-                domain = parsed_url.netloc or ''
-                # Remove www. and extract main domain name
-                domain = domain.replace('www.', '').split('.')[0]
-                if domain:
-                    # Capitalize properly (handle camelCase domains like "openAI" -> "OpenAI")
-                    if domain.lower() in ['openai', 'anthropic', 'cohere', 'meta', 'microsoft']:
-                        # Known company name mappings
-                        name_mapping = {
-                            'openai': 'OpenAI',
-                            'anthropic': 'Anthropic',
-                            'cohere': 'Cohere',
-                            'meta': 'Meta',
-                            'microsoft': 'Microsoft'
-                        }
-                        name = name_mapping.get(domain.lower(), domain.capitalize())
-                    else:
-                        # Capitalize first letter
-                        name = domain.capitalize()
-            
-            return {
-                'name': name,
-                'description': description,
-                'logo_url': logo_url,
-                'category': category
-            }
-            
+        info = await _fetch_company_info(website_url)
     except httpx.HTTPError as e:
         logger.warning(f"HTTP error extracting company info from {website_url}: {e}")
-        # Fallback: extract name from domain
-        parsed_url = urlparse(website_url)
-        domain = parsed_url.netloc or ''
-        domain = domain.replace('www.', '').split('.')[0]
-        if domain:
-            # Known company name mappings
-            name_mapping = {
-                'openai': 'OpenAI',
-                'anthropic': 'Anthropic',
-                'cohere': 'Cohere',
-                'meta': 'Meta',
-                'microsoft': 'Microsoft',
-                'google': 'Google',
-                'amazon': 'Amazon',
-                'apple': 'Apple'
-            }
-            name = name_mapping.get(domain.lower(), domain.capitalize())
-        else:
-            name = None
-        
-        # Infer category from domain
-        category = None
-        domain_lower = domain.lower() if domain else ''
-        if any(kw in domain_lower for kw in ['ai', 'ml', 'machine-learning', 'artificial-intelligence']):
-            category = 'llm_provider'
-        elif any(kw in domain_lower for kw in ['search', 'engine', 'seo']):
-            category = 'search_engine'
-        elif any(kw in domain_lower for kw in ['tool', 'platform', 'saas', 'software']):
-            category = 'toolkit'
-        
-        return {
-            'name': name,
-            'description': None,
-            'logo_url': None,
-            'category': category
-        }
+        return _fallback_from_domain(website_url)
     except Exception as e:
         logger.error(f"Failed to extract company info from {website_url}: {e}")
-        # Fallback: extract name from domain
-        parsed_url = urlparse(website_url)
-        domain = parsed_url.netloc or ''
-        domain = domain.replace('www.', '').split('.')[0]
-        if domain:
-            # Known company name mappings
-            name_mapping = {
-                'openai': 'OpenAI',
-                'anthropic': 'Anthropic',
-                'cohere': 'Cohere',
-                'meta': 'Meta',
-                'microsoft': 'Microsoft',
-                'google': 'Google',
-                'amazon': 'Amazon',
-                'apple': 'Apple'
-            }
-            name = name_mapping.get(domain.lower(), domain.capitalize())
-        else:
-            name = None
-        
-        # Infer category from domain
-        category = None
-        domain_lower = domain.lower() if domain else ''
-        if any(kw in domain_lower for kw in ['ai', 'ml', 'machine-learning', 'artificial-intelligence']):
-            category = 'llm_provider'
-        elif any(kw in domain_lower for kw in ['search', 'engine', 'seo']):
-            category = 'search_engine'
-        elif any(kw in domain_lower for kw in ['tool', 'platform', 'saas', 'software']):
-            category = 'toolkit'
-        
-        return {
-            'name': name,
-            'description': None,
-            'logo_url': None,
-            'category': category
-        }
+        return _fallback_from_domain(website_url)
+    finally:
+        if _info_inflight.get(key) is done:
+            del _info_inflight[key]
+        done.set()
 
+    # Only successful extractions are cached so transient failures are retried
+    _remember(key, info)
+    return dict(info)
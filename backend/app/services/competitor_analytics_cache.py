@@ -0,0 +1,87 @@
+"""
+In-process TTL cache for competitor analytics results.
+
+Kept apart from ``competitor_service`` so that news ingestion can invalidate
+entries without importing the competitors domain package.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from app.core.config import settings
+
+
+# Метрики и профили компаний: ключ -> (значение, время сохранения по time.monotonic()).
+# Второй элемент ключа всегда company_id — по нему работает инвалидация.
+_results_cache: "OrderedDict[Tuple[Any, ...], Tuple[Any, float]]" = OrderedDict()
+# Ключи, которые сейчас вычисляются, чтобы параллельные запросы ждали один расчёт
+_results_inflight: Dict[Tuple[Any, ...], asyncio.Event] = {}
+# Поколение компании растёт при каждой инвалидации: расчёт, начатый до неё, не сохраняется
+_company_generations: Dict[uuid.UUID, int] = {}
+
+
+def invalidate_company_cache(company_id: Any) -> None:
+    """
+    Drop cached metrics and profiles of a company.
+
+    Should be called when the company's news items are created, updated or deleted.
+    """
+    try:
+        company_uuid = uuid.UUID(str(company_id))
+    except (ValueError, TypeError):
+        return  # Игнорируем невалидные UUID
+    _company_generations[company_uuid] = _company_generations.get(company_uuid, 0) + 1
+    for key in [key for key in _results_cache if key[1] == company_uuid]:
+        del _results_cache[key]
+
+
+async def cached_many(
+    keys: Sequence[Tuple[Any, ...]],
+    load_missing: Callable[[List[Tuple[Any, ...]]], Awaitable[Dict[Tuple[Any, ...], Any]]],
+) -> Dict[Tuple[Any, ...], Any]:
+    """
+    Return fresh cached values for ``keys``, loading the rest with one ``load_missing`` call.
+
+    Keys already being computed by another caller are awaited instead of recomputed.
+    Values whose company was invalidated while loading are returned but not cached.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    results: Dict[Tuple[Any, ...], Any] = {}
+    missing: List[Tuple[Any, ...]] = []
+    for key in dict.fromkeys(keys):
+        inflight = _results_inflight.get(key)
+        if inflight is not None:
+            await inflight.wait()
+        entry = _results_cache.get(key)
+        if entry is not None and time.monotonic() - entry[1] <= settings.COMPETITOR_ANALYTICS_CACHE_TTL_SECONDS:
+            _results_cache.move_to_end(key)
+            results[key] = entry[0]
+        else:
+            _results_cache.pop(key, None)
+            missing.append(key)
+
+    if not missing:
+        return results
+
+    events = {key: asyncio.Event() for key in missing if key not in _results_inflight}
+    _results_inflight.update(events)
+    generations = {key: _company_generations.get(key[1], 0) for key in missing}
+    try:
+        loaded = await load_missing(missing)
+        stored_at = time.monotonic()
+        for key in missing:
+            results[key] = loaded[key]
+            if _company_generations.get(key[1], 0) != generations[key]:
+                continue
+            _results_cache[key] = (loaded[key], stored_at)
+            _results_cache.move_to_end(key)
+        while len(_results_cache) > settings.COMPETITOR_ANALYTICS_CACHE_MAX_ENTRIES:
+            _results_cache.popitem(last=False)
+    finally:
+        for key, event in events.items():
+            _results_inflight.pop(key, None)
+            event.set()
+    return results
@@ -71,6 +71,18 @@ class CompetitorChangeService:
             status=status,
         )
 
+    async def list_change_events_payload_bulk(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        limit: int = 20,
+        status: Optional[ChangeProcessingStatus] = None,
+    ) -> Dict[uuid.UUID, List[Dict[str, Any]]]:
+        return await self._domain_change.list_change_events_payload_bulk(
+            company_ids,
+            limit=limit,
+            status=status,
+        )
+
     async def paginate_change_events_payload(
         self,
         company_id: uuid.UUID,
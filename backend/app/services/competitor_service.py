@@ -2,18 +2,121 @@
 Competitor analysis service
 """
 
+import functools
+import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, and_, bindparam, func, desc, distinct
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 import uuid
 import math
 
-from app.models import NewsItem, Company, CompetitorComparison, NewsTopic, SentimentLabel, SourceType
+from app.models import NewsItem, Company, CompetitorComparison, NewsCategory, NewsTopic, SentimentLabel, SourceType
 from app.domains.competitors.repositories import CompetitorRepository
+from app.services.competitor_analytics_cache import cached_many
+
+# Колонки топ-новостей: строки без гидрации ORM-объектов
+_TOP_NEWS_COLUMNS = (
+    NewsItem.id,
+    NewsItem.title,
+    NewsItem.category,
+    NewsItem.topic,
+    NewsItem.sentiment,
+    NewsItem.source_type,
+    NewsItem.published_at,
+    NewsItem.source_url,
+    NewsItem.priority_score,
+)
+# Колонки компаний-кандидатов, которые попадают в ответ suggest_competitors
+_CANDIDATE_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.website,
+    Company.description,
+    Company.logo_url,
+    Company.category,
+)
+# Запросы профилей для подбора конкурентов имеют фиксированную форму, поэтому строятся
+# один раз: значения передаются через bindparam, а ключ кеша компиляции не пересчитывается
+_PROFILE_WINDOW = and_(
+    NewsItem.published_at >= bindparam("date_from"),
+    NewsItem.published_at <= bindparam("date_to"),
+)
+_PROFILE_NEWS_CONDITIONS = and_(
+    NewsItem.company_id.in_(bindparam("company_ids", expanding=True)),
+    _PROFILE_WINDOW,
+)
+_PROFILE_STATEMENTS = (
+    # Категория компании и сводные показатели одним LEFT JOIN: компании без новостей
+    # тоже попадают в выборку, а отсутствующие в БД — нет
+    select(
+        Company.id,
+        Company.category,
+        func.count(NewsItem.id),
+        func.avg(NewsItem.priority_score),
+    )
+    .select_from(Company)
+    .outerjoin(NewsItem, and_(NewsItem.company_id == Company.id, _PROFILE_WINDOW))
+    .where(Company.id.in_(bindparam("company_ids", expanding=True)))
+    .group_by(Company.id, Company.category),
+    select(NewsItem.company_id, NewsItem.category, func.count(NewsItem.id))
+    .where(_PROFILE_NEWS_CONDITIONS)
+    .group_by(NewsItem.company_id, NewsItem.category),
+    select(NewsItem.company_id, NewsItem.source_type, func.count(NewsItem.id))
+    .where(_PROFILE_NEWS_CONDITIONS)
+    .group_by(NewsItem.company_id, NewsItem.source_type),
+)
+# Значения enum-ов для сериализации; строки из БД совпадают с членами str-enum по хешу
+_ENUM_VALUES: Dict[Any, str] = {
+    member: member.value
+    for enum_cls in (NewsCategory, NewsTopic, SentimentLabel, SourceType)
+    for member in enum_cls
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _base_conditions(company_id: uuid.UUID, date_from: datetime, date_to: datetime) -> Tuple[Any, ...]:
+    """
+    Company and window predicates shared by every metric query of a request.
+
+    The expressions are immutable, so the eight metric getters reuse one set
+    (and its memoised statement cache key) instead of rebuilding it per query.
+    """
+    return (
+        NewsItem.company_id == company_id,
+        NewsItem.published_at >= date_from,
+        NewsItem.published_at <= date_to,
+    )
+
+
+def _filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(filters or {}, sort_keys=True, default=str)
+
+
+def _window_key(date_from: datetime, date_to: datetime) -> Tuple[datetime, datetime]:
+    # Окна строятся от now() с микросекундами — без округления до минуты ключ кэша не повторяется
+    return (
+        date_from.replace(second=0, microsecond=0),
+        date_to.replace(second=0, microsecond=0),
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class CompanyMetrics:
+    """Metrics bundle for a single company within a time window."""
+
+    news_volume: int
+    category_distribution: Dict[str, int]
+    topic_distribution: Dict[str, int]
+    sentiment_distribution: Dict[str, int]
+    activity_score: float
+    avg_priority: float
+    daily_activity: Dict[str, int]
+    top_news: List[Dict[str, Any]]
 
 
 class CompetitorAnalysisService:
@@ -62,24 +165,25 @@ class CompetitorAnalysisService:
             "top_news": {}
         }
         
+        metrics_by_company = await self.build_companies_metrics(
+            [uuid.UUID(company_id) for company_id in company_ids],
+            date_from,
+            date_to,
+            filters=filters,
+            top_news_limit=5,
+        )
+
         for company_id in company_ids:
-            company_uuid = uuid.UUID(company_id)
-            company_metrics = await self.build_company_metrics(
-                company_uuid,
-                date_from,
-                date_to,
-                filters=filters,
-                top_news_limit=5,
-            )
+            company_metrics = metrics_by_company[uuid.UUID(company_id)]
 
-            metrics["news_volume"][company_id] = company_metrics["news_volume"]
-            metrics["category_distribution"][company_id] = company_metrics["category_distribution"]
-            metrics["topic_distribution"][company_id] = company_metrics["topic_distribution"]
-            metrics["sentiment_distribution"][company_id] = company_metrics["sentiment_distribution"]
-            metrics["activity_score"][company_id] = company_metrics["activity_score"]
-            metrics["avg_priority"][company_id] = company_metrics["avg_priority"]
-            metrics["daily_activity"][company_id] = company_metrics["daily_activity"]
-            metrics["top_news"][company_id] = company_metrics["top_news"]
+            metrics["news_volume"][company_id] = company_metrics.news_volume
+            metrics["category_distribution"][company_id] = company_metrics.category_distribution
+            metrics["topic_distribution"][company_id] = company_metrics.topic_distribution
+            metrics["sentiment_distribution"][company_id] = company_metrics.sentiment_distribution
+            metrics["activity_score"][company_id] = company_metrics.activity_score
+            metrics["avg_priority"][company_id] = company_metrics.avg_priority
+            metrics["daily_activity"][company_id] = company_metrics.daily_activity
+            metrics["top_news"][company_id] = company_metrics.top_news
         
         comparison_data = {
             "companies": [
@@ -119,30 +223,85 @@ class CompetitorAnalysisService:
         date_from: datetime,
         date_to: datetime,
         filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        conditions = list(_base_conditions(company_id, date_from, date_to))
+        if filters:
+            conditions.extend(self._filter_conditions(filters))
+        return conditions
+
+    def _build_bulk_conditions(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        date_from: datetime,
+        date_to: datetime,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[Any]:
         conditions = [
-            NewsItem.company_id == company_id,
+            NewsItem.company_id.in_(company_ids),
             NewsItem.published_at >= date_from,
             NewsItem.published_at <= date_to,
         ]
+        conditions.extend(self._filter_conditions(filters))
+        return conditions
 
-        if filters:
-            topics = filters.get("topics") or []
-            sentiments = filters.get("sentiments") or []
-            source_types = filters.get("source_types") or []
-            min_priority = filters.get("min_priority")
-
-            if topics:
-                conditions.append(NewsItem.topic.in_(topics))
-            if sentiments:
-                conditions.append(NewsItem.sentiment.in_(sentiments))
-            if source_types:
-                conditions.append(NewsItem.source_type.in_(source_types))
-            if min_priority is not None:
-                conditions.append(NewsItem.priority_score >= float(min_priority))
+    @staticmethod
+    def _filter_conditions(filters: Optional[Dict[str, Any]]) -> List[Any]:
+        conditions: List[Any] = []
+        if not filters:
+            return conditions
+
+        topics = filters.get("topics") or []
+        sentiments = filters.get("sentiments") or []
+        source_types = filters.get("source_types") or []
+        min_priority = filters.get("min_priority")
+
+        if topics:
+            conditions.append(NewsItem.topic.in_(topics))
+        if sentiments:
+            conditions.append(NewsItem.sentiment.in_(sentiments))
+        if source_types:
+            conditions.append(NewsItem.source_type.in_(source_types))
+        if min_priority is not None:
+            conditions.append(NewsItem.priority_score >= float(min_priority))
 
         return conditions
 
+    @staticmethod
+    def _recency_cutoff(date_from: datetime, date_to: datetime) -> datetime:
+        """
+        Earliest naive-UTC ``published_at`` that still counts as recent.
+
+        Equivalent to ``(now - published_at).days <= days_range / 2``: whole days
+        are floored, so anything newer than ``days_range // 2 + 1`` days qualifies.
+        """
+        days_range = (date_to - date_from).days or 1
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now - timedelta(days=days_range // 2 + 1)
+
+    @staticmethod
+    def _score_activity(volume: int, category_count: int, recent_count: int) -> float:
+        if not volume:
+            return 0.0
+        volume_score = min(volume * 2, 40)
+        diversity_score = min(category_count * 3, 30)
+        recency_score = min((recent_count / volume) * 30, 30)
+        return round(volume_score + diversity_score + recency_score, 2)
+
+    @staticmethod
+    def _serialize_top_news(item: Any) -> Dict[str, Any]:
+        """Serialize a ``_TOP_NEWS_COLUMNS`` row (or a NewsItem) into the top news payload."""
+        return {
+            "id": str(item.id),
+            "title": item.title,
+            "category": _ENUM_VALUES.get(item.category, item.category),
+            "topic": _ENUM_VALUES.get(item.topic, item.topic),
+            "sentiment": _ENUM_VALUES.get(item.sentiment, item.sentiment),
+            "source_type": _ENUM_VALUES.get(item.source_type, item.source_type),
+            "published_at": item.published_at.isoformat(),
+            "source_url": item.source_url,
+            "priority_score": item.priority_score
+        }
+
     async def get_news_volume(
         self,
         company_id: uuid.UUID,
@@ -237,35 +396,18 @@ class CompetitorAnalysisService:
         - Category diversity
         - Recency of news
         """
-        # Get news items
         conditions = self._build_conditions(company_id, date_from, date_to, filters)
+        recency_cutoff = self._recency_cutoff(date_from, date_to)
         result = await self.db.execute(
-            select(NewsItem)
+            select(
+                func.count(NewsItem.id),
+                func.count(distinct(NewsItem.category)),
+                func.count(NewsItem.id).filter(NewsItem.published_at > recency_cutoff),
+            )
             .where(and_(*conditions))
         )
-        news_items = result.scalars().all()
-        
-        if not news_items:
-            return 0.0
-        
-        # Volume score (normalized to 0-40 points)
-        volume = len(news_items)
-        volume_score = min(volume * 2, 40)
-        
-        # Category diversity score (0-30 points)
-        categories = set(item.category for item in news_items if item.category)
-        diversity_score = min(len(categories) * 3, 30)
-        
-        # Recency score (0-30 points)
-        from datetime import timezone as tz
-        now = datetime.now(tz.utc)
-        days_range = (date_to - date_from).days or 1
-        recent_news = sum(1 for item in news_items if item.published_at and (now - (item.published_at if item.published_at.tzinfo else item.published_at.replace(tzinfo=tz.utc))).days <= days_range / 2)
-        recency_score = min((recent_news / volume) * 30, 30) if volume > 0 else 0
-        
-        total_score = volume_score + diversity_score + recency_score
-        
-        return round(total_score, 2)
+        volume, category_count, recent_count = result.one()
+        return self._score_activity(volume or 0, category_count or 0, recent_count or 0)
 
     async def get_average_priority(
         self,
@@ -317,28 +459,13 @@ class CompetitorAnalysisService:
         """Get top news items for a company"""
         conditions = self._build_conditions(company_id, date_from, date_to, filters)
         result = await self.db.execute(
-            select(NewsItem)
+            select(*_TOP_NEWS_COLUMNS)
             .where(and_(*conditions))
             .order_by(desc(NewsItem.priority_score), desc(NewsItem.published_at))
             .limit(limit)
         )
         
-        news_items = result.scalars().all()
-        
-        return [
-            {
-                "id": str(item.id),
-                "title": item.title,
-                "category": item.category.value if hasattr(item.category, "value") else item.category,
-                "topic": item.topic.value if hasattr(item.topic, "value") else item.topic,
-                "sentiment": item.sentiment.value if hasattr(item.sentiment, "value") else item.sentiment,
-                "source_type": item.source_type.value if hasattr(item.source_type, "value") else item.source_type,
-                "published_at": item.published_at.isoformat(),
-                "source_url": item.source_url,
-                "priority_score": item.priority_score
-            }
-            for item in news_items
-        ]
+        return [self._serialize_top_news(row) for row in result.all()]
     
     async def build_company_metrics(
         self,
@@ -348,11 +475,35 @@ class CompetitorAnalysisService:
         *,
         filters: Optional[Dict[str, Any]] = None,
         top_news_limit: int = 5,
-    ) -> Dict[str, Any]:
+    ) -> CompanyMetrics:
         """
         Build the complete metrics bundle for a single company within the requested window.
         The method is shared across comparison endpoints to avoid duplicated aggregation logic.
         """
+        key = ("metrics", company_id, *_window_key(date_from, date_to), _filters_key(filters), top_news_limit)
+
+        async def _load(missing: List[Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], CompanyMetrics]:
+            return {
+                key: await self._compute_company_metrics(
+                    company_id,
+                    date_from,
+                    date_to,
+                    filters=filters,
+                    top_news_limit=top_news_limit,
+                )
+            }
+
+        return (await cached_many([key], _load))[key]
+
+    async def _compute_company_metrics(
+        self,
+        company_id: uuid.UUID,
+        date_from: datetime,
+        date_to: datetime,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        top_news_limit: int = 5,
+    ) -> CompanyMetrics:
         news_volume = await self.get_news_volume(company_id, date_from, date_to, filters)
         category_distribution = await self.get_category_distribution(company_id, date_from, date_to, filters)
         topic_distribution = await self.get_topic_distribution(company_id, date_from, date_to, filters)
@@ -368,17 +519,167 @@ class CompetitorAnalysisService:
             filters=filters,
         )
 
-        return {
-            "news_volume": news_volume,
-            "category_distribution": category_distribution,
-            "topic_distribution": topic_distribution,
-            "sentiment_distribution": sentiment_distribution,
-            "activity_score": activity_score,
-            "avg_priority": avg_priority,
-            "daily_activity": daily_activity,
-            "top_news": top_news,
-        }
+        return CompanyMetrics(
+            news_volume=news_volume,
+            category_distribution=category_distribution,
+            topic_distribution=topic_distribution,
+            sentiment_distribution=sentiment_distribution,
+            activity_score=activity_score,
+            avg_priority=avg_priority,
+            daily_activity=daily_activity,
+            top_news=top_news,
+        )
     
+    async def build_companies_metrics(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        date_from: datetime,
+        date_to: datetime,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        top_news_limit: int = 5,
+    ) -> Dict[uuid.UUID, CompanyMetrics]:
+        """
+        Build metrics bundles for several companies at once.
+
+        Every metric is computed by one query grouped by ``company_id`` instead of
+        eight queries per company; the result matches ``build_company_metrics``.
+        """
+        window_key = _window_key(date_from, date_to)
+        filters_key = _filters_key(filters)
+        keys = {
+            company_id: ("metrics", company_id, *window_key, filters_key, top_news_limit)
+            for company_id in company_ids
+        }
+
+        async def _load(missing: List[Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], CompanyMetrics]:
+            computed = await self._compute_companies_metrics(
+                [key[1] for key in missing],
+                date_from,
+                date_to,
+                filters=filters,
+                top_news_limit=top_news_limit,
+            )
+            return {key: computed[key[1]] for key in missing}
+
+        cached = await cached_many(list(keys.values()), _load)
+        return {company_id: cached[key] for company_id, key in keys.items()}
+
+    async def _compute_companies_metrics(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        date_from: datetime,
+        date_to: datetime,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        top_news_limit: int = 5,
+    ) -> Dict[uuid.UUID, CompanyMetrics]:
+        company_ids = list(dict.fromkeys(company_ids))
+        if not company_ids:
+            return {}
+
+        conditions = self._build_bulk_conditions(company_ids, date_from, date_to, filters)
+        recency_cutoff = self._recency_cutoff(date_from, date_to)
+
+        news_date = func.date(NewsItem.published_at)
+        ranked = (
+            select(
+                NewsItem.id.label("news_id"),
+                func.row_number()
+                .over(
+                    partition_by=NewsItem.company_id,
+                    order_by=(desc(NewsItem.priority_score), desc(NewsItem.published_at)),
+                )
+                .label("row_number"),
+            )
+            .where(and_(*conditions))
+            .subquery()
+        )
+        statements = [
+            select(
+                NewsItem.company_id,
+                func.count(NewsItem.id),
+                func.avg(NewsItem.priority_score),
+                func.count(distinct(NewsItem.category)),
+                func.count(NewsItem.id).filter(NewsItem.published_at > recency_cutoff),
+            )
+            .where(and_(*conditions))
+            .group_by(NewsItem.company_id),
+            select(NewsItem.company_id, NewsItem.category, func.count(NewsItem.id))
+            .where(and_(*conditions))
+            .group_by(NewsItem.company_id, NewsItem.category),
+            select(NewsItem.company_id, NewsItem.topic, func.count(NewsItem.id))
+            .where(and_(*conditions))
+            .group_by(NewsItem.company_id, NewsItem.topic),
+            select(NewsItem.company_id, NewsItem.sentiment, func.count(NewsItem.id))
+            .where(and_(*conditions))
+            .group_by(NewsItem.company_id, NewsItem.sentiment),
+            select(NewsItem.company_id, news_date, func.count(NewsItem.id))
+            .where(and_(*conditions))
+            .group_by(NewsItem.company_id, news_date)
+            .order_by(news_date),
+            select(NewsItem.company_id, *_TOP_NEWS_COLUMNS)
+            .join(ranked, ranked.c.news_id == NewsItem.id)
+            .where(ranked.c.row_number <= top_news_limit)
+            .order_by(desc(NewsItem.priority_score), desc(NewsItem.published_at)),
+        ]
+        (
+            summary_rows,
+            category_rows,
+            topic_rows,
+            sentiment_rows,
+            daily_rows,
+            top_news_rows,
+        ) = [await self._fetch_rows(stmt) for stmt in statements]
+
+        summaries = {row[0]: tuple(row[1:]) for row in summary_rows}
+
+        category_distribution: Dict[uuid.UUID, Dict[str, int]] = {cid: {} for cid in company_ids}
+        for company_id, category, count in category_rows:
+            if category:
+                category_distribution[company_id][category] = count
+
+        topic_distribution: Dict[uuid.UUID, Dict[str, int]] = {cid: {} for cid in company_ids}
+        for company_id, topic, count in topic_rows:
+            if topic:
+                topic_value = topic.value if hasattr(topic, "value") else str(topic)
+                topic_distribution[company_id][topic_value] = count
+
+        sentiment_distribution: Dict[uuid.UUID, Dict[str, int]] = {cid: {} for cid in company_ids}
+        for company_id, sentiment, count in sentiment_rows:
+            if sentiment:
+                sentiment_value = sentiment.value if hasattr(sentiment, "value") else str(sentiment)
+                sentiment_distribution[company_id][sentiment_value] = count
+
+        daily_activity: Dict[uuid.UUID, Dict[str, int]] = {cid: {} for cid in company_ids}
+        for company_id, date, count in daily_rows:
+            daily_activity[company_id][str(date)] = count
+
+        top_news: Dict[uuid.UUID, List[Dict[str, Any]]] = {cid: [] for cid in company_ids}
+        for row in top_news_rows:
+            top_news[row.company_id].append(self._serialize_top_news(row))
+
+        metrics: Dict[uuid.UUID, CompanyMetrics] = {}
+        for company_id in company_ids:
+            volume, avg_priority, category_count, recent_count = summaries.get(
+                company_id, (0, None, 0, 0)
+            )
+            metrics[company_id] = CompanyMetrics(
+                news_volume=volume or 0,
+                category_distribution=category_distribution[company_id],
+                topic_distribution=topic_distribution[company_id],
+                sentiment_distribution=sentiment_distribution[company_id],
+                activity_score=self._score_activity(volume or 0, category_count or 0, recent_count or 0),
+                avg_priority=float(avg_priority) if avg_priority is not None else 0.0,
+                daily_activity=daily_activity[company_id],
+                top_news=top_news[company_id],
+            )
+        return metrics
+
+    async def _fetch_rows(self, stmt: Any, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        result = await self.db.execute(stmt, params)
+        return list(result.all())
+
     def _get_mock_companies(self, company_ids: List[str]) -> List[Company]:
         """Get mock company objects when DB is unavailable"""
         mock_companies = []
@@ -523,51 +824,59 @@ class CompetitorAnalysisService:
         try:
             # Set default date range if not provided
             if not date_from:
-                date_from = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
+                date_from = datetime.now(timezone.utc).replace(tzinfo=None, second=0, microsecond=0) - timedelta(days=30)
             if not date_to:
-                date_to = datetime.now(timezone.utc).replace(tzinfo=None)
-            
-            # 1. Получить профиль целевой компании
-            target_profile = await self._get_company_profile(company_id, date_from, date_to)
+                # Окно по умолчанию выравниваем по минуте, чтобы повторные вызовы попадали в кеш профилей
+                date_to = datetime.now(timezone.utc).replace(tzinfo=None, second=0, microsecond=0)
             
-            # 2. Получить профили других компаний (ограничиваем до 50 для производительности)
+            # 1. Получить другие компании (ограничиваем до 50 для производительности)
             all_companies = await self._get_all_companies_except(company_id, limit=50)
             
             if not all_companies:
                 logger.warning(f"No other companies found for competitor analysis")
                 return []
             
-            candidates = []
+            scored = []
+            
+            # 2. Профили целевой компании и всех кандидатов одним набором сгруппированных запросов
+            profiles = await self._get_company_profiles(
+                [company_id, *(company.id for company in all_companies)], date_from, date_to
+            )
+            target_profile = profiles[company_id]
             
             # Обрабатываем компании с обработкой ошибок
             for company in all_companies:
                 try:
-                    company_profile = await self._get_company_profile(company.id, date_from, date_to)
+                    company_profile = profiles[company.id]
                     
                     # 3. Посчитать схожесть
                     similarity = self._calculate_similarity(target_profile, company_profile)
                     
                     if similarity > 0.3:  # Минимальный порог
-                        candidates.append({
-                            "company": {
-                                "id": str(company.id),
-                                "name": company.name,
-                                "website": company.website,
-                                "description": company.description,
-                                "logo_url": company.logo_url,
-                                "category": company.category
-                            },
-                            "similarity_score": similarity,
-                            "common_categories": self._find_common_categories(target_profile, company_profile),
-                            "reason": self._generate_reason(target_profile, company_profile)
-                        })
+                        scored.append((similarity, company, company_profile))
                 except Exception as e:
                     logger.warning(f"Error processing company {company.id} for competitor analysis: {e}")
                     continue
             
-            # 4. Отсортировать по схожести
-            candidates.sort(key=lambda x: x["similarity_score"], reverse=True)
-            return candidates[:limit]
+            # 4. Отсортировать по точной схожести, ответ собираем только для лучших
+            scored.sort(key=lambda item: item[0], reverse=True)
+            candidates = []
+            for similarity, company, company_profile in scored[:limit]:
+                common_categories = self._find_common_categories(target_profile, company_profile)
+                candidates.append({
+                    "company": {
+                        "id": str(company.id),
+                        "name": company.name,
+                        "website": company.website,
+                        "description": company.description,
+                        "logo_url": company.logo_url,
+                        "category": company.category
+                    },
+                    "similarity_score": round(similarity, 2),
+                    "common_categories": common_categories,
+                    "reason": self._generate_reason(target_profile, company_profile, common_categories)
+                })
+            return candidates
             
         except Exception as e:
             logger.error(f"Error suggesting competitors for company {company_id}: {e}", exc_info=True)
@@ -614,26 +923,21 @@ class CompetitorAnalysisService:
             category_match * 0.1
         )
         
-        return round(total_similarity, 2)
+        # Без округления: точное значение нужно для сортировки, округляем при выдаче
+        return total_similarity
     
     def _cosine_similarity(self, dict1: Dict[str, int], dict2: Dict[str, int]) -> float:
         """Calculate cosine similarity between two dictionaries"""
-        # Get all unique keys
-        all_keys = set(dict1.keys()) | set(dict2.keys())
-        
-        if not all_keys:
+        if not dict1 or not dict2:
             return 0.0
         
-        # Create vectors
-        vec1 = [dict1.get(key, 0) for key in all_keys]
-        vec2 = [dict2.get(key, 0) for key in all_keys]
-        
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
+        # Ключи, которых нет в одном из словарей, не влияют на скалярное произведение,
+        # поэтому обходим только меньший словарь без построения общего вектора
+        smaller, larger = (dict1, dict2) if len(dict1) <= len(dict2) else (dict2, dict1)
+        dot_product = sum(value * larger.get(key, 0) for key, value in smaller.items())
         
-        # Calculate magnitudes
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(a * a for a in vec2))
+        magnitude1 = math.hypot(*dict1.values())
+        magnitude2 = math.hypot(*dict2.values())
         
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
@@ -649,82 +953,92 @@ class CompetitorAnalysisService:
         """Get comprehensive company profile"""
         
         try:
-            # Get company info
-            result = await self.db.execute(
-                select(Company).where(Company.id == company_id)
-            )
-            company = result.scalar_one_or_none()
-            
-            if not company:
-                return {
-                    "category_distribution": {},
-                    "source_distribution": {},
-                    "activity_level": 0,
-                    "avg_priority": 0.0,
-                    "company_category": "unknown"
-                }
-            
-            # Get news items with limit to avoid loading too many
-            result = await self.db.execute(
-                select(NewsItem)
-                .where(
-                    and_(
-                        NewsItem.company_id == company_id,
-                        NewsItem.published_at >= date_from,
-                        NewsItem.published_at <= date_to
-                    )
-                )
-                .limit(1000)  # Limit to avoid loading too many news items
-            )
-            news_items = list(result.scalars().all())
-            
-            # Calculate distributions
-            category_distribution = {}
-            source_distribution = {}
-            total_priority = 0.0
-            
-            for item in news_items:
-                # Category distribution
-                if item.category:
-                    cat_key = item.category.value if hasattr(item.category, 'value') else str(item.category)
-                    category_distribution[cat_key] = category_distribution.get(cat_key, 0) + 1
-                
-                # Source distribution
-                if item.source_type:
-                    source_key = item.source_type.value if hasattr(item.source_type, 'value') else str(item.source_type)
-                    source_distribution[source_key] = source_distribution.get(source_key, 0) + 1
-                
-                # Priority
-                total_priority += item.priority_score or 0
-            
-            avg_priority = total_priority / len(news_items) if news_items else 0.0
-            
-            return {
-                "category_distribution": category_distribution,
-                "source_distribution": source_distribution,
-                "activity_level": len(news_items),
-                "avg_priority": avg_priority,
-                "company_category": company.category or "unknown"
-            }
+            profiles = await self._get_company_profiles([company_id], date_from, date_to)
+            return profiles[company_id]
         except Exception as e:
             logger.error(f"Error getting company profile for {company_id}: {e}", exc_info=True)
-            return {
-                "category_distribution": {},
-                "source_distribution": {},
-                "activity_level": 0,
-                "avg_priority": 0.0,
-                "company_category": "unknown"
+            return self._empty_profile()
+    
+    async def _get_company_profiles(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        date_from: datetime,
+        date_to: datetime
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """Get profiles for several companies with one grouped query per aggregate"""
+        window_key = _window_key(date_from, date_to)
+        keys = {company_id: ("profile", company_id, *window_key) for company_id in company_ids}
+        
+        async def _load(missing: List[Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+            computed = await self._compute_company_profiles([key[1] for key in missing], date_from, date_to)
+            return {key: computed[key[1]] for key in missing}
+        
+        cached = await cached_many(list(keys.values()), _load)
+        return {company_id: cached[key] for company_id, key in keys.items()}
+    
+    async def _compute_company_profiles(
+        self,
+        company_ids: Sequence[uuid.UUID],
+        date_from: datetime,
+        date_to: datetime
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        company_ids = list(dict.fromkeys(company_ids))
+        if not company_ids:
+            return {}
+        
+        params = {"company_ids": company_ids, "date_from": date_from, "date_to": date_to}
+        # Распределения считаем в БД, а не по загруженным строкам
+        summary_rows, category_rows, source_rows = [
+            await self._fetch_rows(stmt, params) for stmt in _PROFILE_STATEMENTS
+        ]
+        
+        profiles = {
+            cid: {
+                **self._empty_profile(),
+                "activity_level": activity_level or 0,
+                "avg_priority": float(avg_priority) if avg_priority is not None else 0.0,
+                "company_category": company_category or "unknown",
             }
+            for cid, company_category, activity_level, avg_priority in summary_rows
+        }
+        
+        for cid, category, count in category_rows:
+            if category and cid in profiles:
+                cat_key = category.value if hasattr(category, 'value') else str(category)
+                profiles[cid]["category_distribution"][cat_key] = count
+        
+        for cid, source_type, count in source_rows:
+            if source_type and cid in profiles:
+                source_key = source_type.value if hasattr(source_type, 'value') else str(source_type)
+                profiles[cid]["source_distribution"][source_key] = count
+        
+        # Неизвестные компании получают пустой профиль
+        return {cid: profiles.get(cid) or self._empty_profile() for cid in company_ids}
     
-    async def _get_all_companies_except(self, exclude_id: uuid.UUID, limit: int = 100) -> List[Company]:
-        """Get all companies except the excluded one, with a limit to avoid loading too many"""
+    @staticmethod
+    def _empty_profile() -> Dict[str, Any]:
+        return {
+            "category_distribution": {},
+            "source_distribution": {},
+            "activity_level": 0,
+            "avg_priority": 0.0,
+            "company_category": "unknown"
+        }
+    
+    async def _get_all_companies_except(self, exclude_id: uuid.UUID, limit: int = 100) -> List[Any]:
+        """
+        Get all companies except the excluded one, with a limit to avoid loading too many.
+
+        Returns rows with only the columns used in competitor suggestions
+        (id, name, website, description, logo_url, category).
+        """
         try:
             result = await self.db.execute(
-                select(Company)
+                select(*_CANDIDATE_COLUMNS)
                 .where(Company.id != exclude_id)
                 .limit(limit)
             )
-            return list(result.scalars().all())
+            return list(result.all())
         except Exception as e:
             logger.error(f"Error fetching companies for competitor analysis: {e}", exc_info=True)
             return []
@@ -735,15 +1049,13 @@ class CompetitorAnalysisService:
         profile2: Dict[str, Any]
     ) -> List[str]:
         """Find common categories between two profiles"""
-        categories1 = set(profile1["category_distribution"].keys())
-        categories2 = set(profile2["category_distribution"].keys())
-        common = categories1.intersection(categories2)
-        return list(common)
+        return list(profile1["category_distribution"].keys() & profile2["category_distribution"].keys())
     
     def _generate_reason(
         self, 
         profile1: Dict[str, Any], 
-        profile2: Dict[str, Any]
+        profile2: Dict[str, Any],
+        common_categories: Optional[List[str]] = None
     ) -> str:
         """Generate human-readable reason for similarity"""
         reasons = []
@@ -754,7 +1066,8 @@ class CompetitorAnalysisService:
             reasons.append("similar activity level")
         
         # Check category similarity
-        common_categories = self._find_common_categories(profile1, profile2)
+        if common_categories is None:
+            common_categories = self._find_common_categories(profile1, profile2)
         if len(common_categories) >= 2:
             reasons.append("similar news patterns")
         
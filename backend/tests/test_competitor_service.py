@@ -1,5 +1,9 @@
+import math
 import uuid
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
 
 from app.models import NewsTopic, SentimentLabel, SourceType, NewsItem
 from app.services.competitor_service import CompetitorAnalysisService
@@ -59,3 +63,99 @@ def test_build_conditions_with_filters_adds_expected_clauses() -> None:
 
     assert priority_clause.left == NewsItem.priority_score
     assert float(priority_clause.right.value) == 0.7
+
+
+def test_cosine_similarity_handles_disjoint_and_empty_distributions() -> None:
+    service = _build_service()
+
+    assert service._cosine_similarity({"a": 3, "b": 4}, {"a": 3, "b": 4}) == pytest.approx(1.0)
+    assert service._cosine_similarity({"a": 1, "b": 1}, {"a": 1, "c": 5}) == pytest.approx(
+        1 / (math.sqrt(2) * math.sqrt(26))
+    )
+    assert service._cosine_similarity({"a": 2}, {"b": 2}) == 0.0
+    assert service._cosine_similarity({}, {"a": 1}) == 0.0
+    assert service._cosine_similarity({"a": 0}, {"a": 0}) == 0.0
+
+
+def test_generate_reason_reuses_common_categories() -> None:
+    service = _build_service()
+    profile1 = {
+        "category_distribution": {"product_update": 3, "pricing_change": 1, "funding_news": 2},
+        "activity_level": 10,
+        "avg_priority": 0.6,
+        "company_category": "llm_provider",
+    }
+    profile2 = {
+        "category_distribution": {"product_update": 1, "pricing_change": 4},
+        "activity_level": 30,
+        "avg_priority": 0.1,
+        "company_category": "toolkit",
+    }
+
+    common = service._find_common_categories(profile1, profile2)
+
+    assert sorted(common) == ["pricing_change", "product_update"]
+    assert service._generate_reason(profile1, profile2, common) == "similar news patterns"
+    assert service._generate_reason(profile1, profile2) == "similar news patterns"
+    assert service._generate_reason(profile1, profile2, []) == "general similarity"
+
+
+def test_build_conditions_reuses_base_predicates_for_same_window() -> None:
+    service = _build_service()
+    company_id = uuid.uuid4()
+    date_to = datetime(2025, 1, 31)
+    date_from = date_to - timedelta(days=30)
+
+    first = service._build_conditions(company_id, date_from, date_to, filters=None)
+    second = service._build_conditions(
+        company_id, date_from, date_to, filters={"min_priority": 0.5}
+    )
+
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second[:3]))
+    assert len(second) == 4
+
+
+@pytest.mark.asyncio
+async def test_suggest_competitors_sorts_by_unrounded_similarity(monkeypatch) -> None:
+    service = _build_service()
+    target_id, close_id, closer_id, distant_id = (uuid.uuid4() for _ in range(4))
+
+    def _profile(activity: float, category: str = "product_update") -> dict:
+        return {
+            "category_distribution": {category: 2},
+            "source_distribution": {"blog": 1},
+            "activity_level": activity,
+            "avg_priority": 0.5,
+            "company_category": "llm_provider",
+        }
+
+    profiles = {
+        target_id: _profile(10),
+        close_id: _profile(9.96),
+        closer_id: _profile(9.98),
+        distant_id: {**_profile(100, "funding_news"), "source_distribution": {"github": 1}, "company_category": None},
+    }
+    candidates = [
+        SimpleNamespace(id=cid, name=str(cid), website=None, description=None, logo_url=None, category=None)
+        for cid in (close_id, closer_id, distant_id)
+    ]
+
+    async def fake_profile(company_id, date_from, date_to):
+        return profiles[company_id]
+
+    async def fake_profiles(company_ids, date_from, date_to):
+        return {company_id: profiles[company_id] for company_id in company_ids}
+
+    async def fake_candidates(exclude_id, limit=100):
+        return candidates
+
+    monkeypatch.setattr(service, "_get_company_profile", fake_profile)
+    monkeypatch.setattr(service, "_get_company_profiles", fake_profiles)
+    monkeypatch.setattr(service, "_get_all_companies_except", fake_candidates)
+
+    suggestions = await service.suggest_competitors(target_id, limit=5)
+
+    assert [item["company"]["id"] for item in suggestions] == [str(closer_id), str(close_id)]
+    assert [item["similarity_score"] for item in suggestions] == [1.0, 1.0]
+    assert service._calculate_similarity(profiles[target_id], profiles[close_id]) == pytest.approx(0.9992)
@@ -0,0 +1,605 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from app.scrapers.config_loader import SourceConfig, SourceRetryConfig
+from app.scrapers.rate_limiter import SourceFetchLock
+from app.scrapers.request_lock import InMemoryRequestLockBackend
+from app.scrapers.universal_scraper import (
+    _COMPILED_DEFAULT_SELECTOR,
+    UniversalBlogScraper,
+)
+
+
+BLOG_HTML = """
+<html>
+  <body>
+    <article><h2><a href="/blog/first-post">First post about releases</a></h2></article>
+    <article><h2><a href="/blog/second-post">Second post about pricing</a></h2></article>
+    <a href="https://other.example.org/blog/offsite">Offsite article link</a>
+    <a href="/about">About the company</a>
+  </body>
+</html>
+"""
+
+
+@pytest.fixture
+def scraper() -> UniversalBlogScraper:
+    instance = UniversalBlogScraper()
+    instance._fetch_lock = SourceFetchLock(InMemoryRequestLockBackend())
+    return instance
+
+
+def _mock_session(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+
+
+def _source_config(url: str) -> SourceConfig:
+    return SourceConfig(id="test", urls=[url], retry=SourceRetryConfig(attempts=0))
+
+
+def test_extract_articles_with_combined_default_selector(scraper: UniversalBlogScraper) -> None:
+    soup = BeautifulSoup(BLOG_HTML, "html.parser")
+
+    articles = scraper._extract_articles(soup, "https://example.com/blog", _COMPILED_DEFAULT_SELECTOR)
+
+    assert [article["url"] for article in articles] == [
+        "https://example.com/blog/first-post",
+        "https://example.com/blog/second-post",
+    ]
+    assert articles[0]["title"] == "First post about releases"
+
+
+def test_extract_articles_accepts_raw_and_invalid_selectors(scraper: UniversalBlogScraper) -> None:
+    soup = BeautifulSoup(BLOG_HTML, "html.parser")
+
+    articles = scraper._extract_articles(soup, "https://example.com/blog", ["a[href", "article a"])
+
+    assert len(articles) == 2
+
+
+def test_extract_articles_combines_per_source_selectors(scraper: UniversalBlogScraper) -> None:
+    soup = BeautifulSoup(BLOG_HTML, "html.parser")
+
+    articles = scraper._extract_articles(soup, "https://example.com/blog", ["article h2 a", "article a"])
+
+    assert [article["url"] for article in articles] == [
+        "https://example.com/blog/first-post",
+        "https://example.com/blog/second-post",
+    ]
+    assert len(UniversalBlogScraper._resolve_matchers(["article h2 a", "article a"])) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_skips_non_html_responses(scraper: UniversalBlogScraper) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.7")
+
+    scraper.session = _mock_session(handler)
+    url = "https://example.com/blog/report.pdf"
+
+    html, final_url, status = await scraper._fetch_with_retry(url, _source_config(url))
+
+    assert html is None
+    assert final_url == url
+    assert status == 200
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_aborts_oversized_responses(
+    monkeypatch, scraper: UniversalBlogScraper
+) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_MAX_RESPONSE_BYTES", 16)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=BLOG_HTML.encode())
+
+    scraper.session = _mock_session(handler)
+    url = "https://example.com/blog"
+
+    html, _, _ = await scraper._fetch_with_retry(url, _source_config(url))
+
+    assert html is None
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_returns_html(scraper: UniversalBlogScraper) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=BLOG_HTML.encode())
+
+    scraper.session = _mock_session(handler)
+    url = "https://example.com/blog"
+
+    html, final_url, status = await scraper._fetch_with_retry(url, _source_config(url))
+
+    assert html == BLOG_HTML
+    assert (final_url, status) == (url, 200)
+    await scraper.close()
+
+
+def test_normalize_url_strips_query_and_trailing_slash(scraper: UniversalBlogScraper) -> None:
+    assert scraper._normalize_url("https://Example.COM/blog/?page=2#top") == "https://example.com/blog"
+
+
+@pytest.mark.asyncio
+async def test_scrape_source_extracts_articles_off_the_event_loop(
+    monkeypatch, scraper: UniversalBlogScraper
+) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=BLOG_HTML.encode())
+
+    scraper.session = _mock_session(handler)
+    url = "https://example.com/blog"
+
+    items, stats = await scraper._scrape_source(
+        company_name="Example",
+        source_config=_source_config(url),
+        max_articles=10,
+        seen_urls=set(),
+    )
+
+    assert [item["source_url"] for item in items] == [
+        "https://example.com/blog/first-post",
+        "https://example.com/blog/second-post",
+    ]
+    assert items[1]["category"] == "pricing_change"
+    assert stats["success"] is True
+    await scraper.close()
+
+
+def test_request_cache_is_bounded_and_expires(monkeypatch, scraper: UniversalBlogScraper) -> None:
+    scraper._cache_max_entries = 2
+    scraper._cache_response(("https://a.example", "A"), "<html>a</html>", "https://a.example")
+    scraper._cache_response(("https://b.example", "A"), "<html>b</html>", "https://b.example")
+    assert scraper._get_cached_response(("https://a.example", "A"))[0] == "<html>a</html>"
+
+    scraper._cache_response(("https://c.example", "A"), "<html>c</html>", "https://c.example")
+
+    # "b" was the least recently used entry once "a" was read back.
+    assert scraper._get_cached_response(("https://b.example", "A")) is None
+    assert list(scraper._request_cache) == [("https://a.example", "A"), ("https://c.example", "A")]
+
+    scraper._cache_ttl = -1
+    assert scraper._get_cached_response(("https://a.example", "A")) is None
+
+
+def test_request_cache_sweeps_expired_entries_on_insert(scraper: UniversalBlogScraper) -> None:
+    scraper._cache_response(("https://a.example", "A"), "<html>a</html>", "https://a.example")
+    scraper._cache_response(("https://b.example", "A"), "<html>b</html>", "https://b.example")
+
+    scraper._cache_ttl = -1
+    scraper._cache_response(("https://c.example", "A"), "<html>c</html>", "https://c.example")
+
+    assert list(scraper._request_cache) == [("https://c.example", "A")]
+
+
+class _RecordingHealthService:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def record_results_bulk(self, company_id, results):
+        self.calls.append((company_id, list(results)))
+
+
+@pytest.mark.asyncio
+async def test_scrape_source_flushes_health_results_once_per_source(
+    monkeypatch, scraper: UniversalBlogScraper
+) -> None:
+    from uuid import UUID, uuid4
+
+    from app.core.config import settings
+    from app.models.news import SourceType
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html></html>")
+
+    scraper.session = _mock_session(handler)
+    health_service = _RecordingHealthService()
+    company_id = str(uuid4())
+    config = SourceConfig(
+        id="test",
+        urls=["https://example.com/missing", "https://example.com/empty"],
+        source_type="news_site",
+        retry=SourceRetryConfig(attempts=0),
+    )
+
+    await scraper._scrape_source(
+        "Example",
+        config,
+        max_articles=5,
+        seen_urls=set(),
+        company_id=company_id,
+        health_service=health_service,
+    )
+
+    assert len(health_service.calls) == 1
+    recorded_company, results = health_service.calls[0]
+    assert recorded_company == UUID(company_id)
+    assert [(r["source_url"], r["status"], r["items_count"]) for r in results] == [
+        ("https://example.com/missing", 404, 0),
+        ("https://example.com/empty", 200, 0),
+    ]
+    assert {r["source_type"] for r in results} == {SourceType.NEWS_SITE}
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_scrape_source_flushes_health_results_when_loop_raises(
+    monkeypatch, scraper: UniversalBlogScraper
+) -> None:
+    from uuid import uuid4
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html></html>")
+
+    async def failing_parser(*args):
+        raise RuntimeError("parser crashed")
+
+    scraper.session = _mock_session(handler)
+    scraper._run_parser = failing_parser
+    health_service = _RecordingHealthService()
+    config = SourceConfig(
+        id="test",
+        urls=["https://example.com/missing", "https://example.com/crash"],
+        source_type="news_site",
+        retry=SourceRetryConfig(attempts=0),
+    )
+
+    with pytest.raises(RuntimeError):
+        await scraper._scrape_source(
+            "Example",
+            config,
+            max_articles=5,
+            seen_urls=set(),
+            company_id=str(uuid4()),
+            health_service=health_service,
+        )
+
+    assert len(health_service.calls) == 1
+    assert [(r["source_url"], r["status"]) for r in health_service.calls[0][1]] == [
+        ("https://example.com/missing", 404),
+    ]
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_scrape_with_heuristics_classifies_article_urls(scraper: UniversalBlogScraper) -> None:
+    html = """
+    <html><body>
+      <article><a href="/news/launch-of-new-product">Launch of new product</a></article>
+      <article><a href="/press/company-acquires-startup">Company acquires startup</a></article>
+      <article><a href="/blog/engineering-deep-dive">Engineering deep dive</a></article>
+    </body></html>
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=html.encode())
+
+    scraper.session = _mock_session(handler)
+
+    items = await scraper._scrape_with_heuristics(
+        company_name="Example",
+        website="https://example.com",
+        news_page_url="https://example.com/news",
+        max_articles=10,
+    )
+
+    assert {item["source_url"].rsplit("/", 2)[-2]: item["source_type"] for item in items} == {
+        "news": "news_site",
+        "press": "press_release",
+        "blog": "blog",
+    }
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_probe_candidates_filters_missing_urls(scraper: UniversalBlogScraper) -> None:
+    statuses = {"/blog": 200, "/news": 404, "/press": 405, "/updates": 301}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/insights":
+            raise httpx.ConnectError("boom", request=request)
+        status = statuses.get(request.url.path, 404)
+        if status == 301:
+            return httpx.Response(301, headers={"location": "https://example.com/blog"})
+        return httpx.Response(status)
+
+    scraper.session = _mock_session(handler)
+    urls = [f"https://example.com{path}" for path in ("/blog", "/news", "/press", "/updates", "/insights")]
+
+    reachable = await scraper._probe_candidates(urls)
+
+    assert reachable == [
+        "https://example.com/blog",
+        "https://example.com/press",
+        "https://example.com/updates",
+    ]
+    await scraper.close()
+
+
+
+@pytest.mark.asyncio
+async def test_probe_candidates_bounds_in_flight_requests(scraper: UniversalBlogScraper) -> None:
+    from app.scrapers.universal_scraper import _PROBE_BATCH_SIZE
+
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    scraper.session = _mock_session(handler)
+    urls = [f"https://example.com/blog-{index}" for index in range(_PROBE_BATCH_SIZE * 3)]
+
+    assert await scraper._probe_candidates(urls) == urls
+    assert peak == _PROBE_BATCH_SIZE
+
+    scraper._concurrency = asyncio.Semaphore(1)
+    peak = 0
+    assert await scraper._probe_candidates(urls) == urls
+    assert peak == 1
+    await scraper.close()
+
+def test_extract_articles_falls_back_to_nextjs_payload(scraper: UniversalBlogScraper) -> None:
+    html = (
+        "<html><body><script>"
+        'window.__DATA__ = {"href":"/blog/launch-week","title":"Launch week recap"};'
+        "</script></body></html>"
+    )
+    soup = BeautifulSoup(html, "html.parser")
+
+    articles = scraper._extract_articles(soup, "https://example.com/blog", ["article a"])
+
+    assert articles == [{"url": "https://example.com/blog/launch-week", "title": "Launch week recap"}]
+    assert UniversalBlogScraper._slugify("Acme Corp / Blog") == "acme-corp-blog"
+
+
+def test_infer_category_prefers_earlier_keyword_groups(scraper: UniversalBlogScraper) -> None:
+    assert scraper._infer_category("New model pricing tiers") == "pricing_change"
+    assert scraper._infer_category("Partnership to launch a new SDK") == "product_update"
+    assert scraper._infer_category("Quarterly roadmap") == "strategic_announcement"
+    assert scraper._infer_category("Hello world") is None
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://example.com/blog/first-post", True),
+        ("https://Example.com/Press-Release/q3-results", True),
+        ("https://blog.example.com/insights/trends", True),
+        ("https://example.com/blog/cover.PNG", False),
+        ("https://example.com/about", False),
+        ("https://other.org/blog/first-post", False),
+    ],
+)
+def test_looks_like_article(scraper: UniversalBlogScraper, url: str, expected: bool) -> None:
+    assert scraper._looks_like_article(url, "example.com") is expected
+
+
+def test_persist_snapshot_keeps_content_addressed_names(monkeypatch, tmp_path, scraper: UniversalBlogScraper) -> None:
+    import hashlib
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", True)
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOT_DIR", str(tmp_path))
+    url = "https://example.com/blog"
+
+    path = scraper._persist_snapshot("Acme Corp", "blog", url, BLOG_HTML)
+
+    digest = hashlib.sha256(f"{url}|{BLOG_HTML}".encode("utf-8")).hexdigest()
+    assert path == str((tmp_path / "acme-corp" / f"blog_{digest}.html").resolve())
+    assert (tmp_path / "acme-corp" / f"blog_{digest}.html").read_text(encoding="utf-8") == BLOG_HTML
+
+
+def test_persist_snapshot_skips_filesystem_for_known_digests(
+    monkeypatch, tmp_path, scraper: UniversalBlogScraper
+) -> None:
+    from pathlib import Path
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", True)
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(UniversalBlogScraper, "SNAPSHOT_SEEN_MAX_ENTRIES", 1)
+    exists_calls = []
+    original_exists = Path.exists
+
+    def counting_exists(self, *args, **kwargs):
+        exists_calls.append(self)
+        return original_exists(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "exists", counting_exists)
+    url = "https://example.com/blog"
+
+    first = scraper._persist_snapshot("Acme", "blog", url, BLOG_HTML)
+    second = scraper._persist_snapshot("Acme", "blog", url, BLOG_HTML)
+    scraper._persist_snapshot("Acme", "blog", url, BLOG_HTML + "<!-- v2 -->")
+
+    assert second == first
+    assert len([path for path in exists_calls if path.suffix == ".html"]) == 2
+    assert len(scraper._snapshot_seen) == 1
+
+
+@pytest.mark.asyncio
+async def test_discover_candidate_sources_parses_in_worker_pool(scraper: UniversalBlogScraper) -> None:
+    import threading
+
+    homepage = """
+    <html><body>
+      <a href="/blog/">Blog</a>
+      <a href="https://news.example.com/">Newsroom</a>
+      <a href="https://other.org/blog">Partner blog</a>
+      <a href="/pricing">Pricing</a>
+    </body></html>
+    """
+    parse_threads = []
+    original = scraper._extract_candidate_sources
+
+    def recording_extract(*args):
+        parse_threads.append(threading.current_thread().name)
+        return original(*args)
+
+    scraper._extract_candidate_sources = recording_extract
+    scraper.session = _mock_session(
+        lambda request: httpx.Response(200, headers={"content-type": "text/html"}, content=homepage.encode())
+    )
+
+    candidates = await scraper._discover_candidate_sources("https://example.com")
+
+    assert candidates == ["https://example.com/blog", "https://news.example.com"]
+    assert parse_threads and parse_threads[0].startswith("scraper-parse")
+    await scraper.close()
+
+
+def test_extract_from_nextjs_scripts_stops_at_limit_within_one_script(scraper: UniversalBlogScraper) -> None:
+    limit = UniversalBlogScraper.MAX_NEXTJS_ARTICLES
+    entries = ",".join(
+        f'{{"href":"/blog/post-{index}","title":"Post number {index}"}}'
+        for index in range(limit + 10)
+    )
+    soup = BeautifulSoup(
+        f"<html><body><script>window.__DATA__ = [{entries}];</script></body></html>",
+        "html.parser",
+    )
+
+    found = scraper._extract_from_nextjs_scripts(soup, "https://example.com/blog")
+
+    assert [url for url, _ in found] == [
+        f"https://example.com/blog/post-{index}" for index in range(limit)
+    ]
+
+
+def test_find_title_near_match_decodes_unicode_escapes(scraper: UniversalBlogScraper) -> None:
+    from app.scrapers.universal_scraper import _HREF_RE
+
+    script_text = '{"href":"/blog/caf","title":"Caf\\u00e9 launch — Привет"}'
+    match = _HREF_RE.search(script_text)
+
+    assert scraper._find_title_near_match(script_text, match) == "Café launch — Привет"
+
+
+@pytest.mark.parametrize(
+    "href",
+    ["/blog/post", "blog/post", "../post", "/blog/../post", "//cdn.example.org/x", "https://other.org/p", "?page=2"],
+)
+def test_fast_join_matches_urljoin(href: str) -> None:
+    from urllib.parse import urljoin, urlsplit
+
+    from app.scrapers.universal_scraper import _fast_join
+
+    base_url = "https://example.com/blog/archive?page=1"
+
+    assert _fast_join(urlsplit(base_url), base_url, href) == urljoin(base_url, href)
+
+
+@pytest.mark.asyncio
+async def test_scrape_source_writes_snapshots_off_the_event_loop(
+    monkeypatch, tmp_path, scraper: UniversalBlogScraper
+) -> None:
+    import threading
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOTS_ENABLED", True)
+    monkeypatch.setattr(settings, "SCRAPER_SNAPSHOT_DIR", str(tmp_path))
+    snapshot_threads = []
+    original = scraper._persist_snapshot
+
+    def recording_persist(*args):
+        snapshot_threads.append(threading.current_thread())
+        return original(*args)
+
+    scraper._persist_snapshot = recording_persist
+    scraper.session = _mock_session(
+        lambda request: httpx.Response(200, headers={"content-type": "text/html"}, content=BLOG_HTML.encode())
+    )
+
+    items, _ = await scraper._scrape_source(
+        company_name="Example",
+        source_config=_source_config("https://example.com/blog"),
+        max_articles=10,
+        seen_urls=set(),
+    )
+
+    assert snapshot_threads and snapshot_threads[0] is not threading.main_thread()
+    assert items[0]["raw_snapshot_url"].startswith(str(tmp_path))
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_sleeps_precomputed_backoff(monkeypatch, scraper: UniversalBlogScraper) -> None:
+    import app.scrapers.universal_scraper as universal_scraper
+
+    sleeps = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(universal_scraper.asyncio, "sleep", fake_sleep)
+    scraper.session = _mock_session(lambda request: httpx.Response(500))
+    config = SourceConfig(
+        id="test",
+        urls=["https://example.com/blog"],
+        retry=SourceRetryConfig(attempts=3, backoff_factor=4),
+    )
+
+    html, _, _ = await scraper._fetch_with_retry("https://example.com/blog", config)
+
+    assert html is None
+    assert config.retry.backoff_delays == (1.0, 4.0, 10.0, 10.0)
+    assert sleeps == [1.0, 4.0, 10.0]
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_retry_coalesces_concurrent_duplicates(scraper: UniversalBlogScraper) -> None:
+    import asyncio
+
+    requests_seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=BLOG_HTML.encode())
+
+    scraper.session = _mock_session(handler)
+    url = "https://example.com/blog"
+    config = _source_config(url)
+
+    results = await asyncio.gather(
+        scraper._fetch_with_retry(url, config, company_name="Example"),
+        scraper._fetch_with_retry(url + "/", config, company_name="Example"),
+    )
+
+    assert len(requests_seen) == 1
+    assert [result[0] for result in results] == [BLOG_HTML, BLOG_HTML]
+    assert scraper._inflight == {}
+    await scraper.close()
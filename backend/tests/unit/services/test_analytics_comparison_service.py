@@ -1,24 +1,37 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from typing import Optional
 from uuid import uuid4, UUID
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+
 from app.schemas.analytics import (
     ComparisonRequest,
     ComparisonSubjectRequest,
     AnalyticsExportRequest,
     ExportIncludeOptions,
     ComparisonFilters,
+    ReportPresetResponse,
 )
-from app.services.analytics_comparison_service import AnalyticsComparisonService
+from app.services.analytics_comparison_service import AnalyticsComparisonService, _ResolvedSubject
 from app.services.analytics_service import AnalyticsService
-from app.services.competitor_service import CompetitorAnalysisService
+from app.services.competitor_service import CompanyMetrics, CompetitorAnalysisService
 from app.services.competitor_change_service import CompetitorChangeService
-from app.models import User, UserReportPreset
+from app.models import ImpactComponentType, NewsTopic, SentimentLabel, SourceType, User, UserReportPreset
+from tests.utils.analytics_builders import (
+    create_change_event,
+    create_company,
+    create_graph_edge,
+    create_report_preset,
+    create_user_preferences,
+)
 
 
 class DummyUser(User):
@@ -43,20 +56,21 @@ async def test_build_comparison_basic(monkeypatch, async_session: AsyncSession)
     company_id = uuid4()
     period = "daily"
 
-    async def fake_get_snapshots(self, company_id: UUID, period: str, lookback: int):
-        return []
+    async def fake_get_snapshots_bulk(self, company_ids, period: str, lookback: int):
+        return {company_id: [] for company_id in company_ids}
 
-    async def fake_build_company_metrics(*args, **kwargs):
-        return {
-            "news_volume": 3,
-            "category_distribution": {"product_update": 3},
-            "topic_distribution": {"product": 3},
-            "sentiment_distribution": {"positive": 2, "neutral": 1},
-            "activity_score": 4.5,
-            "avg_priority": 0.7,
-            "daily_activity": {},
-            "top_news": [],
-        }
+    async def fake_load_metrics_for_subjects(self, subjects, **kwargs):
+        metrics = CompanyMetrics(
+            news_volume=3,
+            category_distribution={"product_update": 3},
+            topic_distribution={"product": 3},
+            sentiment_distribution={"positive": 2, "neutral": 1},
+            activity_score=4.5,
+            avg_priority=0.7,
+            daily_activity={},
+            top_news=[],
+        )
+        return [{company_id: metrics for company_id in subject.company_ids} for subject in subjects]
 
     async def fake_load_change_events(*args, **kwargs):
         return []
@@ -64,8 +78,8 @@ async def test_build_comparison_basic(monkeypatch, async_session: AsyncSession)
     async def fake_load_graph_edges(*args, **kwargs):
         return []
 
-    monkeypatch.setattr(AnalyticsService, "get_snapshots", fake_get_snapshots)
-    monkeypatch.setattr(AnalyticsComparisonService, "_load_metrics_for_subject", fake_build_company_metrics)
+    monkeypatch.setattr(AnalyticsService, "get_snapshots_bulk", fake_get_snapshots_bulk)
+    monkeypatch.setattr(AnalyticsComparisonService, "_load_metrics_for_subjects", fake_load_metrics_for_subjects)
     async def fake_load_company_map(*args, **kwargs):
         return {}
 
@@ -93,6 +107,7 @@ async def test_build_comparison_basic(monkeypatch, async_session: AsyncSession)
 
     assert response.subjects, "subject summaries should be present"
     assert response.metrics, "metric summaries should be present"
+    assert response.metrics[0].news_volume == 3
     assert response.period == period
 
 
@@ -154,8 +169,511 @@ async def test_build_export_payload(monkeypatch, async_session: AsyncSession) ->
     )
 
     assert export_payload.version.startswith("2.")
+    assert export_payload.generated_at == comparison_response.generated_at
+    assert comparison_response.date_to == comparison_response.generated_at.replace(tzinfo=None)
     assert export_payload.comparison.period == "daily"
     assert export_payload.export_format == "json"
 
 
+@pytest.mark.asyncio
+async def test_load_change_events_limits_per_company(async_session: AsyncSession) -> None:
+    busy = await create_company(async_session, name="ChangeLogBusy")
+    quiet = await create_company(async_session, name="ChangeLogQuiet")
+    now = datetime.now(timezone.utc)
+    for hours in (1, 2, 3):
+        await create_change_event(async_session, company_id=busy.id, detected_at=now - timedelta(hours=hours))
+    await create_change_event(async_session, company_id=quiet.id, detected_at=now - timedelta(days=5))
+
+    service = AnalyticsComparisonService(async_session)
+    events_by_company = await service._load_change_events([busy.id, quiet.id], limit=2)
+
+    assert len(events_by_company[busy.id]) == 2
+    assert len(events_by_company[quiet.id]) == 1
+
+    merged = service._merge_change_events([quiet.id, busy.id], events_by_company, limit=2)
+    assert [event.company_id for event in merged] == [busy.id, busy.id]
+
+
+@pytest.mark.asyncio
+async def test_load_graph_edges_limits_per_company(async_session: AsyncSession) -> None:
+    busy = await create_company(async_session, name="GraphBusy")
+    quiet = await create_company(async_session, name="GraphQuiet")
+    for _ in range(3):
+        await create_graph_edge(async_session, company_id=busy.id)
+    await create_graph_edge(async_session, company_id=quiet.id)
+
+    service = AnalyticsComparisonService(async_session)
+    edges_by_company = await service._load_graph_edges([busy.id, quiet.id], limit=2)
+
+    assert len(edges_by_company[busy.id]) == 2
+    assert len(edges_by_company[quiet.id]) == 1
+    assert len(service._merge_graph_edges([busy.id, quiet.id], edges_by_company, limit=2)) == 2
+    quiet_edges = service._merge_graph_edges([quiet.id], edges_by_company, limit=2)
+    assert [edge.company_id for edge in quiet_edges] == [quiet.id]
+
+
+@pytest.mark.asyncio
+async def test_load_company_map_raises_on_lazy_load_when_strict(
+    monkeypatch, async_session: AsyncSession
+) -> None:
+    company = await create_company(async_session, name="StrictLoadingCo")
+    async_session.expunge_all()
+    monkeypatch.setattr(settings, "ANALYTICS_RAISE_ON_LAZY_LOAD", True)
+
+    service = AnalyticsComparisonService(async_session)
+    company_map = await service._load_company_map([company.id])
+
+    assert company_map[company.id].name == company.name
+    with pytest.raises(InvalidRequestError):
+        company_map[company.id].news_items
+
+
+@pytest.mark.asyncio
+async def test_resolve_subjects_normalizes_each_preset_once(
+    monkeypatch, async_session: AsyncSession
+) -> None:
+    user = DummyUser()
+    async_session.add(user)
+    await async_session.commit()
+    await async_session.refresh(user)
+    preset = await create_report_preset(
+        async_session,
+        user_id=user.id,
+        companies=[str(uuid4()), str(uuid4())],
+        filters={"source_types": ["blog"], "min_priority": 0.3},
+    )
+
+    service = AnalyticsComparisonService(async_session)
+    calls = []
+    original = AnalyticsComparisonService._normalize_filters_from_preset
+
+    def counting_normalize(self, preset_obj):
+        calls.append(preset_obj.id)
+        return original(self, preset_obj)
+
+    monkeypatch.setattr(AnalyticsComparisonService, "_normalize_filters_from_preset", counting_normalize)
+
+    request = ComparisonRequest(
+        subjects=[
+            ComparisonSubjectRequest(subject_type="preset", reference_id=preset.id, label="First"),
+            ComparisonSubjectRequest(subject_type="preset", reference_id=preset.id, label="Second"),
+        ],
+        filters=ComparisonFilters(min_priority=0.5),
+    )
+    resolved = await service._resolve_subjects(request, user=user)
+
+    assert calls == [preset.id]
+    assert [subject.label for subject in resolved] == ["First", "Second"]
+    assert resolved[0].filters_for_fetch == resolved[1].filters_for_fetch
+    assert resolved[1].filters_display.min_priority == 0.5
+
+
+def _series_snapshot(period_start: datetime, impact_score: float, news_total: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        period_start=period_start,
+        impact_score=impact_score,
+        innovation_velocity=impact_score / 2,
+        news_total=news_total,
+        news_positive=news_total,
+        news_negative=0,
+        news_neutral=0,
+        pricing_changes=0,
+        feature_updates=1,
+        funding_events=0,
+        trend_delta=None,
+    )
+
+
+def test_build_series_for_subject_averages_scores_and_sums_counts(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+    first, second = uuid4(), uuid4()
+    day_one = datetime(2025, 3, 1)
+    day_two = datetime(2025, 3, 2)
+    subject = _ResolvedSubject(
+        subject_type="preset",
+        reference_id=uuid4(),
+        subject_key="preset:test",
+        label="Preset",
+        company_ids=[first, second],
+        companies=[],
+        preset=None,
+        color=None,
+        filters_for_fetch=None,
+        filters_display=ComparisonFilters(),
+    )
+    company_snapshots = {
+        first: [_series_snapshot(day_one, 2.0, news_total=2), _series_snapshot(day_two, 6.0)],
+        second: [_series_snapshot(day_one, 4.0, news_total=3)],
+    }
+
+    subject_snapshots, _, _ = service._collect_subject_snapshots(subject, company_snapshots)
+    series = service._build_series_for_subject(subject_snapshots, latest_snapshot=None)
+
+    assert [point.period_start for point in series] == [day_one, day_two]
+    assert series[0].impact_score == pytest.approx(3.0)
+    assert series[0].innovation_velocity == pytest.approx(1.5)
+    assert series[0].news_total == 5
+    assert series[0].feature_updates == 2
+    assert series[0].trend_delta is None
+    assert series[1].trend_delta == pytest.approx(100.0)
+
+
+def test_build_series_for_subject_defaults_missing_trend(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+    company_id = uuid4()
+    subject = _ResolvedSubject(
+        subject_type="company",
+        reference_id=company_id,
+        subject_key=f"company:{company_id}",
+        label="Company",
+        company_ids=[company_id],
+        companies=[],
+        preset=None,
+        color=None,
+        filters_for_fetch=None,
+        filters_display=ComparisonFilters(),
+    )
+    company_snapshots = {
+        company_id: [
+            _series_snapshot(datetime(2025, 3, 1), 0.0),
+            _series_snapshot(datetime(2025, 3, 2), 5.0),
+        ]
+    }
+
+    subject_snapshots, _, _ = service._collect_subject_snapshots(subject, company_snapshots)
+    series = service._build_series_for_subject(subject_snapshots, latest_snapshot=None)
+
+    assert series[0].trend_delta is None
+    assert series[-1].trend_delta == 0.0
+
+
+def _subject(company_ids, *, key: str, filters=None) -> _ResolvedSubject:
+    return _ResolvedSubject(
+        subject_type="preset",
+        reference_id=uuid4(),
+        subject_key=key,
+        label=key,
+        company_ids=list(company_ids),
+        companies=[],
+        preset=None,
+        color=None,
+        filters_for_fetch=filters,
+        filters_display=ComparisonFilters(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_load_metrics_for_subjects_maps_results_back_to_subjects(
+    monkeypatch, async_session: AsyncSession
+) -> None:
+    async def fake_build_companies_metrics(self, company_ids, date_from, date_to, *, filters=None, top_news_limit=5):
+        return {company_id: {"company_id": company_id, "filters": filters} for company_id in company_ids}
+
+    monkeypatch.setattr(CompetitorAnalysisService, "build_companies_metrics", fake_build_companies_metrics)
+
+    shared, only_first, only_second = uuid4(), uuid4(), uuid4()
+    subjects = [
+        _subject([shared, only_first], key="first", filters={"min_priority": 0.1}),
+        _subject([shared, only_second], key="second", filters={"min_priority": 0.9}),
+    ]
+    service = AnalyticsComparisonService(async_session)
+    now = datetime.now(timezone.utc)
+
+    metrics = await service._load_metrics_for_subjects(
+        subjects,
+        window_start=now - timedelta(days=7),
+        window_end=now,
+        top_news_limit=3,
+    )
+
+    assert set(metrics[0]) == {shared, only_first}
+    assert set(metrics[1]) == {shared, only_second}
+    assert metrics[0][shared]["filters"] == {"min_priority": 0.1}
+    assert metrics[1][shared]["filters"] == {"min_priority": 0.9}
+
+
+@pytest.mark.asyncio
+async def test_load_metrics_for_subjects_reuses_shared_company_metrics(
+    monkeypatch, async_session: AsyncSession
+) -> None:
+    calls = []
+
+    async def fake_build_companies_metrics(self, company_ids, date_from, date_to, *, filters=None, top_news_limit=5):
+        calls.append(list(company_ids))
+        return {company_id: {"company_id": company_id} for company_id in company_ids}
+
+    monkeypatch.setattr(CompetitorAnalysisService, "build_companies_metrics", fake_build_companies_metrics)
+
+    shared, other = uuid4(), uuid4()
+    subjects = [
+        _subject([shared], key="first", filters={"min_priority": 0.5}),
+        _subject([shared, other], key="second", filters={"min_priority": 0.5}),
+    ]
+    service = AnalyticsComparisonService(async_session)
+    now = datetime.now(timezone.utc)
+
+    metrics = await service._load_metrics_for_subjects(
+        subjects,
+        window_start=now - timedelta(days=7),
+        window_end=now,
+        top_news_limit=3,
+    )
+
+    assert calls == [[shared, other]]
+    assert metrics[0][shared] is metrics[1][shared]
+
+
+def test_merge_counter_sums_and_normalises_labels(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    merged = service._merge_counter(
+        [
+            {"positive": 2, "neutral": 1},
+            {SentimentLabel.POSITIVE: 3},
+            {"negative": 1, "positive": 1},
+        ]
+    )
+
+    assert merged == {"positive": 6, "neutral": 1, "negative": 1}
+
+
+def test_aggregate_components_sums_scores_and_averages_weights(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    def component(component_type, score, weight):
+        return SimpleNamespace(component_type=component_type, score_contribution=score, weight=weight)
+
+    aggregated = service._aggregate_components(
+        component_lists=[
+            [component(ImpactComponentType.NEWS_SIGNAL, 1.0, 0.2), component("pricing_change", 3.0, 0.5)],
+            [component(ImpactComponentType.NEWS_SIGNAL, 2.5, 0.4)],
+            [],
+        ]
+    )
+
+    assert [(item.component_type, item.score_contribution) for item in aggregated] == [
+        ("news_signal", pytest.approx(3.5)),
+        ("pricing_change", pytest.approx(3.0)),
+    ]
+    assert aggregated[0].weight == pytest.approx(0.3)
+    assert aggregated[1].weight == pytest.approx(0.5)
+
+
+def test_aggregate_top_news_keeps_highest_priority_items(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    def metrics(*news):
+        return CompanyMetrics(
+            news_volume=len(news),
+            category_distribution={},
+            topic_distribution={},
+            sentiment_distribution={},
+            activity_score=0.0,
+            avg_priority=0.0,
+            daily_activity={},
+            top_news=list(news),
+        )
+
+    top = service._aggregate_top_news(
+        [
+            metrics({"id": "a", "priority_score": 0.2}, {"id": "b", "priority_score": 0.9}),
+            metrics({"id": "c"}, {"id": "d", "priority_score": 0.9}),
+            metrics(),
+        ],
+        limit=3,
+    )
+
+    assert [item["id"] for item in top] == ["b", "d", "a"]
+
+
+def test_merge_counter_labels_enum_keyed_distributions(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    merged = service._merge_counter(
+        [{NewsTopic.PRODUCT: 2}, {NewsTopic.PRODUCT: 1, NewsTopic.STRATEGY: 4}, {}]
+    )
+
+    assert merged == {"product": 3, "strategy": 4}
+    assert service._merge_counter([{}, {}]) == {}
+
+
+def test_comparison_filters_reject_unknown_values() -> None:
+    with pytest.raises(ValidationError):
+        ComparisonFilters(topics=["not-a-topic"])
+
+
+def test_serialize_filters_keeps_enum_members(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    serialized = service._serialize_filters(
+        {"topics": [NewsTopic.PRODUCT], "source_types": [SourceType.BLOG], "min_priority": 0.5}
+    )
+
+    assert serialized.topics == [NewsTopic.PRODUCT]
+    assert serialized.sentiments == []
+    assert serialized.model_dump(mode="json") == {
+        "topics": ["product"],
+        "sentiments": [],
+        "source_types": ["blog"],
+        "min_priority": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_user_presets_returns_validatable_rows(async_session: AsyncSession) -> None:
+    user = DummyUser()
+    async_session.add(user)
+    await async_session.commit()
+    await async_session.refresh(user)
+    company_id = uuid4()
+    preset = await create_report_preset(async_session, user_id=user.id, companies=[str(company_id)])
+
+    service = AnalyticsComparisonService(async_session)
+    rows = await service._load_user_presets(user.id)
+
+    presets = [ReportPresetResponse.model_validate(row) for row in rows]
+    assert [item.id for item in presets] == [preset.id]
+    assert presets[0].companies == [company_id]
+    assert presets[0].filters == {"source_types": ["blog"]}
+
+
+def test_normalise_array_accepts_lists_json_and_scalars() -> None:
+    first, second = uuid4(), uuid4()
+    normalise = AnalyticsComparisonService._normalise_array
+
+    assert normalise(None) == []
+    assert normalise([first, str(second)]) == [first, second]
+    assert normalise(f'["{first}", "{second}"]') == [first, second]
+    assert normalise(first) == [first]
+    assert normalise(str(first)) == [first]
+
+
+def test_normalize_filters_accepts_values_and_enum_members(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    normalized = service._normalize_filters(
+        ComparisonFilters(topics=["product"], sentiments=["positive"], source_types=["blog"])
+    )
+    assert normalized == {
+        "topics": [NewsTopic.PRODUCT],
+        "sentiments": [SentimentLabel.POSITIVE],
+        "source_types": [SourceType.BLOG],
+    }
+
+    preset = UserReportPreset(filters={"topics": [NewsTopic.PRODUCT], "sentiments": ["negative"]})
+    assert service._normalize_filters_from_preset(preset) == {
+        "topics": [NewsTopic.PRODUCT],
+        "sentiments": [SentimentLabel.NEGATIVE],
+    }
+
+    with pytest.raises(ValueError):
+        service._normalize_filters_from_preset(UserReportPreset(filters={"topics": ["unknown-topic"]}))
+
+
+def test_normalise_json_passes_through_parsed_values() -> None:
+    normalise = AnalyticsComparisonService._normalise_json
+    payload = {"topics": ["product"]}
+
+    assert normalise(payload, default={}) is payload
+    assert normalise(None, default={}) == {}
+    assert normalise('{"a": 1}', default={}) == {"a": 1}
+    assert normalise("null", default=[]) == []
+    assert normalise("{broken", default={}) == {}
+
+
+def test_safe_mean_ignores_missing_values(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+
+    assert service._safe_mean([1.0, None, 2.0, 4.5]) == pytest.approx(2.5)
+    assert service._safe_mean([None, None]) == 0.0
+    assert service._safe_mean([]) == 0.0
+
+
+def test_collect_subject_snapshots_feeds_latest_summary(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+    first, second, missing = uuid4(), uuid4(), uuid4()
+    older = _series_snapshot(datetime(2025, 3, 1), 2.0, news_total=4)
+    newest_first = _series_snapshot(datetime(2025, 3, 2), 6.0, news_total=1)
+    newest_second = _series_snapshot(datetime(2025, 3, 2), 4.0, news_total=2)
+    for snapshot in (older, newest_first, newest_second):
+        snapshot.trend_delta = None
+    subject = _subject([first, missing, second], key="subject")
+
+    company_snapshots = {first: [older, newest_first], second: [newest_second]}
+    totals_cache: dict = {}
+    subject_snapshots, latest_snapshots, latest_totals = service._collect_subject_snapshots(
+        subject,
+        company_snapshots,
+        totals_cache=totals_cache,
+    )
+    summary = service._aggregate_latest_snapshot(
+        latest_snapshots,
+        latest_totals=latest_totals,
+        include_components=False,
+    )
+    _, _, overlapping_totals = service._collect_subject_snapshots(
+        _subject([second], key="overlap"),
+        company_snapshots,
+        totals_cache=totals_cache,
+    )
+
+    assert subject_snapshots == [older, newest_first, newest_second]
+    assert latest_snapshots == [newest_first, newest_second]
+    assert summary.impact_score == pytest.approx(5.0)
+    assert summary.news_total == 3
+    assert summary.trend_delta == 0.0
+    assert overlapping_totals[0] is latest_totals[1]
+
+
+def test_aggregate_latest_snapshot_averages_present_values(async_session: AsyncSession) -> None:
+    service = AnalyticsComparisonService(async_session)
+    first = _series_snapshot(datetime(2025, 3, 2), 2.0, news_total=2)
+    second = _series_snapshot(datetime(2025, 3, 2), 6.0, news_total=3)
+    first.trend_delta = 10.0
+    second.trend_delta = None
+    second.innovation_velocity = None
+
+    summary = service._aggregate_latest_snapshot([first, second], include_components=False)
+
+    assert summary.impact_score == pytest.approx(4.0)
+    assert summary.innovation_velocity == pytest.approx(1.0)
+    assert summary.trend_delta == pytest.approx(10.0)
+    assert summary.news_total == 5
+    assert summary.news_positive == 5
+    assert summary.feature_updates == 2
+    assert summary.components == []
+
+
+@pytest.mark.asyncio
+async def test_load_export_context_matches_separate_loaders(async_session: AsyncSession) -> None:
+    user = DummyUser()
+    async_session.add(user)
+    await async_session.commit()
+    await async_session.refresh(user)
+    await create_user_preferences(async_session, user_id=user.id, keywords=["ai"])
+    await create_report_preset(async_session, user_id=user.id, name="Older", companies=[str(uuid4())])
+    await create_report_preset(async_session, user_id=user.id, name="Newer", companies=[str(uuid4())])
+    service = AnalyticsComparisonService(async_session)
+
+    notification_summary, preset_rows = await service._load_export_context(
+        user.id, include_notifications=True, include_presets=True
+    )
+
+    assert notification_summary == await service._load_notification_settings(user.id)
+    assert notification_summary.keywords == ["ai"]
+    expected_rows = await service._load_user_presets(user.id)
+    assert sorted(preset_rows, key=lambda row: row["name"]) == sorted(expected_rows, key=lambda row: row["name"])
+    assert len(preset_rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_export_context_without_preferences_or_presets(async_session: AsyncSession) -> None:
+    user = DummyUser()
+    async_session.add(user)
+    await async_session.commit()
+    await async_session.refresh(user)
+    service = AnalyticsComparisonService(async_session)
 
+    assert await service._load_export_context(
+        user.id, include_notifications=True, include_presets=True
+    ) == (None, [])
@@ -11,6 +11,7 @@ from tests.utils.analytics_builders import (
     create_company,
     create_news_item,
     create_change_event,
+    create_snapshot,
 )
 
 
@@ -44,3 +45,29 @@ async def test_compute_snapshot_for_period(async_session: AsyncSession) -> None:
     await async_session.refresh(snapshot)
     assert snapshot.components, "impact components should be persisted"
 
+
+@pytest.mark.asyncio
+async def test_get_snapshots_bulk_limits_per_company(async_session: AsyncSession) -> None:
+    first = await create_company(async_session, name="BulkSnapshotsA")
+    second = await create_company(async_session, name="BulkSnapshotsB")
+    service = AnalyticsService(async_session)
+
+    base = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    for offset in range(3):
+        await create_snapshot(async_session, company_id=first.id, period_start=base + timedelta(days=offset))
+    await create_snapshot(async_session, company_id=second.id, period_start=base)
+    await create_snapshot(
+        async_session,
+        company_id=second.id,
+        period_start=base,
+        period=AnalyticsPeriod.WEEKLY,
+    )
+
+    bulk = await service.get_snapshots_bulk([first.id, second.id], AnalyticsPeriod.DAILY, limit=2)
+
+    assert [s.id for s in bulk[first.id]] == [
+        s.id for s in await service.get_snapshots(first.id, AnalyticsPeriod.DAILY, limit=2)
+    ]
+    assert [s.period_start.day for s in bulk[first.id]] == [11, 12]
+    assert len(bulk[second.id]) == 1
+    assert all(s.components for s in bulk[first.id])
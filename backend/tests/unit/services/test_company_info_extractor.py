@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from app.services import company_info_extractor
+from app.services.company_info_extractor import (
+    _LOGO_SELECTOR,
+    _collect_page_tags,
+    _fallback_from_domain,
+    _infer_category,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_company_info_cache():
+    company_info_extractor._info_cache.clear()
+    yield
+    company_info_extractor._info_cache.clear()
+
+
+def test_collect_page_tags_keeps_first_tag_per_key() -> None:
+    soup = BeautifulSoup(
+        """
+        <html><head>
+          <title>Acme | Home</title>
+          <meta property="og:title" content="Acme | Home">
+          <meta name="description" content="First">
+          <meta name="description" content="Second">
+          <link rel="stylesheet" href="/site.css">
+          <link rel="shortcut icon" href="/favicon.ico">
+          <link rel="icon" href="/other.png">
+          <meta property="og:image" content="/og.png">
+        </head><body><svg><title>Icon</title></svg></body></html>
+        """,
+        "lxml",
+    )
+
+    tags = _collect_page_tags(soup)
+
+    assert tags["title"].string == "Acme | Home"
+    assert tags["favicon"]["href"] == "/favicon.ico"
+    assert tags["og_title"]["content"] == "Acme | Home"
+    assert tags["description"]["content"] == "First"
+    assert tags["og_image"]["content"] == "/og.png"
+    assert "og_description" not in tags
+
+
+def test_logo_selector_skips_images_without_src() -> None:
+    soup = BeautifulSoup(
+        """
+        <body>
+          <img alt="Company logo">
+          <div class="logo"><img src="/logo.svg"></div>
+        </body>
+        """,
+        "lxml",
+    )
+
+    sources = [img.get("src") for img in _LOGO_SELECTOR.iselect(soup)]
+
+    assert next(src for src in sources if src) == "/logo.svg"
+
+
+def test_fallback_from_domain_uses_known_names_and_keywords() -> None:
+    assert _fallback_from_domain("https://www.openai.com/research") == {
+        "name": "OpenAI",
+        "description": None,
+        "logo_url": None,
+        "category": "llm_provider",
+    }
+    assert _fallback_from_domain("https://searchly.io")["category"] == "search_engine"
+    assert _fallback_from_domain("https://acme.com") == {
+        "name": "Acme",
+        "description": None,
+        "logo_url": None,
+        "category": None,
+    }
+    assert _fallback_from_domain("not a url")["name"] is None
+
+
+def test_infer_category_checks_categories_in_order() -> None:
+    assert _infer_category("toolsearch.ai", "") == "llm_provider"
+    assert _infer_category("acme.com", "acme search") == "search_engine"
+    assert _infer_category("acme.com", "acme platform") == "toolkit"
+    assert _infer_category("acme.com", "acme") is None
+
+
+def _mock_client_factory(monkeypatch, html: bytes, requests: list) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=html, headers={"content-type": "text/html; charset=utf-8"})
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(company_info_extractor.httpx, "AsyncClient", client_factory)
+
+
+@pytest.mark.asyncio
+async def test_extract_company_info_reads_head_metadata(monkeypatch) -> None:
+    html = (
+        b"<html><head><title>Acme | Home</title>"
+        b'<meta name="description" content="Rockets and more">'
+        b'<link rel="icon" href="/favicon.ico"></head>'
+        b"<body>" + b"<p>filler</p>" * 50_000 + b"</body></html>"
+    )
+    requests: list = []
+    _mock_client_factory(monkeypatch, html, requests)
+
+    info = await company_info_extractor.extract_company_info("https://acme.com")
+
+    assert len(requests) == 1
+    assert info == {
+        "name": "Acme",
+        "description": "Rockets and more",
+        "logo_url": "https://acme.com/favicon.ico",
+        "category": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_extract_company_info_keeps_body_logo_without_head_icon(monkeypatch) -> None:
+    html = b'<html><head><title>Acme</title></head><body><img class="site-logo" src="/logo.svg"></body></html>'
+    _mock_client_factory(monkeypatch, html, [])
+
+    info = await company_info_extractor.extract_company_info("https://acme.com")
+
+    assert info["logo_url"] == "https://acme.com/logo.svg"
+
+
+@pytest.mark.asyncio
+async def test_read_homepage_caps_bytes() -> None:
+    class _Response:
+        async def aiter_bytes(self):
+            for _ in range(100):
+                yield b"x" * 4096
+
+    html = await company_info_extractor._read_homepage(_Response())
+
+    assert len(html) == company_info_extractor._MAX_HTML_BYTES
+
+
+@pytest.mark.asyncio
+async def test_read_homepage_stops_after_head_with_icon() -> None:
+    class _Response:
+        def __init__(self, chunks):
+            self.chunks = chunks
+
+        async def aiter_bytes(self):
+            for chunk in self.chunks:
+                yield chunk
+
+    head = b'<html><head><link rel="shortcut icon" href="/f.ico"></HEAD>'
+    body = b"<body><img class='logo' src='/l.png'></body>"
+
+    assert await company_info_extractor._read_homepage(_Response([head, body])) == head
+    plain_head = b"<html><head><title>x</title></head>"
+    assert await company_info_extractor._read_homepage(_Response([plain_head, body])) == plain_head + body
+
+
+@pytest.mark.asyncio
+async def test_extract_company_info_caches_by_domain(monkeypatch) -> None:
+    html = b"<html><head><title>Acme</title></head><body></body></html>"
+    requests: list = []
+    _mock_client_factory(monkeypatch, html, requests)
+
+    first, second = await asyncio.gather(
+        company_info_extractor.extract_company_info("https://www.acme.com"),
+        company_info_extractor.extract_company_info("https://acme.com/about"),
+    )
+    first["name"] = "changed"
+    cached = await company_info_extractor.extract_company_info("https://ACME.com")
+    refreshed = await company_info_extractor.extract_company_info("https://acme.com", force_refresh=True)
+
+    assert len(requests) == 2
+    assert second["name"] == cached["name"] == refreshed["name"] == "Acme"
+
+
+@pytest.mark.asyncio
+async def test_extract_company_info_does_not_cache_failures(monkeypatch) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        company_info_extractor.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+
+    for _ in range(2):
+        info = await company_info_extractor.extract_company_info("https://openai.com")
+        assert info["name"] == "OpenAI"
+
+    assert len(calls) == 2
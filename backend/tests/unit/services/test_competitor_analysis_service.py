@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import NewsCategory, NewsTopic, SentimentLabel, SourceType
+from app.services import competitor_analytics_cache
+from app.services.competitor_analytics_cache import cached_many, invalidate_company_cache
+from app.services.competitor_service import CompetitorAnalysisService
+from tests.utils.analytics_builders import create_company, create_news_item
+
+
+@pytest.fixture(autouse=True)
+def _clear_results_cache():
+    competitor_analytics_cache._results_cache.clear()
+    yield
+    competitor_analytics_cache._results_cache.clear()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+async def _seed_two_companies(session: AsyncSession):
+    now = _utcnow()
+    first = await create_company(session, name="BulkMetricsA")
+    second = await create_company(session, name="BulkMetricsB")
+    empty = await create_company(session, name="BulkMetricsEmpty")
+
+    for offset, (category, topic, sentiment, priority) in enumerate(
+        [
+            (NewsCategory.PRODUCT_UPDATE, NewsTopic.PRODUCT, SentimentLabel.POSITIVE, 0.9),
+            (NewsCategory.PRICING_CHANGE, NewsTopic.FINANCE, SentimentLabel.NEGATIVE, 0.4),
+            (NewsCategory.PRODUCT_UPDATE, NewsTopic.PRODUCT, SentimentLabel.NEUTRAL, 0.7),
+            (NewsCategory.TECHNICAL_UPDATE, NewsTopic.TECHNOLOGY, SentimentLabel.POSITIVE, 0.2),
+        ]
+    ):
+        await create_news_item(
+            session,
+            company_id=first.id,
+            title=f"First {offset}",
+            source_url=f"https://example.com/{first.id}/{offset}",
+            category=category,
+            topic=topic,
+            sentiment=sentiment,
+            source_type=SourceType.BLOG if offset % 2 else SourceType.NEWS_SITE,
+            priority_score=priority,
+            published_at=now - timedelta(days=offset * 6),
+        )
+    await create_news_item(
+        session,
+        company_id=second.id,
+        title="Second only",
+        source_url=f"https://example.com/{second.id}/only",
+        priority_score=0.5,
+        published_at=now - timedelta(days=2),
+    )
+    return first, second, empty
+
+
+@pytest.mark.asyncio
+async def test_build_companies_metrics_matches_per_company_metrics(async_session: AsyncSession) -> None:
+    first, second, empty = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+
+    bulk = await service.build_companies_metrics(
+        [first.id, second.id, empty.id],
+        date_from,
+        date_to,
+        top_news_limit=3,
+    )
+
+    for company in (first, second, empty):
+        competitor_analytics_cache._results_cache.clear()
+        expected = await service.build_company_metrics(
+            company.id,
+            date_from,
+            date_to,
+            top_news_limit=3,
+        )
+        assert bulk[company.id] == expected
+
+    assert bulk[first.id].news_volume == 4
+    assert [item["title"] for item in bulk[first.id].top_news] == ["First 0", "First 2", "First 1"]
+    assert bulk[empty.id].news_volume == 0
+    assert bulk[empty.id].top_news == []
+
+
+@pytest.mark.asyncio
+async def test_build_companies_metrics_applies_filters(async_session: AsyncSession) -> None:
+    first, second, _ = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+    filters = {"topics": [NewsTopic.PRODUCT], "min_priority": 0.6}
+
+    bulk = await service.build_companies_metrics(
+        [first.id, second.id],
+        date_from,
+        date_to,
+        filters=filters,
+    )
+
+    assert bulk[first.id].news_volume == 2
+    assert bulk[first.id].topic_distribution == {NewsTopic.PRODUCT.value: 2}
+    assert bulk[second.id].news_volume == 0
+    competitor_analytics_cache._results_cache.clear()
+    assert bulk[first.id] == await service.build_company_metrics(
+        first.id, date_from, date_to, filters=filters
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_activity_score_aggregates_in_one_query(async_session: AsyncSession) -> None:
+    first, _, empty = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+
+    # 4 items -> 8, 3 categories -> 9, 3 of 4 within the last 15 days -> 22.5
+    assert await service.get_activity_score(first.id, date_from, date_to) == 39.5
+    assert await service.get_activity_score(empty.id, date_from, date_to) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_company_profile_aggregates_distributions(async_session: AsyncSession) -> None:
+    first, _, empty = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+
+    profile = await service._get_company_profile(first.id, date_from, date_to)
+
+    assert profile["category_distribution"] == {
+        NewsCategory.PRODUCT_UPDATE.value: 2,
+        NewsCategory.PRICING_CHANGE.value: 1,
+        NewsCategory.TECHNICAL_UPDATE.value: 1,
+    }
+    assert profile["source_distribution"] == {
+        SourceType.NEWS_SITE.value: 2,
+        SourceType.BLOG.value: 2,
+    }
+    assert profile["activity_level"] == 4
+    assert profile["avg_priority"] == pytest.approx(0.55)
+    assert profile["company_category"] == "unknown"
+
+    empty_profile = await service._get_company_profile(empty.id, date_from, date_to)
+    assert empty_profile["activity_level"] == 0
+    assert empty_profile["category_distribution"] == {}
+
+
+@pytest.mark.asyncio
+async def test_get_company_profiles_matches_single_profiles(async_session: AsyncSession) -> None:
+    first, second, empty = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+    missing_id = uuid4()
+
+    profiles = await service._get_company_profiles(
+        [first.id, second.id, empty.id, missing_id], date_from, date_to
+    )
+
+    for company in (first, second, empty):
+        competitor_analytics_cache._results_cache.clear()
+        assert profiles[company.id] == await service._get_company_profile(company.id, date_from, date_to)
+    assert profiles[second.id]["activity_level"] == 1
+    assert profiles[missing_id] == service._empty_profile()
+
+
+@pytest.mark.asyncio
+async def test_company_metrics_are_cached_until_invalidated(async_session: AsyncSession) -> None:
+    first, second, _ = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+
+    bulk = await service.build_companies_metrics([first.id, second.id], date_from, date_to)
+    assert await service.build_company_metrics(first.id, date_from, date_to) is bulk[first.id]
+
+    await create_news_item(
+        async_session,
+        company_id=second.id,
+        title="Second late",
+        source_url=f"https://example.com/{second.id}/late",
+        published_at=_utcnow(),
+    )
+    cached = await service.build_companies_metrics([first.id, second.id], date_from, date_to)
+    assert cached[second.id].news_volume == 1
+
+    invalidate_company_cache(second.id)
+    refreshed = await service.build_companies_metrics([first.id, second.id], date_from, date_to)
+    assert refreshed[second.id].news_volume == 2
+    assert refreshed[first.id] is bulk[first.id]
+
+
+@pytest.mark.asyncio
+async def test_load_finishing_after_invalidation_is_not_cached() -> None:
+    company_id = uuid4()
+    key = ("metrics", company_id)
+
+    async def stale_load(missing):
+        invalidate_company_cache(company_id)
+        return {missing_key: "stale" for missing_key in missing}
+
+    async def fresh_load(missing):
+        return {missing_key: "fresh" for missing_key in missing}
+
+    assert await cached_many([key], stale_load) == {key: "stale"}
+    assert key not in competitor_analytics_cache._results_cache
+    assert await cached_many([key], fresh_load) == {key: "fresh"}
+    assert await cached_many([key], stale_load) == {key: "fresh"}
+
+
+@pytest.mark.asyncio
+async def test_cache_key_ignores_sub_minute_window_drift(async_session: AsyncSession) -> None:
+    first, second, _ = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = (_utcnow() + timedelta(hours=1)).replace(second=5, microsecond=0)
+    date_from = date_to - timedelta(days=30)
+    drift = timedelta(seconds=40, microseconds=123456)
+
+    metrics = await service.build_companies_metrics([first.id, second.id], date_from, date_to)
+    profiles = await service._get_company_profiles([first.id], date_from, date_to)
+
+    assert await service.build_company_metrics(first.id, date_from + drift, date_to + drift) is metrics[first.id]
+    assert (await service._get_company_profiles([first.id], date_from + drift, date_to + drift))[first.id] is profiles[first.id]
+
+
+@pytest.mark.asyncio
+async def test_get_top_news_serializes_projected_rows(async_session: AsyncSession) -> None:
+    first, _, _ = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+    date_to = _utcnow() + timedelta(hours=1)
+    date_from = date_to - timedelta(days=30)
+
+    top_news = await service.get_top_news(first.id, date_from, date_to, limit=2)
+
+    assert [item["title"] for item in top_news] == ["First 0", "First 2"]
+    assert top_news[0]["category"] == NewsCategory.PRODUCT_UPDATE.value
+    assert top_news[0]["topic"] == NewsTopic.PRODUCT.value
+    assert top_news[0]["sentiment"] == SentimentLabel.POSITIVE.value
+    assert top_news[0]["source_type"] == SourceType.NEWS_SITE.value
+    assert type(top_news[0]["source_type"]) is str
+    assert top_news[0]["priority_score"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_get_all_companies_except_returns_projected_rows(async_session: AsyncSession) -> None:
+    first, second, _ = await _seed_two_companies(async_session)
+    service = CompetitorAnalysisService(async_session)
+
+    rows = await service._get_all_companies_except(first.id, limit=10_000)
+
+    by_id = {row.id: row for row in rows}
+    assert first.id not in by_id
+    assert by_id[second.id].name == second.name
+    assert by_id[second.id].website == second.website
+    assert set(by_id[second.id]._fields) == {"id", "name", "website", "description", "logo_url", "category"}
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.competitor_change_service import CompetitorChangeService
+from tests.utils.analytics_builders import create_change_event, create_company
+
+
+@pytest.mark.asyncio
+async def test_forwarded_payload_listing_reads_events(async_session: AsyncSession) -> None:
+    company = await create_company(async_session)
+    event = await create_change_event(async_session, company_id=company.id)
+    service = CompetitorChangeService(async_session)
+
+    payload = await service.list_change_events_payload(company.id, limit=5)
+    missing = await service.fetch_change_event_payload(uuid4())
+
+    assert [item["id"] for item in payload] == [event.id]
+    assert missing is None